@@ -0,0 +1,48 @@
+"""
+Measure `Mock.execute_async` cost for many concurrent awaits.
+
+Run with: python -m benchmarks.bench_async [--tasks N]
+"""
+import argparse
+import asyncio
+import time
+
+from elmock import Mock
+
+
+class Client(Mock):
+    async def fetch(self, key: int):
+        return await self.execute_async("fetch", key)
+
+    async def store(self, key: int):
+        return await self.execute_async("store", key)
+
+
+async def chain(mocked: Client, key: int):
+    await mocked.fetch(key)
+    await mocked.store(key)
+
+
+async def bench(tasks: int) -> None:
+    mocked = Client()
+    mocked.reset()
+    mocked.on("fetch", Mock.ANY).returns("value").before("store", Mock.ANY)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(chain(mocked, i) for i in range(tasks)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{tasks} concurrent chains: {elapsed:.3f}s")
+    print(f"{elapsed / (2 * tasks) * 1e6:.2f} us per awaited call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    options = parser.parse_args()
+
+    asyncio.run(bench(options.tasks))
+
+
+if __name__ == "__main__":
+    main()
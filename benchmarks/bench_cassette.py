@@ -0,0 +1,52 @@
+"""
+Measure replay startup of a large cassette when a test uses a single method.
+
+Run with: python -m benchmarks.bench_cassette [--calls N] [--methods N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from elmock import Mock
+from elmock.cassette import Cassette, Recorder
+
+
+class Service:
+    def __getattr__(self, name: str):
+        return lambda key: {"key": key, "payload": "x" * 256}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--methods", type=int, default=100)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.cassette")
+
+        start = time.perf_counter()
+        with Recorder(Service(), path) as service:
+            for i in range(options.calls):
+                getattr(service, f"method_{i % options.methods}")(i)
+        recorded = time.perf_counter() - start
+        size = os.path.getsize(path) / 1024 ** 2
+        print(f"record {options.calls} calls: {recorded:.1f} s, {size:.1f} MiB")
+
+        start = time.perf_counter()
+        with Cassette(path) as cassette:
+            mocked = cassette.replay(Mock())
+            opened = time.perf_counter() - start
+            mocked.execute("method_0", 0)
+            first = time.perf_counter() - start
+
+        print(f"open and replay: {opened * 1e3:.2f} ms")
+        print(
+            f"first call ({options.calls // options.methods} calls read): "
+            f"{first * 1e3:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure cost of unexpected calls with large arguments, caught with and
+without reading their message.
+
+Run with: python -m benchmarks.bench_errors [--size BYTES]
+"""
+import argparse
+import timeit
+
+from elmock import Mock
+from elmock.exception import UnexpectedArguments
+
+NUMBER = 10_000
+
+
+class Sink(Mock):
+    def write(self, record: str):
+        return self.execute("write", record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1024 ** 2)
+    options = parser.parse_args()
+
+    sink = Sink()
+    sink.on("write", "expected")
+    payload = "x" * options.size
+
+    def caught(read: bool):
+        try:
+            sink.write(payload)
+        except UnexpectedArguments as error:
+            if read:
+                str(error)
+
+    print(f"{'message':>14} | {'raise (us)':>10}")
+    for name, read, explain in (
+        ("not read", False, False),
+        ("read", True, False),
+        ("read explained", True, True),
+    ):
+        sink.explain(explain)
+        elapsed = min(timeit.repeat(lambda: caught(read), number=NUMBER, repeat=3))
+        print(f"{name:>14} | {elapsed / NUMBER * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Measure `Mock.execute` latency against the number of registered expectations.
+
+Run with: python -m benchmarks.bench_execute
+"""
+import timeit
+
+from elmock import Mock
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+NUMBER = 10_000
+
+
+class Priced(Mock):
+    def price(self, sku: str, currency: str = "EUR"):
+        return self.execute("price", sku, currency=currency)
+
+
+def bench(size: int) -> float:
+    """Return mean execute latency in micro seconds for size expectations."""
+    mocked = Priced()
+    mocked.reset()
+    for i in range(size):
+        mocked.on("price", f"sku-{i}", currency="EUR").returns(i)
+
+    target = f"sku-{size - 1}"
+    elapsed = min(
+        timeit.repeat(lambda: mocked.price(target), number=NUMBER, repeat=3)
+    )
+    return elapsed / NUMBER * 1e6
+
+
+def main():
+    print(f"{'expectations':>12} | {'execute (us)':>12}")
+    for size in SIZES:
+        print(f"{size:>12} | {bench(size):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure loading a large fixture table of expected calls, row by row using
+`on` or in bulk using `Mock.load_expectations`, and memory retained by the
+mock once loaded.
+
+Run with: python -m benchmarks.bench_fixtures [--rows N] [--payload BYTES]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from elmock import Mock
+
+
+def row_by_row(path: str) -> Mock:
+    mocked = Mock()
+    with open(path) as file:
+        for line in file:
+            row = json.loads(line)
+            mocked.on(row["method"], *row["args"]).returns(row["returns"]).times(
+                row["times"]
+            )
+    return mocked
+
+
+def measure(name: str, load: Callable[[], Mock], rows: int) -> None:
+    tracemalloc.start()
+    mocked = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Timed apart as tracing slows allocations down, with a loaded mock
+    # alive as in a test process holding other objects.
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    assert mocked.execute("method_0", 0) is not None
+    print(
+        f"{name:>10} | {elapsed / rows * 1e6:>9.2f} | "
+        f"{retained / 1024 ** 2:>13.1f} | {peak / 1024 ** 2:>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--payload", type=int, default=1024)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fixture.jsonl")
+        with open(path, "w") as file:
+            for i in range(options.rows):
+                row = {
+                    "method": f"method_{i % 10}",
+                    "args": [i],
+                    "returns": {"key": i, "payload": "x" * options.payload},
+                    "times": 1,
+                }
+                file.write(json.dumps(row) + "\n")
+
+        print(f"{'load':>10} | {'us / row':>9} | {'retained (MiB)':>13} | {'peak (MiB)':>9}")
+        measure("on", lambda: row_by_row(path), options.rows)
+        measure("bulk", lambda: _bulk(path, False), options.rows)
+        measure("bulk-lazy", lambda: _bulk(path, True), options.rows)
+
+
+def _bulk(path: str, lazy: bool) -> Mock:
+    mocked = Mock()
+    mocked.load_expectations(path, lazy=lazy)
+    return mocked
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure `Mock.fork` cost for many isolated tenants built from one template.
+
+Run with: python -m benchmarks.bench_fork [--tenants N] [--expectations N]
+"""
+import argparse
+import time
+
+from elmock import Mock
+
+
+class Tenant(Mock):
+    def price(self, sku: str):
+        return self.execute("price", sku)
+
+    def stock(self, sku: str):
+        return self.execute("stock", sku)
+
+
+def bench(tenants: int, expectations: int) -> None:
+    template = Tenant()
+    for i in range(expectations):
+        template.on("price", f"sku-{i}").returns(i)
+        template.on("stock", f"sku-{i}").returns(i)
+
+    start = time.perf_counter()
+    forks = [template.fork() for _ in range(tenants)]
+    elapsed = time.perf_counter() - start
+    print(f"fork: {elapsed / tenants * 1e6:.2f} us per tenant")
+
+    start = time.perf_counter()
+    for fork in forks:
+        fork.price("sku-0")
+    elapsed = time.perf_counter() - start
+    print(f"first call on a fork (copies one method): {elapsed / tenants * 1e6:.2f} us")
+
+    start = time.perf_counter()
+    for fork in forks:
+        fork.price("sku-1")
+    elapsed = time.perf_counter() - start
+    print(f"next calls: {elapsed / tenants * 1e6:.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=10_000)
+    parser.add_argument("--expectations", type=int, default=100)
+    options = parser.parse_args()
+
+    bench(options.tenants, options.expectations)
+
+
+if __name__ == "__main__":
+    main()
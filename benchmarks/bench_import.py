@@ -0,0 +1,58 @@
+"""
+Measure `import elmock` cost using `python -X importtime`.
+
+Run with: python -m benchmarks.bench_import [--repeat N] [--max-us US]
+"""
+import argparse
+import subprocess  # nosec
+import sys
+from typing import Dict, Tuple
+
+FORBIDDEN = ("pydantic",)
+
+
+def import_time() -> Tuple[int, Dict[str, int]]:
+    """
+    Import elmock in a fresh interpreter.
+
+    :return: cumulative import time of elmock in micro seconds and
+        self time of every module imported
+    """
+    result = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", "import elmock"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+        if name.strip() == "elmock":
+            total = int(cumulative_us)
+
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-us", type=int, default=50_000)
+    options = parser.parse_args()
+
+    best, modules = min(import_time() for _ in range(options.repeat))
+    print(f"import elmock: {best} us ({len(modules)} modules)")
+
+    loaded = [name for name in modules if name.split(".")[0] in FORBIDDEN]
+    if loaded:
+        sys.exit(f"forbidden modules imported: {', '.join(loaded)}")
+    if best > options.max_us:
+        sys.exit(f"import time regressed: {best} us > {options.max_us} us")
+
+
+if __name__ == "__main__":
+    main()
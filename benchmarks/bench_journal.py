@@ -0,0 +1,57 @@
+"""
+Measure memory and execute overhead of each journal capture level.
+
+Run with: python -m benchmarks.bench_journal [--calls N]
+"""
+import argparse
+import time
+import tracemalloc
+
+from elmock import Mock
+from elmock.journal import Capture
+
+
+class Record:
+    __slots__ = ("payload", "__weakref__")
+
+    def __init__(self, i: int):
+        self.payload = "x" * 64 + str(i)
+
+
+class Sink(Mock):
+    def write(self, record: Record):
+        return self.execute("write", record)
+
+
+def bench(calls: int, capture) -> None:
+    sink = Sink()
+    sink.on("write", Mock.ANY)
+    sink.journal(capture)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for i in range(calls):
+        sink.write(Record(i))
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    name = capture.name.lower() if capture is not None else "off"
+    print(
+        f"{name:>10} | {elapsed / calls * 1e6:>12.2f} | {retained / 1024:>14.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    options = parser.parse_args()
+
+    print(f"{'capture':>10} | {'execute (us)':>12} | {'retained (KiB)':>14}")
+    for capture in (None, *Capture):
+        bench(options.calls, capture)
+
+
+if __name__ == "__main__":
+    main()
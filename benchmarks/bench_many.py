@@ -0,0 +1,51 @@
+"""
+Compare `Mock.execute_many` with one `Mock.execute` per call.
+
+Run with: python -m benchmarks.bench_many [--calls N] [--records N]
+"""
+import argparse
+import timeit
+
+from elmock import Mock
+
+
+class Sink(Mock):
+    def write(self, record: str):
+        return self.execute("write", record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--records", type=int, default=1_000)
+    options = parser.parse_args()
+
+    sink = Sink()
+    for i in range(options.records // 2):
+        sink.on("write", f"record-{i}").returns(i)
+    sink.on("write", Mock.AnyStrMatching("record-")).returns(-1)
+
+    records = [(f"record-{i % options.records}",) for i in range(options.calls)]
+
+    one_by_one = min(
+        timeit.repeat(
+            lambda: [sink.execute("write", *record) for record in records],
+            number=1,
+            repeat=3,
+        )
+    )
+    batched = min(
+        timeit.repeat(
+            lambda: list(sink.execute_many("write", records)), number=1, repeat=3
+        )
+    )
+
+    print(f"{'calls':>10} | {'execute (us)':>12} | {'execute_many (us)':>17}")
+    print(
+        f"{options.calls:>10} | {one_by_one / options.calls * 1e6:>12.2f} | "
+        f"{batched / options.calls * 1e6:>17.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
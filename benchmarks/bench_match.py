@@ -0,0 +1,108 @@
+"""
+Compare argument matching cost with the previous `Call._match` algorithm
+for 1, 5 and 20 arguments signatures.
+
+Run with: python -m benchmarks.bench_match
+"""
+import timeit
+from typing import Tuple
+
+from elmock import Mock
+
+ARITIES = (1, 5, 20)
+NUMBER = 100_000
+
+
+def legacy_match(expected_args: Tuple, expected_kwargs: dict, args: Tuple, kwargs: dict):
+    """`Call._match` as it was before matchers were compiled."""
+    args_to_check_in_kwargs = []
+    unused_args = list(expected_args)
+
+    nb_args = len(expected_args)
+    for i, arg in enumerate(args):
+        if i < nb_args:
+            expected = expected_args[i]
+
+            if isinstance(expected, Mock.ParameterMatcher):
+                if not expected.validate(arg):
+                    return False
+            elif arg != expected:
+                return False
+
+            unused_args.remove(expected)
+        else:
+            args_to_check_in_kwargs.append(arg)
+
+    unmatched_kwargs = []
+    for key, arg in kwargs.items():
+        if key not in expected_kwargs:
+            if arg is None:
+                continue
+
+            if arg in unused_args:
+                unused_args.remove(arg)
+            else:
+                unmatched_kwargs.append(arg)
+
+        expected = expected_kwargs.get(key)
+        if isinstance(expected, Mock.ParameterMatcher):
+            if not expected.validate(arg):
+                return False
+
+        elif arg != expected:
+            return False
+
+    for arg in args_to_check_in_kwargs:
+        if arg in unmatched_kwargs:
+            unmatched_kwargs.remove(arg)
+        else:
+            return False
+
+    return args_to_check_in_kwargs == []
+
+
+def signature(arity: int, matchers: bool) -> Tuple[Tuple, dict, Tuple, dict]:
+    """Build expected and actual arguments, half positional half named."""
+    nb_args = (arity + 1) // 2
+    args = tuple(f"arg-{i}" for i in range(nb_args))
+    kwargs = {f"kw{i}": i for i in range(arity - nb_args)}
+
+    expected_args = tuple(
+        Mock.ANY if matchers and i % 2 else arg for i, arg in enumerate(args)
+    )
+    expected_kwargs = {
+        key: Mock.ANY if matchers and i % 2 else value
+        for i, (key, value) in enumerate(kwargs.items())
+    }
+
+    return expected_args, expected_kwargs, args, kwargs
+
+
+def main():
+    print(f"{'arity':>5} | {'matchers':>8} | {'legacy (ns)':>11} | {'compiled (ns)':>13}")
+    for arity in ARITIES:
+        for matchers in (False, True):
+            expected_args, expected_kwargs, args, kwargs = signature(arity, matchers)
+            call = Mock.Call("method", Mock(), *expected_args, **expected_kwargs)
+            assert call._match(args, kwargs)
+            assert legacy_match(expected_args, expected_kwargs, args, kwargs)
+
+            legacy = min(
+                timeit.repeat(
+                    lambda: legacy_match(expected_args, expected_kwargs, args, kwargs),
+                    number=NUMBER,
+                    repeat=3,
+                )
+            )
+            compiled = min(
+                timeit.repeat(lambda: call._match(args, kwargs), number=NUMBER, repeat=3)
+            )
+
+            print(
+                f"{arity:>5} | {str(matchers):>8} | "
+                f"{legacy / NUMBER * 1e9:>11.0f} | {compiled / NUMBER * 1e9:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
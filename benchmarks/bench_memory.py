@@ -0,0 +1,49 @@
+"""
+Measure memory used by `Mock.execute` bookkeeping over many calls.
+
+Run with: python -m benchmarks.bench_memory [--calls N] [--history SIZE]
+"""
+import argparse
+import tracemalloc
+
+from elmock import Mock
+
+CHECKPOINTS = 10
+
+
+class Sink(Mock):
+    def write(self, record: int):
+        return self.execute("write", record)
+
+
+def bench(calls: int, history: int) -> None:
+    mocked = Sink()
+    mocked.reset()
+    mocked.keep_history(history)
+    mocked.on("write", Mock.ANY)
+
+    step = max(calls // CHECKPOINTS, 1)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    print(f"{'calls':>12} | {'retained (KiB)':>14}")
+    for done in range(step, calls + 1, step):
+        for i in range(step):
+            mocked.write(i)
+        current = tracemalloc.get_traced_memory()[0]
+        print(f"{done:>12} | {(current - baseline) / 1024:>14.1f}")
+
+    tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=10_000_000)
+    parser.add_argument("--history", type=int, default=0)
+    options = parser.parse_args()
+
+    bench(options.calls, options.history)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure `Mock.on` throughput and memory used per expectation.
+
+Run with: python -m benchmarks.bench_on [--expectations N]
+"""
+import argparse
+import time
+import tracemalloc
+
+from elmock import Mock
+
+
+class Priced(Mock):
+    def price(self, sku: str, currency: str = "EUR"):
+        return self.execute("price", sku, currency=currency)
+
+
+def bench(expectations: int) -> None:
+    mocked = Priced()
+
+    mocked.reset()
+    start = time.perf_counter()
+    for i in range(expectations):
+        mocked.on("price", f"sku-{i}", currency="EUR").returns(i)
+    elapsed = time.perf_counter() - start
+
+    skus = [f"sku-{i}" for i in range(expectations)]
+    mocked.reset()
+    tracemalloc.start()
+    for sku in skus:
+        mocked.on("price", sku, currency="EUR").returns(0)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"on() throughput: {expectations / elapsed:,.0f} expectations/s")
+    print(f"memory: {retained / expectations:,.0f} bytes/expectation")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--expectations", type=int, default=200_000)
+    options = parser.parse_args()
+
+    bench(options.expectations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure requests per second served by a StubServer to clients running in
+other processes, each sending requests on a kept alive connection, one at
+a time or pipelined.
+
+Run with: python -m benchmarks.bench_server [--requests N] [--clients N]
+"""
+import argparse
+import json
+import multiprocessing
+import socket
+import time
+from typing import Tuple
+
+from elmock import Mock
+from elmock.server import StubServer
+
+
+def http_client(address: Tuple[str, int], requests: int, depth: int) -> None:
+    body = json.dumps({"args": [42]}).encode()
+    request = (
+        f"POST /get HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+    with socket.create_connection(address) as connection:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        answers = connection.makefile("rb")
+        for _ in range(requests // depth):
+            connection.sendall(request * depth)
+            for _ in range(depth):
+                length = 0
+                while True:
+                    line = answers.readline()
+                    if line == b"\r\n":
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                answers.read(length)
+
+
+def lines_client(address: Tuple[str, int], requests: int, depth: int) -> None:
+    request = json.dumps({"id": 1, "method": "get", "args": [42]}).encode() + b"\n"
+    with socket.create_connection(address) as connection:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        answers = connection.makefile("rb")
+        for _ in range(requests // depth):
+            connection.sendall(request * depth)
+            for _ in range(depth):
+                answers.readline()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=4)
+    options = parser.parse_args()
+
+    per_client = options.requests // options.clients
+    print(f"{'protocol':>8} | {'depth':>5} | {'requests/s':>10} | {'us/request':>10}")
+    for protocol, client, depth in (
+        ("http", http_client, 1),
+        ("http", http_client, 10),
+        ("lines", lines_client, 1),
+        ("lines", lines_client, 10),
+    ):
+        served = per_client // depth * depth * options.clients
+        mocked = Mock()
+        mocked.on("get", Mock.AnyTyped(int)).returns({"value": 1}).times(served)
+
+        with StubServer(mocked, protocol=protocol) as server:
+            clients = [
+                multiprocessing.Process(
+                    target=client, args=(server.address, per_client, depth)
+                )
+                for _ in range(options.clients)
+            ]
+            start = time.perf_counter()
+            for process in clients:
+                process.start()
+            for process in clients:
+                process.join()
+            elapsed = time.perf_counter() - start
+
+        mocked.assert_full_filled()
+        print(
+            f"{protocol:>8} | {depth:>5} | {served / elapsed:>10.0f} | "
+            f"{elapsed / served * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure cost of counting calls executed by process pool workers, sending
+counts after each call or in batches.
+
+Run with: python -m benchmarks.bench_shared [--calls N] [--workers N]
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from elmock import Mock
+
+
+class Store(Mock):
+    def get(self, key: int):
+        return self.execute("get", key)
+
+
+store = Store()
+
+
+def work(keys: range) -> int:
+    for key in keys:
+        store.get(key % 100)
+    return len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    options = parser.parse_args()
+
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    chunk = options.calls // options.workers
+    chunks = [range(i * chunk, (i + 1) * chunk) for i in range(options.workers)]
+
+    print(f"{'batch':>8} | {'run (s)':>8} | {'collect (ms)':>12} | {'counted':>8}")
+    for batch in (1, 100, 10_000):
+        store.reset()
+        for key in range(100):
+            store.on("get", key).returns(key)
+
+        with store.share(batch=batch, context=context) as share:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(
+                options.workers, mp_context=context, initializer=share.attach
+            ) as pool:
+                list(pool.map(work, chunks))
+            run = time.perf_counter() - start
+
+            start = time.perf_counter()
+            counted = share.collect()
+            collect = time.perf_counter() - start
+
+        print(f"{batch:>8} | {run:>8.2f} | {collect * 1e3:>12.2f} | {counted:>8}")
+
+
+if __name__ == "__main__":
+    main()
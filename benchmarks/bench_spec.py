@@ -0,0 +1,58 @@
+"""
+Compare mocks generated by `Mock.from_spec` with hand written wrappers.
+
+Run with: python -m benchmarks.bench_spec [--methods N]
+"""
+import argparse
+import time
+import timeit
+
+from elmock import Mock
+
+NUMBER = 100_000
+
+
+class Handwritten(Mock):
+    def get(self, key: str, default=None, *, timeout: float = 1.0):
+        return self.execute("get", key, default, timeout=timeout)
+
+
+class Gateway:
+    def get(self, key: str, default=None, *, timeout: float = 1.0):
+        pass
+
+
+def interface(methods: int) -> type:
+    """Build an interface with many methods."""
+
+    def method(self, key: str, value=None, *, timeout: float = 1.0):
+        pass
+
+    return type("Large", (), {f"method_{i}": method for i in range(methods)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--methods", type=int, default=200)
+    options = parser.parse_args()
+
+    start = time.perf_counter()
+    Mock.from_spec(interface(options.methods))
+    elapsed = time.perf_counter() - start
+    print(f"from_spec with {options.methods} methods: {elapsed * 1e3:.1f} ms")
+
+    for name, mocked in (
+        ("hand written", Handwritten()),
+        ("from_spec", Mock.from_spec(Gateway)()),
+    ):
+        mocked.on("get", "key", timeout=2.0).returns("value")
+        elapsed = min(
+            timeit.repeat(
+                lambda: mocked.get("key", timeout=2.0), number=NUMBER, repeat=3
+            )
+        )
+        print(f"{name}: {elapsed / NUMBER * 1e6:.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare one expectation per page with a single `returns_iter` expectation.
+
+Run with: python -m benchmarks.bench_stream [--pages N]
+"""
+import argparse
+import time
+import tracemalloc
+
+from elmock import Mock
+
+
+class Cursor(Mock):
+    def fetch(self):
+        return self.execute("fetch")
+
+
+def per_page(mocked: Cursor, pages: int) -> None:
+    for page in range(pages):
+        mocked.on("fetch").returns(page).once()
+
+
+def streamed(mocked: Cursor, pages: int) -> None:
+    mocked.on("fetch").returns_iter(page for page in range(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=10_000)
+    options = parser.parse_args()
+
+    print(f"{'expectations':>12} | {'retained (KiB)':>14} | {'fetch all (ms)':>14}")
+    for name, register in (("per page", per_page), ("returns_iter", streamed)):
+        mocked = Cursor()
+        tracemalloc.start()
+        register(mocked, options.pages)
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in range(options.pages):
+            mocked.fetch()
+        elapsed = time.perf_counter() - start
+
+        print(f"{name:>12} | {retained / 1024:>14.1f} | {elapsed * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure `Mock.execute` throughput in thread safe mode as threads grow.
+
+Each thread calls its own method so calls only contend on the ordering lock.
+Scaling is only expected on free-threaded CPython builds.
+
+Run with: python -m benchmarks.bench_threads [--calls N]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from elmock import Mock
+
+THREADS = (1, 2, 4, 8, 16, 32)
+
+
+class Shared(Mock):
+    pass
+
+
+def bench(threads: int, calls: int) -> float:
+    """Return executed calls per second."""
+    mocked = Shared()
+    mocked.thread_safe()
+    for i in range(threads):
+        mocked.on(f"method_{i}", Mock.ANY).returns(i)
+
+    def run(i: int):
+        method = f"method_{i}"
+        for j in range(calls):
+            mocked.execute(method, j)
+
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(run, range(threads)))
+        elapsed = time.perf_counter() - start
+
+    return threads * calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20_000)
+    options = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL enabled: {gil}")
+    print(f"{'threads':>8} | {'calls/s':>12}")
+    for threads in THREADS:
+        print(f"{threads:>8} | {bench(threads, options.calls):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
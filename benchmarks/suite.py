@@ -0,0 +1,304 @@
+"""
+Benchmark elmock hot paths and check them against a baseline.
+
+Every case reports a duration per operation in micro seconds. Results are
+written as JSON so they can be kept for a commit and compared to later
+runs: a case regresses if it is slower than baseline by more than its
+threshold.
+
+Run with:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json [--output results.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+from elmock import Mock
+from elmock.clock import VirtualClock
+
+from .bench_import import import_time
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+THRESHOLDS = {
+    # Spawns interpreters: noisier than in process cases.
+    "import": 0.5,
+}
+
+
+class Priced(Mock):
+    def price(self, sku: str, currency: str = "EUR"):
+        return self.execute("price", sku, currency=currency)
+
+
+def timed(function: Callable[[], object], number: int, repeat: int) -> float:
+    """Best duration of function in micro seconds."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def bench_on(repeat: int) -> float:
+    skus = [f"sku-{i}" for i in range(10_000)]
+
+    def register():
+        mocked = Priced()
+        for sku in skus:
+            mocked.on("price", sku, currency="EUR").returns(0)
+
+    return timed(register, 1, repeat) / len(skus)
+
+
+def bench_execute_expectations(size: int) -> Callable[[int], float]:
+    def bench(repeat: int) -> float:
+        mocked = Priced()
+        for i in range(size):
+            mocked.on("price", f"sku-{i}", currency="EUR").returns(i)
+        target = f"sku-{size - 1}"
+        return timed(lambda: mocked.price(target), 10_000, repeat)
+
+    return bench
+
+
+def bench_execute_arguments(nb_args: int) -> Callable[[int], float]:
+    def bench(repeat: int) -> float:
+        mocked = Mock()
+        args = tuple(range(nb_args))
+        for i in range(100):
+            mocked.on("method", i, *args[1:])
+        return timed(lambda: mocked.execute("method", *args), 10_000, repeat)
+
+    return bench
+
+
+def bench_execute_matchers(nb_matchers: int) -> Callable[[int], float]:
+    """
+    Five arguments, nb_matchers of them being matchers, 100 expectations
+    only told apart by their first argument.
+    """
+
+    def bench(repeat: int) -> float:
+        mocked = Mock()
+        matchers = (Mock.AnyTyped(int), Mock.Range(0, 1000), Mock.ANY, Mock.In(1, 4))
+        for i in range(100):
+            args = [i + 1, 1, 2, 3, 4]
+            for position in range(nb_matchers):
+                args[4 - position] = matchers[position]
+            mocked.on("method", *args)
+        call = (100, 1, 2, 3, 4)
+        return timed(lambda: mocked.execute("method", *call), 10_000, repeat)
+
+    return bench
+
+
+def bench_execute_instrumented(latency: bool) -> Callable[[int], float]:
+    def bench(repeat: int) -> float:
+        mocked = Priced()
+        mocked.instrument(latency=latency)
+        for i in range(1_000):
+            mocked.on("price", f"sku-{i}", currency="EUR").returns(i)
+        return timed(lambda: mocked.price("sku-999"), 10_000, repeat)
+
+    return bench
+
+
+def bench_execute_delayed(repeat: int) -> float:
+    mocked = Priced()
+    mocked.use_clock(VirtualClock())
+    for i in range(1_000):
+        mocked.on("price", f"sku-{i}", currency="EUR").returns(i).delay(0.2)
+    return timed(lambda: mocked.price("sku-999"), 10_000, repeat)
+
+
+def bench_before_chain(repeat: int) -> float:
+    length = 100
+    mocked = Mock()
+    call = mocked.on("method_0")
+    for i in range(1, length):
+        call = call.before(f"method_{i}")
+    methods = [f"method_{i}" for i in range(length)]
+
+    def chain():
+        for method in methods:
+            mocked.execute(method)
+
+    return timed(chain, 100, repeat) / length
+
+
+def bench_after(repeat: int) -> float:
+    """Execute a call made after 100 other calls, in any order."""
+    mocked = Mock()
+    prerequisites = [mocked.on(f"method_{i}") for i in range(100)]
+    mocked.on("last").after(*prerequisites)
+    for i in range(100):
+        mocked.execute(f"method_{i}")
+    return timed(lambda: mocked.execute("last"), 10_000, repeat)
+
+
+def bench_in_order(repeat: int) -> float:
+    mocked = Mock()
+    calls = [mocked.on(f"method_{i}") for i in range(100)]
+    mocked.in_order("group", *calls)
+    return timed(lambda: mocked.execute("method_0"), 10_000, repeat)
+
+
+def bench_assert_full_filled(repeat: int) -> float:
+    mocked = Priced()
+    for i in range(100_000):
+        mocked.on("price", f"sku-{i}").returns(i).once()
+        mocked.price(f"sku-{i}")
+    return timed(mocked.assert_full_filled, 1, repeat)
+
+
+def bench_reset(repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        mocked = Priced()
+        for i in range(100_000):
+            mocked.on("price", f"sku-{i}").returns(i)
+        start = time.perf_counter()
+        mocked.reset()
+        elapsed = (time.perf_counter() - start) * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best  # type: ignore
+
+
+def bench_scope(repeat: int) -> float:
+    """Run a scope executing and adding a call over 100000 expectations."""
+    mocked = Priced()
+    for i in range(100_000):
+        mocked.on("price", f"sku-{i}").returns(i).once()
+
+    def scoped():
+        with mocked.scope():
+            mocked.on("price", "extra").returns(-1)
+            mocked.price("sku-99999")
+            mocked.price("extra")
+
+    return timed(scoped, 1_000, repeat)
+
+
+def bench_load_expectations(repeat: int) -> float:
+    rows = [
+        {"method": "price", "args": [f"sku-{i}"], "returns": i, "times": 1}
+        for i in range(10_000)
+    ]
+    return timed(lambda: Priced().load_expectations(rows), 1, repeat) / len(rows)
+
+
+def bench_import(repeat: int) -> float:
+    return float(min(import_time()[0] for _ in range(repeat)))
+
+
+CASES: Dict[str, Callable[[int], float]] = {
+    "on": bench_on,
+    **{
+        f"execute/expectations-{size}": bench_execute_expectations(size)
+        for size in (10, 1_000, 100_000)
+    },
+    **{
+        f"execute/arguments-{nb_args}": bench_execute_arguments(nb_args)
+        for nb_args in (1, 5, 20)
+    },
+    **{
+        f"execute/matchers-{nb_matchers}": bench_execute_matchers(nb_matchers)
+        for nb_matchers in (0, 2, 4)
+    },
+    "execute/instrumented": bench_execute_instrumented(False),
+    "execute/instrumented-latency": bench_execute_instrumented(True),
+    "execute/delayed-virtual": bench_execute_delayed,
+    "before/chain-100": bench_before_chain,
+    "order/after-100": bench_after,
+    "order/in_order-100": bench_in_order,
+    "assert_full_filled/100000": bench_assert_full_filled,
+    "reset/100000": bench_reset,
+    "scope/100000": bench_scope,
+    "load_expectations/10000": bench_load_expectations,
+    "import": bench_import,
+}
+
+
+def run(selected: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in selected:
+        results[name] = {
+            "us": round(CASES[name](repeat), 4),
+            "threshold": THRESHOLDS.get(name, DEFAULT_THRESHOLD),
+        }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]
+) -> List[str]:
+    """
+    Print results against baseline.
+
+    :return: names of regressed cases
+    """
+    regressions = []
+    print(f"{'case':>28} | {'baseline (us)':>13} | {'current (us)':>12} | {'ratio':>6}")
+    for name, result in results.items():
+        reference: Optional[Dict[str, float]] = baseline.get(name)
+        if reference is None:
+            print(f"{name:>28} | {'-':>13} | {result['us']:>12.3f} | {'-':>6}")
+            continue
+
+        ratio = result["us"] / reference["us"] if reference["us"] else 1.0
+        regressed = ratio > 1 + result["threshold"]
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:>28} | {reference['us']:>13.3f} | {result['us']:>12.3f} | "
+            f"{ratio:>6.2f}{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare with")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="run only these cases"
+    )
+    options = parser.parse_args()
+
+    results = run(options.case or list(CASES), options.repeat)
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        if baseline.get("version") != FORMAT_VERSION:
+            sys.exit(f"{options.compare} has an unsupported format")
+
+        regressions = compare(results, baseline["results"])
+        if regressions:
+            sys.exit(f"regressions: {', '.join(regressions)}")
+    else:
+        for name, result in results.items():
+            print(f"{name:>28} | {result['us']:>12.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,7 @@ from setuptools import setup
 
 setup(
     version="1.2.2",
-    install_requires=[
-        "pydantic",
-        "shortuuid"
-    ],
+    install_requires=[],
     extras_require={
         "dev": [
             "build",
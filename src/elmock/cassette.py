@@ -0,0 +1,252 @@
+"""
+Record calls made on a real object and replay them as mocked calls.
+
+A cassette file is laid out as:
+
+- a magic header,
+- one entry per recorded call: pickled arguments followed by pickled
+  result, so arguments can be read without result,
+- one array of (offset, arguments size, result size) per method,
+- a pickled index giving each method array offset and length,
+- a footer holding index offset and size followed by the magic header.
+
+Cassettes are memory mapped when replayed: only the index is read upfront.
+Arguments of a method are deserialized the first time it is called and each
+result when its call is executed.
+
+/!\\ Cassettes use pickle: only replay cassettes you trust.
+"""
+import inspect
+import mmap
+import pickle  # nosec
+import struct
+from array import array
+from typing import IO, Any, Callable, Dict, Iterator, List, Tuple
+
+from .mocker import Mock, _Returned
+
+_MAGIC = b"ELMOCK-CASSETTE-1\n"
+_FOOTER = struct.Struct("<QQ")
+_ENTRY_SIZE = 3
+_TYPECODE = "Q"
+
+
+class Recorder:
+    """
+    Recorder writes each method call made on a real object through its
+    `proxy` to a cassette.
+
+    Methods are called on the real object and their arguments, with their
+    result or raised exception, are written as soon as the call ends.
+    Recorder must be closed to write the cassette index, or used as a
+    context manager giving its proxy.
+
+    Calls which can not be pickled still return (or raise) as the real
+    object does, but they are left out of the cassette and reported when
+    recorder is closed.
+    """
+
+    def __init__(self, real: Any, path: str):
+        self.__file: IO[bytes] = open(path, "wb")
+        self.__file.write(_MAGIC)
+        self.__offsets: Dict[str, array] = {}
+        self.__unrecorded: List[str] = []
+        self.proxy = _Proxy(real, self.__write)
+
+    def __write(
+        self, method: str, args: Tuple, kwargs: Dict, raised: bool, value: Any
+    ) -> None:
+        try:
+            arguments = pickle.dumps((args, kwargs), pickle.HIGHEST_PROTOCOL)
+            result = pickle.dumps((raised, value), pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            self.__unrecorded.append(f"{method}: {error}")
+            return
+
+        offsets = self.__offsets.get(method)
+        if offsets is None:
+            offsets = self.__offsets[method] = array(_TYPECODE)
+        offsets.extend((self.__file.tell(), len(arguments), len(result)))
+
+        self.__file.write(arguments)
+        self.__file.write(result)
+
+    def close(self) -> None:
+        """
+        Write cassette index and close it.
+
+        :raises ValueError: if some calls could not be recorded, once
+            cassette is written without them
+        """
+        if self.__file.closed:
+            return
+
+        index: Dict[str, Tuple[int, int]] = {}
+        for method, offsets in self.__offsets.items():
+            index[method] = (self.__file.tell(), len(offsets) // _ENTRY_SIZE)
+            offsets.tofile(self.__file)  # type: ignore
+
+        start = self.__file.tell()
+        self.__file.write(pickle.dumps(index, pickle.HIGHEST_PROTOCOL))
+        self.__file.write(_FOOTER.pack(start, self.__file.tell() - start))
+        self.__file.write(_MAGIC)
+        self.__file.close()
+
+        if self.__unrecorded:
+            raise ValueError(
+                f"Calls could not be pickled, cassette misses "
+                f"{len(self.__unrecorded)} of them: {'; '.join(self.__unrecorded[:10])}"
+            )
+
+    def __enter__(self) -> Any:
+        return self.proxy
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class _Proxy:
+    """
+    Proxy of a real object passing its method calls to a recorder.
+
+    Proxy has no public attribute of its own so that every method of the
+    real object, `close` included, is recorded.
+    """
+
+    def __init__(self, real: Any, write: Callable[[str, Tuple, Dict, bool, Any], None]):
+        self.__real = real
+        self.__write = write
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.__real, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        write = self.__write
+        if inspect.iscoroutinefunction(attribute):
+
+            async def record_async(*args, **kwargs):
+                try:
+                    result = await attribute(*args, **kwargs)
+                except Exception as error:
+                    write(name, args, kwargs, True, error)
+                    raise
+                write(name, args, kwargs, False, result)
+                return result
+
+            return record_async
+
+        def record(*args, **kwargs):
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as error:
+                write(name, args, kwargs, True, error)
+                raise
+            write(name, args, kwargs, False, result)
+            return result
+
+        return record
+
+
+class Cassette:
+    """
+    Cassette replays recorded calls as mocked calls.
+
+    Each recorded call becomes an expected call, in recording order, which
+    returns recorded result (or raises recorded exception) once. Returned
+    exceptions are returned, not raised.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        end = len(self.__map) - len(_MAGIC)
+        if (
+            end < len(_MAGIC) + _FOOTER.size
+            or self.__map[: len(_MAGIC)] != _MAGIC
+            or self.__map[end:] != _MAGIC
+        ):
+            self.__map.close()
+            raise ValueError(f"{path} is not a complete cassette")
+
+        start, size = _FOOTER.unpack_from(self.__map, end - _FOOTER.size)
+        self.__index: Dict[str, Tuple[int, int]] = pickle.loads(  # nosec
+            self.__map[start:start + size]
+        )
+
+    def methods(self) -> List[str]:
+        """
+        List recorded methods.
+        """
+        return list(self.__index)
+
+    def replay(self, mock: Mock) -> Mock:
+        """
+        Register recorded calls on mock.
+
+        Calls of a method are only read when it is first executed (or
+        configured using `on`) so methods not used by a test cost nothing.
+
+        :param mock: mock to register calls on
+        :return: mock
+        """
+        for method in self.__index:
+            mock._lazy_on(method, self.__register)
+        return mock
+
+    def calls(self, method: str) -> Iterator[Tuple[Tuple, Dict]]:
+        """
+        Read arguments of method recorded calls, in recording order.
+        """
+        for offset, size, _ in self.__entries(method):
+            yield self.__load(offset, size)
+
+    def __entries(self, method: str) -> Iterator[Tuple[int, int, int]]:
+        start, count = self.__index[method]
+        offsets = array(_TYPECODE)
+        offsets.frombytes(
+            self.__map[start:start + count * _ENTRY_SIZE * offsets.itemsize]
+        )
+        for i in range(0, len(offsets), _ENTRY_SIZE):
+            yield offsets[i], offsets[i + 1], offsets[i + 2]
+
+    def __load(self, offset: int, size: int) -> Any:
+        return pickle.loads(self.__map[offset:offset + size])  # nosec
+
+    def __register(self, mock: Mock, method: str) -> None:
+        for offset, size, result_size in self.__entries(method):
+            args, kwargs = self.__load(offset, size)
+            mock.on(method, *args, **kwargs).returns_iter(
+                _Result(self.__load, offset + size, result_size)
+            )
+
+    def close(self) -> None:
+        """
+        Release cassette file. Results not read yet can not be replayed.
+        """
+        self.__map.close()
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class _Result:
+    """
+    Recorded result read from cassette on first iteration. Returned
+    exceptions are wrapped so that they are not raised.
+    """
+
+    __slots__ = ("_load", "_offset", "_size")
+
+    def __init__(self, load: Callable[[int, int], Any], offset: int, size: int):
+        self._load = load
+        self._offset = offset
+        self._size = size
+
+    def __iter__(self) -> Iterator:
+        raised, value = self._load(self._offset, self._size)
+        yield value if raised or not isinstance(value, BaseException) else _Returned(value)
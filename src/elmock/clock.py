@@ -0,0 +1,143 @@
+"""
+Clocks spending delays of mocked calls, see `Mock.Call.delay`.
+
+`Clock` really waits. `VirtualClock` only advances its own time so slow
+dependencies cost nothing: code under test reads time from the clock and
+asyncio code runs on a `VirtualEventLoop`, whose timers (`asyncio.sleep`,
+`asyncio.wait_for` timeouts...) fire as soon as nothing else is ready.
+"""
+import asyncio
+import selectors
+import threading
+import time
+from typing import Any, Awaitable, List, Optional, Tuple
+
+
+class Clock:
+    """
+    Clock waiting for real, using `time.monotonic`.
+    """
+
+    def time(self) -> float:
+        """
+        Current time in seconds.
+        """
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Wait for seconds.
+        """
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """
+        Wait for seconds in a coroutine.
+        """
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Clock whose time only moves when advanced.
+
+    Sleeping advances time at once. Sleeping in a coroutine waits for a
+    timer of the running loop if it is a `VirtualEventLoop` of this clock,
+    so concurrent tasks sleep at the same time. Elsewhere it advances time
+    like `sleep`.
+
+    :param start: initial time in seconds
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.__now = start
+        self.__lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.__now
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move time forward.
+
+        :raises ValueError: if seconds is negative
+        """
+        if seconds < 0:
+            raise ValueError("Virtual time can not go backward")
+        with self.__lock:
+            self.__now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+        if isinstance(loop, VirtualEventLoop) and loop.clock is self:
+            await asyncio.sleep(seconds)
+        else:
+            self.advance(seconds)
+            await asyncio.sleep(0)
+
+    def new_event_loop(self) -> "VirtualEventLoop":
+        """
+        Create an event loop timed by this clock.
+        """
+        return VirtualEventLoop(self)
+
+    def run(self, main: Awaitable) -> Any:
+        """
+        Run coroutine in a new event loop timed by this clock, like
+        `asyncio.run`.
+
+        :return: coroutine result
+        """
+        loop = self.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(main)
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+
+class _VirtualSelector(selectors.DefaultSelector):  # type: ignore
+    """
+    Selector advancing clock instead of waiting for next timer.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock = clock
+
+    def select(
+        self, timeout: Optional[float] = None
+    ) -> List[Tuple[selectors.SelectorKey, int]]:
+        ready = super().select(0)
+        if ready or timeout is not None and timeout <= 0:
+            return ready
+        if timeout is None:
+            # No timer pending: only actual events can wake the loop up.
+            return super().select(None)
+
+        self.clock.advance(timeout)
+        return []
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):  # type: ignore
+    """
+    Event loop reading time from a virtual clock.
+
+    Whenever no callback nor event is ready, clock jumps to the next timer
+    instead of waiting for it. Events not ready yet, such as sockets, do
+    not hold time back.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(_VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.time()
@@ -1,39 +1,143 @@
-class UnexpectedMethod(Exception):
+import reprlib
+from typing import Callable, Optional
+
+_short = reprlib.Repr()
+_short.maxlevel = 3
+_short.maxtuple = _short.maxlist = _short.maxdict = _short.maxset = 8
+_short.maxstring = _short.maxother = 80
+_short.maxlong = 40
+
+
+def short_repr(value) -> str:
+    """
+    Repr of value truncated to a few dozens of characters.
+
+    Strings and containers are truncated before being formatted so huge
+    arguments are never fully formatted.
+    """
+    return _short.repr(value)
+
+
+class _LazyMessage(Exception):
+    """
+    Exception formatting its message only when it is read.
+
+    Mocks raise many exceptions which are caught without being read:
+    formatting arguments of each of them would be wasted.
+    """
+
+    __message: Optional[str] = None
+
+    def _format(self) -> str:
+        raise NotImplementedError()  # pragma: no-cover
+
+    @property
+    def message(self) -> str:
+        if self.__message is None:
+            self.__message = self._format()
+        return self.__message
+
+    @message.setter
+    def message(self, message: str) -> None:
+        self.__message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class UnexpectedMethod(_LazyMessage):
     def __init__(self, method: str = "undefined"):
-        self.message = f"Method {method} was not expected"
+        self.method = method
 
+    def _format(self) -> str:
+        return f"Method {self.method} was not expected"
 
-class UnexpectedArguments(Exception):
+
+class UnexpectedArguments(_LazyMessage):
     def __init__(self, method: str = "undefined", *args, **kwargs):
-        self.message = (
-            f"Method {method} did not expected to be called with {args}, {kwargs}"
+        self.method = method
+        self.call_args = args
+        self.call_kwargs = kwargs
+        self._closest: Optional[Callable[[], Optional[str]]] = None
+
+    def _format(self) -> str:
+        message = (
+            f"Method {self.method} did not expected to be called with "
+            f"{short_repr(self.call_args)}, {short_repr(self.call_kwargs)}"
         )
+        if self._closest is not None:
+            closest = self._closest()
+            if closest is not None:
+                message += f". {closest}"
+        return message
+
+    def __reduce__(self):
+        state = dict(self.__dict__)
+        if state.pop("_closest", None) is not None:
+            # Expected calls are not pickled: closest one is described first.
+            state["_LazyMessage__message"] = self.message
+        return type(self), self.args, state
 
 
-class UnexpectedCall(Exception):
+class UnexpectedCall(_LazyMessage):
+    _REASONS = {
+        "times": "expected number of calls was already reached",
+        "order": "calls it must happen after were not all made",
+        "exhausted": "its values are exhausted",
+    }
+
     def __init__(
         self,
         method: str,
-        latest_call_id: str | None,
-        after: str | None,
+        latest_call_id: Optional[int],
+        after: Optional[int],
         *args,
         **kwargs,
     ):
-        self.message = (
-            f"Call to method {method} with arguments {args}, {kwargs} was not expected"
+        self.method = method
+        self.latest_call_id = latest_call_id
+        self.after = after
+        self.call_args = args
+        self.call_kwargs = kwargs
+        # Why call was rejected, see `elmock.stats.REJECTIONS`, if known.
+        self.reason: Optional[str] = None
+
+    def _format(self) -> str:
+        message = (
+            f"Call to method {self.method} with arguments "
+            f"{short_repr(self.call_args)}, {short_repr(self.call_kwargs)} "
+            "was not expected"
         )
-        if latest_call_id != after:
-            self.message += ". Broken linked called."
+        if self.reason is None:
+            linked = self.latest_call_id != self.after
+        else:
+            linked = (
+                self.reason == "order"
+                and self.after is not None
+                and self.latest_call_id != self.after
+            )
+        if linked:
+            message += (
+                f". Broken linked called: expected call #{self.after} to happen before"
+                f" but latest was #{self.latest_call_id}."
+            )
+        elif self.reason in self._REASONS:
+            message += f": {self._REASONS[self.reason]}."
+        return message
 
 
-class NotFullFilled(Exception):
+class NotFullFilled(_LazyMessage):
     def __init__(self, data):
-        self.message = "Some calls where not full filled:\n"
-        for d in data:
-            self.message += (
+        self.data = data
+
+    def _format(self) -> str:
+        message = "Some calls where not full filled:\n"
+        for d in self.data:
+            message += (
                 f"- {d.method} "
-                f"  arg: {d.args}"
-                f"  kwargs: {d.kwargs}"
+                f"  arg: {short_repr(d.args)}"
+                f"  kwargs: {short_repr(d.kwargs)}"
                 f"  was expected to happen {d.expected} "
                 f"  but was called {d.called}"
             )
+        return message
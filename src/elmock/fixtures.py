@@ -0,0 +1,239 @@
+"""
+Read expected calls from fixture tables, see `Mock.load_expectations`.
+
+Each row describes an expected call using fields:
+
+- `method`: name of mocked method, required,
+- `args`: list of expected arguments,
+- `kwargs`: object of expected named arguments,
+- `returns`: value returned by call,
+- `times`: exact number of calls expected.
+
+JSON lines files hold one JSON object per line. CSV files start with a
+header naming their columns: `method` and `times` cells are plain text,
+`args`, `kwargs` and `returns` cells are JSON. Empty cells are ignored.
+
+Files are read as a stream. Returned values of file rows may be read back
+from file when their call is first executed instead, so they are not kept
+in memory until then: file must not change meanwhile.
+"""
+import csv
+import io
+import json
+import os
+from itertools import repeat
+from typing import (IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union,
+                    cast)
+
+FORMATS = ("jsonl", "csv")
+
+# Method, args, kwargs, returned value, returned values read back lazily, times.
+Row = Tuple[str, Tuple, Dict[str, Any], Any, Optional[Iterable], Optional[int]]
+
+_FIELDS = frozenset(("method", "args", "kwargs", "returns", "times"))
+_SUFFIXES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+_decode = json.JSONDecoder().decode
+
+
+def rows(
+    source: Union[str, "os.PathLike[str]", Iterable], format: Optional[str], lazy: bool
+) -> Iterator[Row]:
+    """
+    Read rows of source.
+
+    :param source: path of a JSON lines or CSV file, lines of such a file
+        if format is set, or mappings
+    :param format: `jsonl` or `csv`, guessed from file extension if not set
+    :param lazy: whether returned values of file rows are read back when
+        first needed
+    :return: rows
+    :raises ValueError: if format is unknown
+    """
+    if format is not None and format not in FORMATS:
+        raise ValueError(f"Unknown format {format}, expected one of {FORMATS}")
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        format = format or _SUFFIXES.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Can not guess format of {path}, expected one of {FORMATS}")
+        return _read(path, format, lazy)
+
+    if format == "jsonl":
+        return _jsonl(source, None, "<lines>")
+    if format == "csv":
+        return _csv(source, None, "<lines>")
+    records = cast(Iterable[Mapping[str, Any]], source)
+    return (_row(record, None) for record in records)
+
+
+def _read(path: str, format: str, lazy: bool) -> Iterator[Row]:
+    with open(path, "rb") as file:
+        fixture = _Fixture(path, format) if lazy else None
+        if format == "jsonl":
+            yield from _jsonl(file, fixture, path)
+        else:
+            yield from _csv(_Lines(file), fixture, path)
+
+
+def _jsonl(
+    lines: Iterable[Union[str, bytes]], fixture: Optional["_Fixture"], name: str
+) -> Iterator[Row]:
+    """
+    Parse JSON lines, binary ones read from fixture file if it is set.
+    """
+    offset = 0
+    for number, line in enumerate(lines, 1):
+        start = offset
+        offset += len(line)
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("row is not an object")
+            payload = (
+                _Payload(fixture, start, offset)
+                if fixture is not None and "returns" in record
+                else None
+            )
+            row = _row(record, payload)
+        except ValueError as error:
+            raise ValueError(f"{name}:{number}: {error}") from None
+        yield row
+
+
+def _csv(lines: Iterable[str], fixture: Optional["_Fixture"], name: str) -> Iterator[Row]:
+    """
+    Parse CSV lines, read from fixture file through `_Lines` if it is set.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    header = [column.strip() for column in header]
+    unknown = set(header) - _FIELDS
+    if unknown or "method" not in header:
+        raise ValueError(
+            f"{name}: header {header} must name a method column and only {sorted(_FIELDS)}"
+        )
+    if fixture is not None and "returns" in header:
+        fixture.column = header.index("returns")
+    else:
+        fixture = None
+
+    offset = lines.offset if isinstance(lines, _Lines) else 0
+    for cells in reader:
+        start = offset
+        offset = lines.offset if isinstance(lines, _Lines) else 0
+        if not cells:
+            continue
+
+        try:
+            if len(cells) != len(header):
+                raise ValueError(f"expected {len(header)} cells, got {len(cells)}")
+            record: Dict[str, Any] = {}
+            payload = None
+            for column, cell in zip(header, cells):
+                if not cell:
+                    continue
+                if column == "method":
+                    record[column] = cell
+                elif column == "times":
+                    record[column] = int(cell)
+                elif column == "returns" and fixture is not None:
+                    payload = _Payload(fixture, start, offset)
+                else:
+                    record[column] = _decode(cell)
+            row = _row(record, payload)
+        except ValueError as error:
+            raise ValueError(f"{name}:{reader.line_num}: {error}") from None
+        yield row
+
+
+def _row(record: Mapping[str, Any], payload: Optional["_Payload"]) -> Row:
+    unknown = record.keys() - _FIELDS
+    if unknown:
+        raise ValueError(f"unknown fields {sorted(unknown)}")
+
+    method = record.get("method")
+    if not isinstance(method, str) or not method:
+        raise ValueError("method must be a non empty string")
+    args = record.get("args") or ()
+    if not isinstance(args, (list, tuple)):
+        raise ValueError("args must be a list")
+    kwargs = record.get("kwargs") or {}
+    if not isinstance(kwargs, dict):
+        raise ValueError("kwargs must be an object")
+    times = record.get("times")
+    if times is not None and (type(times) is not int or times < 0):
+        raise ValueError("times must be a non negative integer")
+
+    if payload is not None:
+        return method, tuple(args), kwargs, None, payload, times
+    return method, tuple(args), kwargs, record.get("returns"), None, times
+
+
+class _Lines:
+    """
+    Decoded lines of a binary file, counting bytes read so far.
+    """
+
+    __slots__ = ("file", "offset")
+
+    def __init__(self, file: IO[bytes]):
+        self.file = file
+        self.offset = 0
+
+    def __iter__(self) -> "_Lines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.file)
+        self.offset += len(line)
+        return line.decode()
+
+
+class _Fixture:
+    """
+    Fixture file returned values are read back from.
+    """
+
+    __slots__ = ("path", "format", "column")
+
+    def __init__(self, path: str, format: str):
+        self.path = path
+        self.format = format
+        # Index of returns column of CSV files.
+        self.column = 0
+
+    def returns(self, start: int, end: int) -> Any:
+        """
+        Read returned value of row stored between start and end offsets.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            text = file.read(end - start).decode()
+
+        if self.format == "jsonl":
+            return _decode(text)["returns"]
+        cells: List[str] = next(csv.reader(io.StringIO(text)))
+        return _decode(cells[self.column])
+
+
+class _Payload:
+    """
+    Returned value of a fixture row, read on first iteration then repeated.
+    """
+
+    __slots__ = ("fixture", "start", "end")
+
+    def __init__(self, fixture: _Fixture, start: int, end: int):
+        self.fixture = fixture
+        self.start = start
+        self.end = end
+
+    def __iter__(self) -> Iterator:
+        return repeat(self.fixture.returns(self.start, self.end))
@@ -0,0 +1,209 @@
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from enum import IntEnum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .exception import short_repr
+
+
+class Capture(IntEnum):
+    """
+    What a journal keeps for each executed call.
+    """
+
+    COUNTS = 0
+    DIGESTS = 1
+    ARGUMENTS = 2
+
+
+class _Collected:
+    """
+    Marker for an argument garbage collected since it was journaled.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<collected>"
+
+
+COLLECTED = _Collected()
+
+
+class _Weak(weakref.ref):
+    __slots__ = ()
+
+
+class _Track:
+    __slots__ = ("count", "positions", "ids", "digests", "arguments")
+
+    def __init__(self, capture: Capture):
+        self.count = 0
+        self.positions = array("Q")
+        self.ids = array("Q")
+        self.digests = array("q") if capture == Capture.DIGESTS else None
+        self.arguments: Optional[List[Tuple[Tuple, Optional[Dict]]]] = (
+            [] if capture == Capture.ARGUMENTS else None
+        )
+
+
+class Journal:
+    """
+    Journal records calls executed by a mock, in an append-only storage.
+
+    Depending on capture level, a journal keeps for each executed call:
+
+    - `Capture.COUNTS`: nothing but a counter per method,
+    - `Capture.DIGESTS`: its position, the executed call id and a digest of
+      its arguments, in packed arrays,
+    - `Capture.ARGUMENTS`: its position, the executed call id and its
+      arguments. Arguments supporting weak references are not kept alive:
+      they are reported as `COLLECTED` once garbage collected.
+
+    Positions count calls executed by the mock since journal was started or
+    emptied by `Mock.reset`, so `position()` can be used as a checkpoint for
+    `calls` and `count`.
+    """
+
+    class Entry(NamedTuple):
+        position: int
+        call_id: int
+        digest: Optional[int]
+        args: Optional[Tuple]
+        kwargs: Optional[Dict[str, Any]]
+
+    def __init__(self, capture: Capture = Capture.DIGESTS):
+        self.capture = Capture(capture)
+        self.__tracks: Dict[str, _Track] = {}
+        self.__position = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def digest(*args, **kwargs) -> int:
+        """
+        Digest arguments the way journal does.
+
+        Digests are only comparable in the same process. Arguments which can
+        not be hashed are digested from their truncated repr, so large ones
+        cost no more than small ones, at the price of more collisions.
+        """
+        try:
+            return hash((args, frozenset(kwargs.items())))
+        except TypeError:
+            return hash(short_repr((args, sorted(kwargs.items()))))
+
+    def _record(self, method: str, call_id: int, args: Tuple, kwargs: Dict) -> None:
+        with self.__lock:
+            track = self.__tracks.get(method)
+            if track is None:
+                track = self.__tracks[method] = _Track(self.capture)
+
+            track.count += 1
+            position = self.__position
+            self.__position += 1
+            if self.capture == Capture.COUNTS:
+                return
+
+            track.positions.append(position)
+            track.ids.append(call_id)
+            if track.digests is not None:
+                track.digests.append(self.digest(*args, **kwargs))
+            else:
+                track.arguments.append(  # type: ignore
+                    (
+                        tuple(_weak(arg) for arg in args),
+                        {key: _weak(arg) for key, arg in kwargs.items()}
+                        if kwargs
+                        else None,
+                    )
+                )
+
+    def _clear(self) -> None:
+        """
+        Forget journaled calls, keeping capture level.
+        """
+        with self.__lock:
+            self.__tracks = {}
+            self.__position = 0
+
+    def position(self) -> int:
+        """
+        Number of calls journaled so far.
+        """
+        return self.__position
+
+    def methods(self) -> List[str]:
+        """
+        List methods executed at least once.
+        """
+        return list(self.__tracks)
+
+    def count(self, method: str, since: int = 0) -> int:
+        """
+        Count calls executed on method.
+
+        :param method: method name
+        :param since: only count calls from this position
+        :raises ValueError: if since is set while only counts are captured
+        """
+        track = self.__tracks.get(method)
+        if track is None:
+            return 0
+        if not since:
+            return track.count
+
+        self.__check_positions()
+        return len(track.positions) - bisect_left(track.positions, since)
+
+    def calls(self, method: str, since: int = 0) -> List[Entry]:
+        """
+        List calls executed on method, oldest first.
+
+        :param method: method name
+        :param since: only list calls from this position
+        :raises ValueError: if only counts are captured
+        """
+        self.__check_positions()
+        track = self.__tracks.get(method)
+        if track is None:
+            return []
+
+        start = bisect_left(track.positions, since) if since else 0
+        entries = []
+        for i in range(start, len(track.positions)):
+            if track.digests is not None:
+                digest, args, kwargs = track.digests[i], None, None
+            else:
+                digest = None
+                weak_args, weak_kwargs = track.arguments[i]  # type: ignore
+                args = tuple(_strong(arg) for arg in weak_args)
+                kwargs = (
+                    {key: _strong(arg) for key, arg in weak_kwargs.items()}
+                    if weak_kwargs
+                    else {}
+                )
+            entries.append(
+                self.Entry(track.positions[i], track.ids[i], digest, args, kwargs)
+            )
+
+        return entries
+
+    def __check_positions(self) -> None:
+        if self.capture == Capture.COUNTS:
+            raise ValueError("Journal only captures counts")
+
+
+def _weak(value: Any) -> Any:
+    try:
+        return _Weak(value)
+    except TypeError:
+        return value
+
+
+def _strong(value: Any) -> Any:
+    if isinstance(value, _Weak):
+        value = value()
+        return COLLECTED if value is None else value
+    return value
@@ -0,0 +1,221 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional, Pattern, Tuple, Union
+from weakref import WeakValueDictionary
+
+
+class ParameterMatcher(ABC):
+    __slots__ = ()
+
+    @staticmethod
+    @abstractmethod
+    def validate(parameter: Any) -> bool:
+        """Validate parameter against some rules."""
+        raise NotImplementedError()  # pragma: no-cover
+
+
+class _ANY(ParameterMatcher):
+    __slots__ = ()
+
+    @staticmethod
+    def validate(_):
+        return True
+
+    def __reduce__(self):
+        return "ANY"
+
+
+ANY = _ANY()
+
+
+class _Interned(ParameterMatcher):
+    """
+    Matcher built only once per parameters.
+
+    Calling a matcher class twice with the same parameters returns the same
+    instance, as long as it is still used. Parameters which can not be
+    hashed build a new matcher each time.
+    """
+
+    __slots__ = ("__weakref__", "_arguments")
+    _arguments: Tuple[Tuple, dict]
+    __instances: "WeakValueDictionary[Tuple, _Interned]" = WeakValueDictionary()
+
+    def __new__(cls, *args, **kwargs):
+        key = (cls, args, frozenset(kwargs.items()) if kwargs else None)
+        try:
+            matcher = _Interned.__instances.get(key)
+        except TypeError:
+            return cls.__build(args, kwargs)
+
+        if matcher is None:
+            matcher = _Interned.__instances.setdefault(key, cls.__build(args, kwargs))
+
+        return matcher
+
+    @classmethod
+    def __build(cls, args: Tuple, kwargs: dict) -> "_Interned":
+        matcher = super().__new__(cls)
+        matcher._setup(*args, **kwargs)
+        matcher._arguments = (args, kwargs)
+        return matcher
+
+    def __reduce__(self):
+        # Unpickled matchers are interned again.
+        args, kwargs = self._arguments
+        return _rebuild, (type(self), args, kwargs)
+
+    def _setup(self, *args, **kwargs) -> None:
+        raise NotImplementedError()  # pragma: no-cover
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        raise NotImplementedError()  # pragma: no-cover
+
+
+def _rebuild(cls: type, args: Tuple, kwargs: dict) -> ParameterMatcher:
+    return cls(*args, **kwargs)
+
+
+def _validator(expected: Any) -> Callable[[Any], bool]:
+    """Validate function for a matcher or a literal value."""
+    if isinstance(expected, ParameterMatcher):
+        return expected.validate
+    return _Equal(expected).validate
+
+
+class _Equal(_Interned):
+    __slots__ = ("_expected",)
+
+    def _setup(self, expected: Any) -> None:
+        self._expected = expected
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        return parameter == self._expected
+
+
+class AnyTyped(_Interned):
+    """
+    Match parameters being an instance of expected types.
+    """
+
+    __slots__ = ("_types",)
+
+    def _setup(self, expected_types: Union[type, Tuple[type, ...]]) -> None:
+        self._types = expected_types
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        return isinstance(parameter, self._types)
+
+
+class AnyStrMatching(_Interned):
+    """
+    Match parameters against a regular expression compiled once.
+
+    Parameters which are not strings are converted before matching.
+    """
+
+    __slots__ = ("_match",)
+
+    def _setup(self, regex: Union[str, Pattern]) -> None:
+        self._match = re.compile(regex).match
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        return self._match(str(parameter)) is not None
+
+
+class And(_Interned):
+    """
+    Match parameters validated by every matcher, stopping at first failure.
+
+    Values which are not matchers are compared using equality.
+    """
+
+    __slots__ = ("_validators",)
+
+    def _setup(self, *matchers: Any) -> None:
+        self._validators = tuple(_validator(matcher) for matcher in matchers)
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        for validate in self._validators:
+            if not validate(parameter):
+                return False
+        return True
+
+
+class Or(_Interned):
+    """
+    Match parameters validated by any matcher, stopping at first success.
+
+    Values which are not matchers are compared using equality.
+    """
+
+    __slots__ = ("_validators",)
+
+    def _setup(self, *matchers: Any) -> None:
+        self._validators = tuple(_validator(matcher) for matcher in matchers)
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        for validate in self._validators:
+            if validate(parameter):
+                return True
+        return False
+
+
+class Not(_Interned):
+    """
+    Match parameters not validated by matcher (or not equal to value).
+    """
+
+    __slots__ = ("_validate",)
+
+    def _setup(self, matcher: Any) -> None:
+        self._validate = _validator(matcher)
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        return not self._validate(parameter)
+
+
+class In(_Interned):
+    """
+    Match parameters equal to one of values.
+    """
+
+    __slots__ = ("_values", "_hashed")
+
+    def _setup(self, *values: Any) -> None:
+        self._values = values
+        try:
+            self._hashed: Optional[frozenset] = frozenset(values)
+        except TypeError:
+            self._hashed = None
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        if self._hashed is not None:
+            try:
+                return parameter in self._hashed
+            except TypeError:
+                pass
+        return parameter in self._values
+
+
+class Range(_Interned):
+    """
+    Match parameters between low and high, both included.
+
+    A None bound is not checked. Parameters which can not be compared to
+    bounds do not match.
+    """
+
+    __slots__ = ("_low", "_high")
+
+    def _setup(self, low: Any = None, high: Any = None) -> None:
+        self._low = low
+        self._high = high
+
+    def validate(self, parameter: Any) -> bool:  # type: ignore
+        try:
+            if self._low is not None and parameter < self._low:
+                return False
+            return self._high is None or parameter <= self._high
+        except TypeError:
+            return False
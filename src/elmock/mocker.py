@@ -1,12 +1,30 @@
-import re
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Pattern, Tuple, Type, Union
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Awaitable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from heapq import merge
+from itertools import count, cycle, tee
+from operator import itemgetter
+from typing import (TYPE_CHECKING, Any, Callable, Deque, Dict, FrozenSet,
+                    Iterable, Iterator, List, NamedTuple, Optional, Set,
+                    Tuple, Type, Union)
+
+from . import matchers
+from .exception import (NotFullFilled, UnexpectedArguments, UnexpectedCall,
+                        UnexpectedMethod, short_repr)
+from .journal import Capture, Journal
+from .signature import Binder
+from .stats import MethodStats
 
-from pydantic import BaseModel
-from shortuuid import ShortUUID  # type: ignore
+if TYPE_CHECKING:  # pragma: no-cover
+    import os
 
-from .exception import (NotFullFilled, UnexpectedArguments, UnexpectedCall,
-                        UnexpectedMethod)
+    from .clock import Clock
+    from .fixtures import Row
+    from .shared import Share
 
 
 class Mock:
@@ -14,57 +32,69 @@ class Mock:
     Mock provides structures and methods to manage your mocked instance.
     """
 
-    class ParameterMatcher(ABC):
-        @staticmethod
-        @abstractmethod
-        def validate(parameter: Any) -> bool:
-            """Validate parameter against some rules."""
-            raise NotImplementedError()  # pragma: no-cover
-
-    class _ANY(ParameterMatcher):
-        @staticmethod
-        def validate(_):
-            return True
-
-    @staticmethod
-    def AnyTyped(expected_types: Tuple) -> ParameterMatcher:
-        @staticmethod  # type: ignore
-        def validate(parameter: Any) -> bool:
-            return isinstance(parameter, expected_types)
-
-        return type("AnyTyped", (Mock.ParameterMatcher,), {"validate": validate})()
-
-    @staticmethod
-    def AnyStrMatching(regex: Union[str, Pattern]) -> ParameterMatcher:
-        @staticmethod  # type: ignore
-        def validate(parameter: Any) -> bool:
-            return re.match(regex, str(parameter)) is not None
+    ParameterMatcher = matchers.ParameterMatcher
+    _ANY = matchers._ANY
+    ANY = matchers.ANY
 
-        return type("AnyTyped", (Mock.ParameterMatcher,), {"validate": validate})()
-
-    ANY = _ANY()
+    AnyTyped = matchers.AnyTyped
+    AnyStrMatching = matchers.AnyStrMatching
+    And = matchers.And
+    Or = matchers.Or
+    Not = matchers.Not
+    In = matchers.In
+    Range = matchers.Range
 
     class Call:
-        class NotFullFilled(BaseModel):
+        class NotFullFilled(NamedTuple):
             method: str
-            args: List[Any]
+            args: Tuple
             kwargs: Dict[str, Any]
             expected: int
             called: int
 
+            def dict(self) -> Dict[str, Any]:
+                """
+                Report as a dictionary.
+                """
+                return self._asdict()
+
         """
         Call represent a mocked call.
         """
         __infinite_calls = -1
         __no_calls = 0
-        __after: Union[str, None] = None
+        __ids = count(1)
+        __exhausted: Iterator = iter(())
+        __not_pulled = object()
+
+        __slots__ = (
+            "__method",
+            "__args",
+            "__kwargs",
+            "__return_value",
+            "__raises",
+            "__source",
+            "__values",
+            "__pulled",
+            "__nb_calls",
+            "__calls_expected",
+            "__origin",
+            "__after",
+            "_id",
+            "_on_same_method",
+            "_ordering",
+            "_strict",
+            "_delay",
+            "__positional",
+            "__named",
+        )
 
         def __init__(
             self,
             method: str,
-            mock_src: Type["Mock"],
+            mock_src: "Mock",
             *args,
-            after: Union[str, None] = None,
+            after: Optional[int] = None,
             **kwargs
         ):
             self.__method: str = method
@@ -73,14 +103,63 @@ class Mock:
 
             self.__return_value: Any = None
             self.__raises: Optional[Exception] = None
+            self.__source: Optional[Iterable] = None
+            self.__values: Optional[Iterator] = None
+            self.__pulled: Any = Mock.Call.__not_pulled
 
             self.__nb_calls: int = 0
             self.__calls_expected: int = Mock.Call.__infinite_calls
 
             self.__origin = mock_src
-            self._id = ShortUUID().uuid()
+            self._id: int = next(Mock.Call.__ids)
             self.__after = after
             self._on_same_method = False
+            self._ordering: Optional[_Ordering] = None
+            self._strict = False
+            self._delay: Optional[Union[float, Callable[[], float]]] = None
+            self.__compile()
+
+        def _copy(self, origin: "Mock") -> "Mock.Call":
+            source, values = self.__source, self.__values
+            if values is not None:
+                if values is not Mock.Call.__exhausted:
+                    # Copy goes on from where this call is, on its own.
+                    self.__values, values = tee(values)
+            elif source is not None and hasattr(source, "__next__"):
+                self.__source, source = tee(source)
+
+            call = object.__new__(type(self))
+            call.__method = self.__method
+            call.__args = self.__args
+            call.__kwargs = self.__kwargs
+            call.__return_value = self.__return_value
+            call.__raises = self.__raises
+            call.__source = source
+            call.__values = values
+            call.__pulled = self.__pulled
+            call.__nb_calls = self.__nb_calls
+            call.__calls_expected = self.__calls_expected
+            call.__origin = origin
+            call.__after = self.__after
+            call._id = self._id
+            call._on_same_method = self._on_same_method
+            call._ordering = self._ordering
+            call._strict = self._strict
+            call._delay = self._delay
+            call.__positional = self.__positional
+            call.__named = self.__named
+
+            return call
+
+        def __repr__(self) -> str:
+            return f"<Call {self.name} args={self.__args} kwargs={self.__kwargs}>"
+
+        @property
+        def name(self) -> str:
+            """
+            Human readable identifier of the call.
+            """
+            return f"{self.__method}#{self._id}"
 
         def on(self, method: str, *args, **kwargs) -> "Mock.Call":
             """
@@ -121,7 +200,9 @@ class Mock:
             :param times: number of expected calls
             :return: call
             """
+            self.__origin._touch(self, self.__method)
             self.__calls_expected = times
+            self.__origin._track(self, self.__method)
             return self
 
         def returns(self, value: Any):
@@ -134,8 +215,11 @@ class Mock:
             :param value: return value
             :return: call
             """
+            self.__origin._touch(self, self.__method)
             self.__return_value = value
             self.__raises = None
+            self.__source = self.__values = None
+            self.__pulled = Mock.Call.__not_pulled
             return self
 
         def raises(self, raises: Exception):
@@ -148,10 +232,88 @@ class Mock:
             :param raises: exception to raise
             :return: call
             """
+            self.__origin._touch(self, self.__method)
             self.__return_value = None
             self.__raises = raises
+            self.__source = self.__values = None
+            self.__pulled = Mock.Call.__not_pulled
+            return self
+
+        def returns_iter(self, values: Iterable):
+            """
+            Return next value of an iterable on each call.
+
+            Values are pulled lazily, one per call, so iterable can be a
+            generator of any length. Exceptions found in values are raised.
+            Once values are exhausted, call is not allowed anymore: the next
+            matching expected call is executed instead.
+
+            Forks iterate on their own, from where the forked call was. Values
+            of an iterator are buffered until all forks pulled them.
+
+            /!\\ This operation overwrite existing return value
+                or exception raising
+
+            :param values: values to return (or exceptions to raise)
+            :return: call
+            """
+            self.__origin._touch(self, self.__method)
+            self.__return_value = None
+            self.__raises = None
+            self.__source = values
+            self.__values = None
+            self.__pulled = Mock.Call.__not_pulled
             return self
 
+        def returns_cycle(self, *values: Any):
+            """
+            Return values one after the other on each call, endlessly.
+
+            Exceptions found in values are raised.
+
+            /!\\ This operation overwrite existing return value
+                or exception raising
+
+            :param values: values to return (or exceptions to raise)
+            :return: call
+            """
+            return self.returns_iter(_Cycle(values))
+
+        def delay(self, latency: Optional[Union[float, Callable[[], float]]]):
+            """
+            Make call take some time before returning (or raising).
+
+            Time is spent on mock clock, see `Mock.use_clock`: using a
+            `elmock.clock.VirtualClock`, delays only move virtual time. Call
+            is counted before its delay so concurrent calls can not take it
+            meanwhile. In thread safe mode, delays are spent once locks are
+            released.
+
+            :param latency: seconds, or function returning seconds of each
+                call to draw them from a distribution, None removes delay
+            :return: call
+            """
+            self.__origin._touch(self, self.__method)
+            self._delay = latency
+            return self
+
+        def _latency(self) -> float:
+            latency = self._delay
+            return latency() if callable(latency) else latency  # type: ignore
+
+        def _attempt(
+            self, latest_call_id: Optional[int], latest_method_call_id: Optional[int]
+        ) -> Tuple[Any, Optional[Exception]]:
+            """
+            Execute call, returning mocked exception instead of raising it.
+            """
+            try:
+                return self._execute(latest_call_id, latest_method_call_id), None
+            except UnexpectedCall:
+                raise
+            except Exception as error:
+                return None, error
+
         def called(self) -> bool:
             """
             Assert call was used
@@ -184,9 +346,58 @@ class Mock:
             call = self.__origin.on(method, *args, **kwargs)
             call.__after = self._id
             call._on_same_method = on_same_method
+            if not on_same_method:
+                self.__origin._ordered(method)
 
             return call
 
+        def after(self, *calls: "Mock.Call") -> "Mock.Call":
+            """
+            Ensure call is only made once all calls were made, in any order.
+
+            Other calls may happen in between. Calls orders must not form
+            a cycle.
+
+            :param calls: calls of the same mock to wait for
+            :return: call
+            :raises ValueError: if a call belongs to another mock or if
+                orders form a cycle
+            """
+            self.__origin._touch(self, self.__method)
+            ordering = self.__origin._ordering(self)
+            for call in calls:
+                if call.__origin is not self.__origin:
+                    raise ValueError(f"{call.name} belongs to another mock")
+
+                self.__origin._touch(call, call.__method)
+                prerequisite = self.__origin._ordering(call)
+                if prerequisite in ordering.prerequisites:
+                    continue
+                if prerequisite is ordering or prerequisite.depends_on(ordering):
+                    raise ValueError(f"{self.name} already happens before {call.name}")
+
+                ordering.prerequisites.append(prerequisite)
+                prerequisite.dependents.append(self._id)
+                self.__origin._made_before(call, self)
+                self.__origin._ordered(call.__method)
+            self.__origin._ordered(self.__method)
+
+            return self
+
+        def _join(self, origin: "Mock", group: str, rank: int) -> None:
+            if self.__origin is not origin:
+                raise ValueError(f"{self.name} belongs to another mock")
+
+            origin._touch(self, self.__method)
+            ordering = origin._ordering(self)
+            if ordering.group is not None:
+                raise ValueError(f"{self.name} already belongs to {ordering.group}")
+
+            ordering.group = group
+            ordering.rank = rank
+            origin._made_before(self, None)
+            origin._ordered(self.__method)
+
         def _not_full_filled(self) -> NotFullFilled:
             return self.NotFullFilled(
                 method=self.__method,
@@ -196,84 +407,405 @@ class Mock:
                 expected=self.__calls_expected,
             )
 
-        def _allowed(self, latest_call_id: Union[str, None]) -> bool:
+        @staticmethod
+        def _skip_ids(last_id: int) -> None:
+            """
+            Ensure calls created from now on get ids greater than last_id.
+            """
+            if next(Mock.Call.__ids) <= last_id:
+                Mock.Call.__ids = count(last_id + 1)
+
+        def _merge(self, nb_calls: int) -> None:
+            """
+            Count calls executed by another process.
+            """
+            self.__nb_calls += nb_calls
+            if self.__calls_expected != self.__infinite_calls:
+                self.__origin._track(self, self.__method)
+            if self._ordering is not None:
+                self.__origin._advance(self)
+
+        def _configure(
+            self, value: Any, values: Optional[Iterable], times: Optional[int]
+        ) -> None:
+            """
+            Set returned value (or values) and expected number of calls of a
+            call not configured yet, see `Mock.load_expectations`.
+            """
+            self.__return_value = value
+            self.__source = values
+            if times is not None:
+                self.__calls_expected = times
+
+        def _expected(self) -> Tuple[Tuple, Dict]:
+            return self.__args, self.__kwargs
+
+        def _snapshot(self) -> Tuple:
+            """
+            Capture what configuring or executing call may change, see
+            `Mock.checkpoint`.
+            """
+            ordering = self._ordering
+            return (
+                self.__method,
+                self.__return_value,
+                self.__raises,
+                self.__source,
+                self.__values,
+                self.__nb_calls,
+                self.__calls_expected,
+                self.__after,
+                self._on_same_method,
+                self._delay,
+                ordering,
+                (
+                    list(ordering.prerequisites),
+                    list(ordering.dependents),
+                    ordering.group,
+                    ordering.rank,
+                )
+                if ordering is not None
+                else None,
+            )
+
+        def _restore(self, snapshot: Tuple) -> None:
+            (
+                _,
+                self.__return_value,
+                self.__raises,
+                self.__source,
+                self.__values,
+                self.__nb_calls,
+                self.__calls_expected,
+                self.__after,
+                self._on_same_method,
+                self._delay,
+                self._ordering,
+                constraints,
+            ) = snapshot
+            if constraints is not None:
+                ordering: _Ordering = self._ordering  # type: ignore
+                (
+                    ordering.prerequisites[:],
+                    ordering.dependents[:],
+                    ordering.group,
+                    ordering.rank,
+                ) = constraints
+
+        def _allowed(
+            self, latest_call_id: Optional[int], latest_method_call_id: Optional[int]
+        ) -> bool:
+            if self._on_same_method:
+                latest_call_id = latest_method_call_id
+
             return (
+                (
+                    self.__calls_expected == self.__infinite_calls
+                    or self.__nb_calls < self.__calls_expected
+                )
+                and (self.__after is None or latest_call_id == self.__after)
+                and self.__values is not self.__exhausted
+                and (self._ordering is None or self.__origin._satisfies(self))
+            )
+
+        def _rejection(
+            self, latest_call_id: Optional[int], latest_method_call_id: Optional[int]
+        ) -> Optional[str]:
+            """
+            Tell why call is not allowed, see `elmock.stats.REJECTIONS`.
+
+            :return: reason or None if call is allowed
+            """
+            if self._on_same_method:
+                latest_call_id = latest_method_call_id
+
+            if not (
                 self.__calls_expected == self.__infinite_calls
                 or self.__nb_calls < self.__calls_expected
-            ) and (self.__after is None or latest_call_id == self.__after)
+            ):
+                return "times"
+            if self.__after is not None and latest_call_id != self.__after:
+                return "order"
+            if self._ordering is not None and not self.__origin._satisfies(self):
+                return "order"
+            if self.__values is self.__exhausted:
+                return "exhausted"
+            return None
+
+        def _uses_matchers(self) -> bool:
+            return self.__positional is not None or self.__named is not None
+
+        def __compile(self):
+            """
+            Split literal and matcher checks once so `_match` only does the
+            work needed by expected arguments.
 
-        def _match(self, method: str, args: Tuple, kwargs: dict) -> bool:
-            if not self.__method == method:  # pragma: no-cover
-                return False
+            Checks stay None if all expected arguments are literal values.
+            """
+            self.__positional: Optional[Tuple[Tuple[bool, Any], ...]] = None
+            self.__named: Optional[Dict[str, Tuple[bool, Any]]] = None
+            matcher = Mock.ParameterMatcher
+
+            for value in self.__args:
+                if isinstance(value, matcher):
+                    self.__positional = tuple(
+                        (True, value.validate)
+                        if isinstance(value, matcher)
+                        else (False, value)
+                        for value in self.__args
+                    )
+                    break
+
+            for value in self.__kwargs.values():
+                if isinstance(value, matcher):
+                    self.__named = {
+                        key: (True, value.validate)
+                        if isinstance(value, matcher)
+                        else (False, value)
+                        for key, value in self.__kwargs.items()
+                    }
+                    break
+
+        def _match(self, args: Tuple, kwargs: dict) -> bool:
+            """
+            Check if arguments match expected ones.
 
-            args_to_check_in_kwargs = []
-            unused_args = list(self.__args)
+            Arguments not provided are not checked. Provided named arguments
+            which are not expected must be None. Strict calls, bound to their
+            method signature, expect the exact same number of positional
+            arguments.
+            """
+            expected_args = self.__args
+            nb_args = len(args)
+            if self._strict and nb_args != len(expected_args):
+                return False
 
-            nb_args = len(self.__args)
-            for i, arg in enumerate(args):
-                if i < nb_args:
-                    expected = self.__args[i]
+            if self.__positional is None:
+                if nb_args == len(expected_args):
+                    if args != expected_args:
+                        return False
+                elif nb_args > len(expected_args) or args != expected_args[:nb_args]:
+                    return False
+            else:
+                if nb_args > len(expected_args):
+                    return False
 
-                    if isinstance(expected, Mock.ParameterMatcher):
-                        if not expected.validate(arg):
+                for arg, (is_matcher, expected) in zip(args, self.__positional):
+                    if is_matcher:
+                        if not expected(arg):
                             return False
                     elif arg != expected:
                         return False
 
-                    unused_args.remove(expected)
-                else:
-                    args_to_check_in_kwargs.append(arg)
-
-            unmatched_kwargs = []
-            for key, arg in kwargs.items():
-                if key not in self.__kwargs:
-                    if arg is None:
-                        continue
-
-                    if arg in unused_args:
-                        unused_args.remove(arg)
-                    else:
-                        unmatched_kwargs.append(arg)
+            if not kwargs:
+                return True
 
-                expected = self.__kwargs.get(key)
-                if isinstance(expected, Mock.ParameterMatcher):
-                    if not expected.validate(arg):
+            if self.__named is None:
+                expected_kwargs = self.__kwargs
+                for key, arg in kwargs.items():
+                    if key in expected_kwargs:
+                        if arg != expected_kwargs[key]:
+                            return False
+                    elif arg is not None and arg != None:  # noqa: E711
+                        return False
+            else:
+                named = self.__named
+                for key, arg in kwargs.items():
+                    entry = named.get(key)
+                    if entry is None:
+                        if arg is not None and arg != None:  # noqa: E711
+                            return False
+                    elif entry[0]:
+                        if not entry[1](arg):
+                            return False
+                    elif arg != entry[1]:
                         return False
 
-                elif arg != expected:
-                    return False
+            return True
 
-            for arg in args_to_check_in_kwargs:
-                if arg in unmatched_kwargs:
-                    unmatched_kwargs.remove(arg)
-                else:
-                    return False
+        def _mismatches(self, args: Tuple, kwargs: dict) -> List[str]:
+            """
+            Describe why arguments do not match expected ones.
+            """
+            expected_args = self.__args
+            mismatches = []
+            for i in range(max(len(args), len(expected_args))):
+                if i >= len(expected_args):
+                    mismatches.append(
+                        f"argument #{i} not expected, got {short_repr(args[i])}"
+                    )
+                elif i >= len(args):
+                    if self._strict:
+                        mismatches.append(
+                            f"argument #{i} missing, expected "
+                            f"{short_repr(expected_args[i])}"
+                        )
+                elif not _accepts(expected_args[i], args[i]):
+                    mismatches.append(
+                        f"argument #{i}: expected {short_repr(expected_args[i])},"
+                        f" got {short_repr(args[i])}"
+                    )
 
-            return args_to_check_in_kwargs == []
+            for key, arg in kwargs.items():
+                if key in self.__kwargs:
+                    if not _accepts(self.__kwargs[key], arg):
+                        mismatches.append(
+                            f"argument {key}: expected "
+                            f"{short_repr(self.__kwargs[key])}, got {short_repr(arg)}"
+                        )
+                elif not _accepts(None, arg):
+                    mismatches.append(
+                        f"argument {key} not expected, got {short_repr(arg)}"
+                    )
+
+            return mismatches
+
+        def _execute(
+            self, latest_call_id: Optional[int], latest_method_call_id: Optional[int]
+        ):
+            if self._on_same_method:
+                latest_call_id = latest_method_call_id
 
-        def _execute(self, latest_call_id: Union[str, None]):
-            if not self._allowed(latest_call_id):
-                raise UnexpectedCall(
-                    self.__method,
-                    latest_call_id,
-                    self.__after,
-                    *self.__args,
-                    **self.__kwargs
+            if not self._allowed(latest_call_id, latest_call_id):
+                raise self.__unexpected(
+                    latest_call_id, self._rejection(latest_call_id, latest_call_id)
                 )
 
+            if self.__source is not None:
+                return self.__next(latest_call_id)
+
             self.__nb_calls += 1
+            if self.__calls_expected != self.__infinite_calls:
+                self.__origin._track(self, self.__method)
+            if self._ordering is not None:
+                self.__origin._advance(self)
 
             if self.__raises:
                 raise self.__raises
 
             return self.__return_value
 
-    __calls: Dict[str, List[Call]] = {}
-    __latest_called: List[str] = []
-    __latest_called_per_method: Dict[str, str] = {}
+        def __unexpected(
+            self, latest_call_id: Optional[int], reason: Optional[str]
+        ) -> UnexpectedCall:
+            error = UnexpectedCall(
+                self.__method, latest_call_id, self.__after, *self.__args, **self.__kwargs
+            )
+            error.reason = reason
+            return error
+
+        def _pull(self) -> bool:
+            """
+            Pull next value of a call about to be executed, if it returns
+            values, so that exhausted calls can be skipped.
+
+            :return: whether call can be executed, False once values are
+                exhausted
+            """
+            if self.__source is None or self.__pulled is not Mock.Call.__not_pulled:
+                return True
+
+            self.__origin._touch(self)
+            values = self.__values
+            if values is None:
+                values = self.__values = iter(self.__source)
+
+            try:
+                self.__pulled = next(values)
+            except StopIteration:
+                self.__values = self.__exhausted
+                return False
+            return True
+
+        def __next(self, latest_call_id: Optional[int]):
+            if self.__pulled is Mock.Call.__not_pulled and not self._pull():
+                raise self.__unexpected(latest_call_id, "exhausted")
+            value, self.__pulled = self.__pulled, Mock.Call.__not_pulled
+
+            self.__nb_calls += 1
+            if self.__calls_expected != self.__infinite_calls:
+                self.__origin._track(self, self.__method)
+            if self._ordering is not None:
+                self.__origin._advance(self)
+
+            if isinstance(value, BaseException):
+                raise value
+            if type(value) is _Returned:
+                return value.value
+
+            return value
+
+    __signatures: Dict[str, Optional[Binder]] = {}
+    __specs: Dict[Tuple[type, type], type] = {}
+    # Set on each instance by `__new__`.
+    __ordering_lock: threading.Lock
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__signatures = {}
+
+    def __new__(cls, *args, **kwargs):
+        mock = super().__new__(cls)
+        mock.__calls: Dict[str, _MethodIndex] = {}
+        mock.__latest_called: Optional[int] = None
+        mock.__latest_called_per_method: Dict[str, int] = {}
+        mock.__history: Optional[Deque[Mock.Call]] = None
+        mock.__journal: Optional[Journal] = None
+        mock.__thread_safe = False
+        mock.__explain = False
+        mock.__stats: Optional[Dict[str, MethodStats]] = None
+        mock.__latency = False
+        mock.__before: Optional[Callable[[str, Tuple, dict], None]] = None
+        mock.__after: Optional[
+            Callable[[str, Tuple, dict, Any, Optional[BaseException]], None]
+        ] = None
+        mock.__ordering_lock = threading.Lock()
+        mock.__task_key = _TaskKey(mock)
+        mock.__loaders: Dict[str, Callable[[Mock, str], None]] = {}
+        mock.__groups: Dict[str, int] = {}
+        mock.__executed: Set[int] = set()
+        mock.__satisfied: Dict[int, int] = {}
+        mock.__group_ranks: Dict[str, int] = {}
+        mock.__orderings_shared = False
+        mock.__checkpoints: List[_Checkpoint] = []
+        mock.__shared_key: Optional[str] = None
+        mock.__report: Optional[Callable[[str, int], None]] = None
+        mock.__clock: Optional["Clock"] = None
+
+        return mock
 
     @classmethod
-    def on(cls, method: str, *args, **kwargs) -> Call:
+    def from_spec(cls, spec: type) -> Type["Mock"]:
+        """
+        Build a mocked class implementing spec public methods.
+
+        Each generated method has the same signature as spec one and
+        executes the mocked call directly with its arguments already bound,
+        so no wrapper has to be written. Generated classes are cached.
+
+        :param spec: class (or interface) to mock
+        :return: mocked class
+        :raises TypeError: if a spec method name is used by Mock
+        """
+        key = (cls, spec)
+        mocked = Mock.__specs.get(key)
+        if mocked is not None:
+            return mocked
+
+        from .spec import build_method, spec_methods
+
+        methods: Dict[str, Any] = {"__module__": spec.__module__}
+        for name, function, bound in spec_methods(spec):
+            if hasattr(Mock, name):
+                raise TypeError(
+                    f"Method {name} of {spec.__name__} conflicts with Mock API"
+                )
+            methods[name] = build_method(name, function, bound)
+
+        mocked = type(f"{spec.__name__}Mock", (cls,), methods)
+        return Mock.__specs.setdefault(key, mocked)
+
+    def on(self, method: str, *args, **kwargs) -> Call:
         """
         Start a new expected call matching method and arguments.
 
@@ -282,49 +814,891 @@ class Mock:
         :param kwargs: expected kwargs to match
         :return: mocked call to configure
         """
-        if method not in cls.__calls:
-            cls.__calls[method] = []
+        return self.__add(method, args, kwargs)
+
+    def __add(
+        self,
+        method: str,
+        args: Tuple,
+        kwargs: dict,
+        indexes: Optional[Dict[str, "_MethodIndex"]] = None,
+    ) -> Call:
+        """
+        Register a new expected call.
 
-        call = cls.Call(method, cls, *args, **kwargs)
-        cls.__calls[method].append(call)
+        :param indexes: method indexes already looked up by a bulk
+            registration, updated with the index of method
+        """
+        index = indexes.get(method) if indexes is not None else None
+        if index is None:
+            index = self.__calls.get(method)
+            if index is None and self.__loaders:
+                index = self.__load(method)
+            if index is None:
+                index = self.__calls.setdefault(
+                    method, _MethodIndex(self, self.__binder(method))
+                )
+            elif index.shared:
+                index = self.__own(method, index)
+            if indexes is not None:
+                indexes[method] = index
+
+        bound = index.binder.bind(args, kwargs) if index.binder else None
+        if bound is not None:
+            args, kwargs = bound
+
+        call = self.Call(method, self, *args, **kwargs)
+        call._strict = bound is not None
+        if self.__thread_safe:
+            with index.lock:
+                index.add(call, args, kwargs)
+        else:
+            index.add(call, args, kwargs)
 
         return call
 
-    @classmethod
-    def reset(cls):
+    def load_expectations(
+        self,
+        source: Union[str, "os.PathLike[str]", Iterable],
+        format: Optional[str] = None,
+        lazy: bool = True,
+    ) -> int:
+        """
+        Register expected calls described by rows of a fixture table.
+
+        Each row is equivalent to `on(method, *args, **kwargs)` followed by
+        `returns(returns)` and `times(times)` if set, see `elmock.fixtures`
+        for fields and file formats. Rows are registered as they are read,
+        in a single pass, each method index being looked up once.
+
+        :param source: path of a JSON lines (`.jsonl`) or CSV (`.csv`) file,
+            lines of such a file if format is set, or an iterable of
+            mappings
+        :param format: `jsonl` or `csv`, guessed from file extension if not
+            set
+        :param lazy: read returned values of file rows back from file the
+            first time their call is executed, instead of keeping them in
+            memory
+        :return: number of registered calls
+        :raises ValueError: if format is unknown or a row is malformed, rows
+            read before it being registered
+        """
+        from .fixtures import rows
+
+        indexes: Dict[str, _MethodIndex] = {}
+        registered = 0
+        for row in rows(source, format, lazy):
+            self.__register(row, indexes)
+            registered += 1
+
+        return registered
+
+    def __register(self, row: "Row", indexes: Dict[str, "_MethodIndex"]) -> None:
+        method, args, kwargs, value, values, times = row
+        call = self.__add(method, args, kwargs, indexes)
+        call._configure(value, values, times)
+        if times is not None:
+            self._track(call, method)
+
+    def __binder(self, method: str) -> Optional[Binder]:
+        """
+        Retrieve binder for mocked method signature, cached per mocked class.
+
+        Methods not defined by the mocked class have no binder: their
+        arguments are matched as provided.
+        """
+        signatures = type(self).__signatures
+        if method in signatures:
+            return signatures[method]
+
+        import inspect
+
+        binder = None
+        function = inspect.getattr_static(type(self), method, None)
+        if function is not None and not hasattr(Mock, method):
+            if isinstance(function, staticmethod):
+                binder = Binder.of(function.__func__, bound=True)
+            elif isinstance(function, classmethod):
+                binder = Binder.of(function.__func__, bound=False)
+            elif inspect.isfunction(function):
+                binder = Binder.of(function, bound=False)
+
+        signatures[method] = binder
+        return binder
+
+    def _ordered(self, method: str) -> None:
+        """
+        Flag method as having calls linked to calls on other methods.
+        """
+        self.__index(method).ordered = True
+
+    def in_order(self, group: str, *calls: Call) -> None:
+        """
+        Ensure calls of a named group are made in the order they are given.
+
+        Other calls may happen in between and a call expected many times
+        may be repeated until next call of the group is made. Calls can be
+        appended to a group later on.
+
+        :param group: group name
+        :param calls: calls of this mock
+        :raises ValueError: if a call belongs to another mock or already
+            belongs to a group
+        """
+        for call in calls:
+            rank = self.__groups.get(group, 0)
+            call._join(self, group, rank)
+            self.__groups[group] = rank + 1
+
+    def _ordering(self, call: Call) -> "_Ordering":
+        """
+        Ordering of call to change, not shared with forks.
+        """
+        if self.__orderings_shared:
+            self.__own_orderings()
+        if call._ordering is None:
+            call._ordering = _Ordering()
+        return call._ordering
+
+    def __own_orderings(self) -> None:
+        """
+        Copy orderings shared with forks before changing any of them.
+
+        Orderings link to each other, so all of them are copied at once.
+        """
+        copies: Dict[_Ordering, _Ordering] = {}
+        for method, index in list(self.__calls.items()):
+            if not index.ordered:
+                continue
+            if index.shared:
+                index = self.__own(method, index)
+            for call in index.calls:
+                if call._ordering is not None:
+                    self._touch(call)
+                    call._ordering = copies[call._ordering] = call._ordering.copy()
+
+        for ordering in copies.values():
+            ordering.prerequisites = [
+                copies.get(prerequisite, prerequisite)
+                for prerequisite in ordering.prerequisites
+            ]
+        self.__orderings_shared = False
+
+    def _satisfies(self, call: Call) -> bool:
+        """
+        Check call `after` and `in_order` constraints against calls made.
+        """
+        ordering: _Ordering = call._ordering  # type: ignore
+        if (
+            ordering.prerequisites
+            and self.__satisfied.get(call._id, 0) < len(ordering.prerequisites)
+        ):
+            return False
+
+        if ordering.group is not None:
+            rank = self.__group_ranks.get(ordering.group, -1)
+            return rank == ordering.rank or rank == ordering.rank - 1
+
+        return True
+
+    def _advance(self, call: Call) -> None:
+        """
+        Update ordering state once call was made.
+        """
+        ordering: _Ordering = call._ordering  # type: ignore
+        if ordering.dependents and call._id not in self.__executed:
+            self.__executed.add(call._id)
+            satisfied = self.__satisfied
+            for dependent in ordering.dependents:
+                satisfied[dependent] = satisfied.get(dependent, 0) + 1
+
+        if ordering.group is not None:
+            self.__group_ranks[ordering.group] = ordering.rank
+
+    def _made_before(self, call: Call, dependent: Optional[Call]) -> None:
+        """
+        Update ordering state for call made before it was linked to
+        dependent, or joined its group if dependent is not set.
+        """
+        if not call.called():
+            return
+        if dependent is None:
+            ordering: _Ordering = call._ordering  # type: ignore
+            group: str = ordering.group  # type: ignore
+            self.__group_ranks[group] = max(self.__group_ranks.get(group, -1), ordering.rank)
+        else:
+            self.__executed.add(call._id)
+            self.__satisfied[dependent._id] = self.__satisfied.get(dependent._id, 0) + 1
+
+    def fork(self) -> "Mock":
+        """
+        Create an independent mock starting with this mock expected calls.
+
+        Forking does not copy expected calls: they are shared until either
+        mock registers or executes calls on a method. Only expected calls of
+        this method are then copied, so many forks of a configured template
+        are cheap to create.
+
+        Calls returned by `on` on this mock keep tracking this mock only.
+
+        :return: forked mock
+        """
+        fork = type(self).__new__(type(self))
+        for name, value in vars(self).items():
+            if not name.startswith("_Mock__") and name not in _INSTRUMENTED:
+                setattr(fork, name, value)
+
+        for index in self.__calls.values():
+            index.shared = True
+
+        fork.__calls = dict(self.__calls)
+        fork.__latest_called = self.__latest_called
+        fork.__latest_called_per_method = dict(self.__latest_called_per_method)
+        fork.__thread_safe = self.__thread_safe
+        fork.__explain = self.__explain
+        fork.__clock = self.__clock
+        fork.__loaders = dict(self.__loaders)
+        fork.__groups = dict(self.__groups)
+        fork.__executed = set(self.__executed)
+        fork.__satisfied = dict(self.__satisfied)
+        fork.__group_ranks = dict(self.__group_ranks)
+        self.__orderings_shared = fork.__orderings_shared = True
+        if self.__history is not None:
+            fork.__history = deque(maxlen=self.__history.maxlen)
+        if self.__journal is not None:
+            fork.__journal = Journal(self.__journal.capture)
+        if self.__stats is not None:
+            fork.instrument(True, self.__latency, self.__before, self.__after)
+
+        return fork
+
+    def reset(self):
         """
         Reset mock data to avoid border effects.
         """
-        cls.__calls = {}
-        cls.__latest_called = []
+        self.__calls = {}
+        self.__latest_called = None
+        self.__latest_called_per_method = {}
+        self.__task_key.mock = None
+        self.__task_key = _TaskKey(self)
+        self.__loaders = {}
+        self.__groups = {}
+        self.__executed = set()
+        self.__satisfied = {}
+        self.__group_ranks = {}
+        self.__orderings_shared = False
+        self.__checkpoints = []
+        if self.__history is not None:
+            self.__history = deque(maxlen=self.__history.maxlen)
+        if self.__journal is not None:
+            self.__journal._clear()
+        if self.__stats is not None:
+            self.__stats = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Expected calls, counts and ordering state to pickle.
 
-    @classmethod
-    def __retrieve_call(cls, method: str, args: Tuple, kwargs: dict) -> Call:
-        if method not in cls.__calls:
-            raise UnexpectedMethod(method)
+        Lazily registered calls are loaded first. History, journal,
+        statistics and checkpoints are not kept.
+        """
+        for method in list(self.__loaders):
+            self.__load(method)
+
+        return {
+            "vars": {
+                name: value
+                for name, value in vars(self).items()
+                if not name.startswith("_Mock__") and name not in _INSTRUMENTED
+            },
+            "calls": {
+                method: (
+                    index.calls if index.owner is self else index.copy(self).calls,
+                    index.ordered,
+                )
+                for method, index in self.__calls.items()
+            },
+            "latest": self.__latest_called,
+            "latest_per_method": self.__latest_called_per_method,
+            "thread_safe": self.__thread_safe,
+            "explain": self.__explain,
+            "groups": self.__groups,
+            "unfulfilled": {
+                call_id: method
+                for method, index in self.__calls.items()
+                for call_id in index.unfulfilled
+            },
+            "executed": self.__executed,
+            "satisfied": self.__satisfied,
+            "group_ranks": self.__group_ranks,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state["vars"])
+        for method, (calls, ordered) in state["calls"].items():
+            index = _MethodIndex(self, self.__binder(method))
+            index.ordered = ordered
+            for call in calls:
+                index.add(call, *call._expected())
+            self.__calls[method] = index
+            if calls:
+                self.Call._skip_ids(calls[-1]._id)
+
+        self.__latest_called = state["latest"]
+        self.__latest_called_per_method = state["latest_per_method"]
+        self.__thread_safe = state["thread_safe"]
+        self.__explain = state["explain"]
+        self.__groups = state["groups"]
+        for call_id, method in state["unfulfilled"].items():
+            self.__calls[method].unfulfilled.add(call_id)
+        self.__executed = state["executed"]
+        self.__satisfied = state["satisfied"]
+        self.__group_ranks = state["group_ranks"]
+
+    def __reduce_ex__(self, protocol):
+        if self.__shared_key is not None:
+            from .shared import _shared_mock
+
+            return _shared_mock, (self.__shared_key,)
+        return super().__reduce_ex__(protocol)
+
+    def share(
+        self, batch: int = 1000, context: Any = None, queue: Any = None
+    ) -> "Share":
+        """
+        Count calls executed by other processes on this mock.
+
+        See `elmock.shared.Share`.
+
+        :param batch: number of calls a process executes before sending
+            their counts
+        :param context: multiprocessing context of processes, default one
+            if not set
+        :param queue: queue to send counts through, such as a manager queue
+            for processes not started by this one. A `SimpleQueue` of
+            context by default
+        :return: share to attach processes to, then to collect counts from
+        """
+        from .shared import Share
 
-        known_mocks = cls.__calls[method]
+        return Share(self, batch, context, queue)
 
-        last_known = None
-        for mock_call in known_mocks:
-            if mock_call._match(method, args, kwargs):
-                last_known = mock_call
+    def _shared(self, key: Optional[str]) -> None:
+        """
+        Pickle mock as a reference to its copy in other processes while key
+        is set.
+        """
+        self.__shared_key = key
 
-                if mock_call._on_same_method:
-                    latest_id = cls.__latest_called_per_method.get(method)
-                else:
-                    latest_id = cls.__latest_called[-1] if cls.__latest_called else None
+    def _report_to(self, report: Optional[Callable[[str, int], None]]) -> None:
+        """
+        Call report with method name and call id after each execution.
+        """
+        self.__report = report
 
-                if mock_call._allowed(latest_id):
-                    return mock_call
+    def _last_id(self) -> int:
+        """
+        Greatest id of expected calls, 0 if there is none.
+        """
+        return max(
+            (index.calls[-1]._id for index in self.__calls.values() if index.calls),
+            default=0,
+        )
 
-        if last_known is not None:
-            return last_known
+    def _merge(self, method: str, call_id: int, nb_calls: int) -> None:
+        """
+        Count calls executed by another process. Unknown calls are ignored.
+        """
+        index = self.__calls.get(method)
+        if index is None:
+            return
+        if index.shared:
+            index = self.__own(method, index)
+
+        call = index.find(call_id)
+        if call is not None:
+            if self.__checkpoints:
+                self._touch(call)
+            call._merge(nb_calls)
+
+    def checkpoint(self) -> "_Checkpoint":
+        """
+        Mark current expected calls, counts and ordering state so they can
+        be restored using `rollback`.
 
-        raise UnexpectedArguments(method, args, kwargs)
+        Taking a checkpoint costs a copy of per method and ordering state,
+        whatever the number of expected calls. Calls are then saved the
+        first time they are configured or executed, so rolling back only
+        costs what changed since. Checkpoints can be nested.
 
-    @classmethod
-    def execute(cls, method: str, *args, **kwargs) -> Any:
+        :return: checkpoint to give to `rollback`
+        """
+        checkpoint = _Checkpoint(
+            sizes={method: len(index.calls) for method, index in self.__calls.items()},
+            latest=self.__latest_called,
+            latest_per_method=dict(self.__latest_called_per_method),
+            task_latest=dict(self.__task_latest() or {}),
+            history=list(self.__history) if self.__history is not None else None,
+            loaders=dict(self.__loaders),
+            groups=dict(self.__groups),
+            executed=set(self.__executed),
+            satisfied=dict(self.__satisfied),
+            group_ranks=dict(self.__group_ranks),
+        )
+        self.__checkpoints.append(checkpoint)
+        return checkpoint
+
+    def rollback(self, checkpoint: Optional["_Checkpoint"] = None) -> None:
+        """
+        Restore expected calls, counts and ordering state as they were when
+        checkpoint was taken, then release it along with checkpoints taken
+        after it.
+
+        Calls registered since are dropped, calls configured or executed
+        since get back their settings and counts. Values already pulled by
+        `Mock.Call.returns_iter` are not pulled again. Journal and
+        statistics keep recording what happened.
+
+        :param checkpoint: checkpoint of this mock, latest one by default
+        :raises ValueError: if checkpoint is unknown or already released
+        """
+        if checkpoint is None and self.__checkpoints:
+            checkpoint = self.__checkpoints[-1]
+        if checkpoint is None or not any(c is checkpoint for c in self.__checkpoints):
+            raise ValueError("Checkpoint is unknown or already released")
+
+        while self.__checkpoints.pop() is not checkpoint:
+            pass
+
+        for method in list(self.__calls):
+            size = checkpoint.sizes.get(method)
+            if size is None:
+                del self.__calls[method]
+            elif len(self.__calls[method].calls) > size:
+                index = self.__calls[method]
+                if index.shared:
+                    index = self.__own(method, index)
+                index.truncate(size)
+
+        for call_id, snapshot in checkpoint.saved.items():
+            method = snapshot[0]
+            index = self.__calls.get(method)
+            if index is None:
+                continue
+            if index.shared:
+                index = self.__own(method, index)
+            call = index.find(call_id)
+            if call is not None:
+                call._restore(snapshot)
+                self._track(call, method)
+
+        self.__latest_called = checkpoint.latest
+        self.__latest_called_per_method = checkpoint.latest_per_method
+        if checkpoint.task_latest != (self.__task_latest() or {}):
+            mocks = dict(_task_latest.get() or {})
+            mocks[self.__task_key] = checkpoint.task_latest
+            _task_latest.set(mocks)
+        if self.__history is not None:
+            self.__history.clear()
+            self.__history.extend(checkpoint.history or ())
+        self.__loaders = checkpoint.loaders
+        self.__groups = checkpoint.groups
+        self.__executed = checkpoint.executed
+        self.__satisfied = checkpoint.satisfied
+        self.__group_ranks = checkpoint.group_ranks
+        # Restored orderings may be shared with forks made since.
+        self.__orderings_shared = True
+
+    @contextmanager
+    def scope(self) -> Iterator["Mock"]:
+        """
+        Context manager rolling back whatever happens to mock in its block,
+        see `checkpoint` and `rollback`.
+
+        :return: mock
+        """
+        checkpoint = self.checkpoint()
+        try:
+            yield self
+        finally:
+            self.rollback(checkpoint)
+
+    def _touch(self, call: Call, method: Optional[str] = None) -> None:
+        """
+        Save call in checkpoints not knowing it yet, before it changes.
+
+        If the method of a configured call is given, its expected calls are
+        first copied when shared with forks, so forks keep them unchanged.
+        """
+        if method is not None:
+            index = self.__calls.get(method)
+            if index is not None and index.shared and index.owner is self:
+                self.__own(method, index)
+
+        snapshot = None
+        for checkpoint in self.__checkpoints:
+            if call._id not in checkpoint.saved:
+                if snapshot is None:
+                    snapshot = call._snapshot()
+                checkpoint.saved[call._id] = snapshot
+
+    def keep_history(self, size: int = 1000) -> None:
+        """
+        Record executed calls in a ring buffer.
+
+        Only the `size` latest calls are kept so memory stays bounded
+        whatever the number of calls. History is disabled by default.
+
+        :param size: number of calls to keep, 0 disables history
+        """
+        self.__history = deque(maxlen=size) if size > 0 else None
+
+    def thread_safe(self, enabled: bool = True) -> None:
+        """
+        Allow mocked methods to be executed concurrently.
+
+        Each method is protected by its own lock so calls counts stay exact.
+        Methods having calls linked to calls on other methods using `before`
+        also hold a shared ordering lock while executing so links are checked
+        against a consistent latest call. Other methods only hold it to
+        publish their call.
+
+        :param enabled: whether thread safe mode is on
+        """
+        self.__thread_safe = enabled
+
+    def use_clock(self, clock: Optional["Clock"]) -> None:
+        """
+        Spend delays of calls on clock, see `Mock.Call.delay`.
+
+        :param clock: clock, such as a `elmock.clock.VirtualClock` shared
+            with code under test, real time if None (default)
+        """
+        self.__clock = clock
+
+    def __clock_of_delays(self) -> "Clock":
+        if self.__clock is None:
+            from .clock import Clock
+
+            self.__clock = Clock()
+        return self.__clock
+
+    def __execute_delayed(
+        self, call: Call, latest_id: Optional[int], latest_method_id: Optional[int]
+    ) -> Any:
+        res, error = call._attempt(latest_id, latest_method_id)
+        self.__spend_delay(call)
+        if error is not None:
+            raise error
+        return res
+
+    def __spend_delay(self, call: Call) -> None:
+        deferred = _deferred_delays.get()
+        if deferred is None:
+            self.__clock_of_delays().sleep(call._latency())
+        else:
+            deferred.append(self.__clock_of_delays().sleep_async(call._latency()))
+
+    def instrument(
+        self,
+        enabled: bool = True,
+        latency: bool = False,
+        before: Optional[Callable[[str, Tuple, dict], None]] = None,
+        after: Optional[
+            Callable[[str, Tuple, dict, Any, Optional[BaseException]], None]
+        ] = None,
+    ) -> None:
+        """
+        Collect statistics on executed calls and run hooks around them.
+
+        Statistics are reported by `stats`. Instrumented methods replace
+        mock ones on the instance, so executing calls costs nothing more
+        when instrumentation is disabled (default). Statistics are emptied
+        by `reset`.
+
+        :param enabled: whether instrumentation is on, disabling it drops
+            statistics
+        :param latency: whether latency histograms are collected
+        :param before: called with method name, arguments and named
+            arguments before each execution
+        :param after: called with method name, arguments, named arguments,
+            result and raised exception (or None) after each execution
+        """
+        for name in _INSTRUMENTED:
+            self.__dict__.pop(name, None)
+
+        if not enabled:
+            self.__stats = None
+            self.__before = self.__after = None
+            return
+
+        self.__stats = {}
+        self.__latency = latency
+        self.__before = before
+        self.__after = after
+        self._dispatch = self.__dispatch_instrumented  # type: ignore
+        self._dispatch_async = self.__dispatch_async_instrumented  # type: ignore
+        self.__retrieve_call = self.__retrieve_call_counted  # type: ignore
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report statistics collected per method, see
+        `elmock.stats.MethodStats`.
+
+        :return: statistics per method, empty if instrumentation is off
+        """
+        if self.__stats is None:
+            return {}
+        return {method: stats.dict() for method, stats in self.__stats.items()}
+
+    def __method_stats(self, method: str) -> MethodStats:
+        stats = self.__stats.get(method)  # type: ignore
+        if stats is None:
+            stats = self.__stats.setdefault(  # type: ignore
+                method, MethodStats(self.__latency)
+            )
+        return stats
+
+    def __dispatch_instrumented(
+        self, method: str, args: Tuple, kwargs: dict, bound: bool = True
+    ) -> Any:
+        stats = self.__method_stats(method)
+        stats.calls += 1
+        if self.__before is not None:
+            self.__before(method, args, kwargs)
+
+        start = time.perf_counter_ns()
+        try:
+            res = Mock._dispatch(self, method, args, kwargs, bound)
+        except Exception as error:
+            stats.errors += 1
+            stats.record_latency(time.perf_counter_ns() - start)
+            if self.__after is not None:
+                self.__after(method, args, kwargs, None, error)
+            raise
+
+        stats.record_latency(time.perf_counter_ns() - start)
+        if self.__after is not None:
+            self.__after(method, args, kwargs, res, None)
+        return res
+
+    async def __dispatch_async_instrumented(
+        self, method: str, args: Tuple, kwargs: dict, bound: bool = True
+    ) -> Any:
+        stats = self.__method_stats(method)
+        stats.calls += 1
+        if self.__before is not None:
+            self.__before(method, args, kwargs)
+
+        start = time.perf_counter_ns()
+        try:
+            res = await Mock._dispatch_async(self, method, args, kwargs, bound)
+        except Exception as error:
+            stats.errors += 1
+            stats.record_latency(time.perf_counter_ns() - start)
+            if self.__after is not None:
+                self.__after(method, args, kwargs, None, error)
+            raise
+
+        stats.record_latency(time.perf_counter_ns() - start)
+        if self.__after is not None:
+            self.__after(method, args, kwargs, res, None)
+        return res
+
+    def explain(self, enabled: bool = True) -> None:
+        """
+        Describe closest expected call in `UnexpectedArguments` messages.
+
+        Closest call is only searched when message is read, so unread
+        exceptions cost nothing more.
+
+        :param enabled: whether closest expected call is described
+        """
+        self.__explain = enabled
+
+    def history(self) -> List[Call]:
+        """
+        Retrieve latest executed calls, oldest first.
+
+        :return: executed calls, empty if history is disabled
+        """
+        return list(self.__history) if self.__history is not None else []
+
+    def journal(self, capture: Optional[Capture] = Capture.DIGESTS) -> Optional[Journal]:
+        """
+        Start a new journal of executed calls.
+
+        Unlike history, a journal keeps every call, in a compact storage
+        depending on capture level. See `elmock.journal.Journal`. Journal is
+        emptied by `reset` but stays enabled.
+
+        :param capture: what to keep for each call, None disables journal
+        :return: journal to query, None if disabled
+        """
+        self.__journal = Journal(capture) if capture is not None else None
+        return self.__journal
+
+    def __index(self, method: str) -> "_MethodIndex":
+        index = self.__calls.get(method)
+        if index is None:
+            index = self.__load(method)
+            if index is None:
+                raise UnexpectedMethod(method)
+
+        if index.shared:
+            index = self.__own(method, index)
+
+        return index
+
+    def _lazy_on(self, method: str, loader: Callable[["Mock", str], None]) -> None:
+        """
+        Defer registration of method expected calls until they are needed.
+
+        Loader is called with mock and method name, at most once, the first
+        time method is executed or configured using `on` while it has no
+        expected calls.
+        """
+        self.__loaders[method] = loader
+
+    def __load(self, method: str) -> Optional["_MethodIndex"]:
+        loader = self.__loaders.pop(method, None)
+        if loader is None:
+            return None
+
+        loader(self, method)
+        return self.__calls.get(method)
+
+    def __own(self, method: str, index: "_MethodIndex") -> "_MethodIndex":
+        """
+        Copy expected calls of method shared with forks before modifying them.
+        """
+        if index.owner is self:
+            # Keep calls returned to user: forks get copies instead.
+            own = index.copy(self)
+            own.swap(index)
+            own.shared = False
+            index.shared = True
+        else:
+            own = index.copy(self)
+
+        self.__calls[method] = own
+        return own
+
+    def __retrieve_call(
+        self,
+        index: "_MethodIndex",
+        method: str,
+        args: Tuple,
+        kwargs: dict,
+        latest_id: Optional[int],
+        latest_method_id: Optional[int],
+        bound: bool = False,
+    ) -> Call:
+        if not bound and index.binder is not None:
+            binding = index.binder.bind(args, kwargs)
+            if binding is not None:
+                args, kwargs = binding
+
+        last_known: Optional[Mock.Call] = None
+        for mock_call, matched in index.candidates(args, kwargs):
+            if matched or mock_call._match(args, kwargs):
+                last_known = mock_call
+
+                if mock_call._allowed(latest_id, latest_method_id) and mock_call._pull():
+                    break
+        else:
+            if last_known is None:
+                raise self.__unexpected_arguments(index, method, args, kwargs)
+            mock_call = last_known
+
+        if self.__checkpoints:
+            self._touch(mock_call)
+        return mock_call
+
+    def __retrieve_call_counted(
+        self,
+        index: "_MethodIndex",
+        method: str,
+        args: Tuple,
+        kwargs: dict,
+        latest_id: Optional[int],
+        latest_method_id: Optional[int],
+        bound: bool = False,
+    ) -> Call:
+        """
+        Same as `__retrieve_call`, counting candidates in method statistics.
+        """
+        if not bound and index.binder is not None:
+            binding = index.binder.bind(args, kwargs)
+            if binding is not None:
+                args, kwargs = binding
+
+        stats = self.__method_stats(method)
+        rejections = stats.rejections
+        last_known: Optional[Mock.Call] = None
+        for mock_call, matched in index.candidates(args, kwargs):
+            stats.candidates += 1
+            if matched:
+                stats.hash_hits += 1
+            else:
+                stats.match_checks += 1
+                if mock_call._uses_matchers():
+                    stats.matcher_checks += 1
+                if not mock_call._match(args, kwargs):
+                    rejections["arguments"] += 1
+                    continue
+
+            last_known = mock_call
+            rejection = mock_call._rejection(latest_id, latest_method_id)
+            if rejection is None and not mock_call._pull():
+                rejection = "exhausted"
+            if rejection is None:
+                break
+            rejections[rejection] += 1
+        else:
+            if last_known is None:
+                raise self.__unexpected_arguments(index, method, args, kwargs)
+            mock_call = last_known
+
+        if self.__checkpoints:
+            self._touch(mock_call)
+        return mock_call
+
+    def __unexpected_arguments(
+        self, index: "_MethodIndex", method: str, args: Tuple, kwargs: dict
+    ) -> UnexpectedArguments:
+        error = UnexpectedArguments(method, args, kwargs)
+        if self.__explain:
+            calls = index.calls
+            error._closest = lambda: _closest(calls, args, kwargs)
+        return error
+
+    def __task_latest(self) -> Optional[Dict[Optional[str], int]]:
+        """
+        Ids of latest calls current task made on this mock, if any.
+        """
+        mocks = _task_latest.get()
+        return mocks.get(self.__task_key) if mocks is not None else None
+
+    def __publish(
+        self, method: str, call: Call, args: Tuple, kwargs: dict, in_task: bool = False
+    ) -> None:
+        if in_task or _task_latest.get() is not None:
+            _record_task_latest(self.__task_key, method, call._id)
+        self.__record(method, call, args, kwargs)
+
+    def __record(self, method: str, call: Call, args: Tuple, kwargs: dict) -> None:
+        """
+        Keep track of a counted call, even if it raised its mocked exception.
+        """
+        if self.__history is not None:
+            self.__history.append(call)
+        if self.__journal is not None:
+            self.__journal._record(method, call._id, args, kwargs)
+        if self.__report is not None:
+            self.__report(method, call._id)
+
+    def execute(self, method: str, *args, **kwargs) -> Any:
         """
         Retrieve call from known mocked call and try to execute it.
 
@@ -334,33 +1708,767 @@ class Mock:
         :return: mocked value to return if provided
         :raises Exception: mocked Exception to return if provided
         """
-        call = cls.__retrieve_call(method, args, kwargs)
+        return self._dispatch(method, args, kwargs, False)
+
+    def execute_many(
+        self, method: str, calls: Iterable[Tuple], return_exceptions: bool = False
+    ) -> Iterator[Any]:
+        """
+        Execute method once per arguments tuple, lazily.
+
+        Results are the same as calling `execute` for each tuple, in order,
+        but calls matching each distinct arguments tuple are only looked up
+        once. Matchers are therefore expected to be pure. Counts, ordering
+        state and history are updated before each result is yielded so calls
+        made while iterating still see a consistent mock.
+
+        :param method: method name
+        :param calls: positional arguments of each call
+        :param return_exceptions: yield raised exceptions instead of raising
+            them, then go on with next calls
+        :return: generator of mocked values
+        :raises Exception: mocked Exception if return_exceptions is not set,
+            ending iteration
+        """
+        index = None
+        size = 0
+        resolved: Dict[Tuple, Tuple[Tuple, dict, List[Mock.Call]]] = {}
+
+        for args in calls:
+            if type(args) is not tuple:
+                args = tuple(args)
+
+            try:
+                if self.__thread_safe or self.__stats is not None:
+                    res = self._dispatch(method, args, {}, False)
+                else:
+                    if self.__calls.get(method) is not index or len(index.calls) != size:
+                        index = self.__index(method)
+                        size = len(index.calls)
+                        resolved = {}
+
+                    try:
+                        entry = resolved.get(args)
+                        if entry is None:
+                            entry = resolved[args] = self.__resolve(index, args)
+                    except TypeError:
+                        # Unhashable arguments are looked up on each call.
+                        entry = None
+
+                    latest_id = self.__latest_called
+                    latest_method_id = self.__latest_called_per_method.get(method)
+                    if entry is None:
+                        call = self.__retrieve_call(
+                            index, method, args, {}, latest_id, latest_method_id
+                        )
+                    elif len(entry[2]) == 1:
+                        call = entry[2][0]
+                    elif entry[2]:
+                        for call in entry[2]:
+                            if call._allowed(latest_id, latest_method_id) and call._pull():
+                                break
+                    else:
+                        raise self.__unexpected_arguments(
+                            index, method, entry[0], entry[1]
+                        )
+
+                    if self.__checkpoints:
+                        self._touch(call)
+                    try:
+                        res = (
+                            call._execute(latest_id, latest_method_id)
+                            if call._delay is None
+                            else self.__execute_delayed(call, latest_id, latest_method_id)
+                        )
+                    except UnexpectedCall:
+                        raise
+                    except Exception:
+                        self.__record(method, call, args, {})
+                        raise
+
+                    self.__latest_called = call._id
+                    self.__latest_called_per_method[method] = call._id
+                    if _task_latest.get() is not None:
+                        _record_task_latest(self.__task_key, method, call._id)
+                    if self.__history is not None:
+                        self.__history.append(call)
+                    if self.__journal is not None:
+                        self.__journal._record(method, call._id, args, {})
+                    if self.__report is not None:
+                        self.__report(method, call._id)
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                res = error
+
+            yield res
+
+    @staticmethod
+    def __resolve(index: "_MethodIndex", args: Tuple) -> Tuple[Tuple, dict, List[Call]]:
+        """
+        Bind arguments and list calls matching them, in registration order.
+        """
+        kwargs: dict = {}
+        if index.binder is not None:
+            bound = index.binder.bind(args, kwargs)
+            if bound is not None:
+                args, kwargs = bound
+
+        matches = [
+            call
+            for call, matched in index.candidates(args, kwargs)
+            if matched or call._match(args, kwargs)
+        ]
+        return args, kwargs, matches
+
+    def _dispatch(self, method: str, args: Tuple, kwargs: dict, bound: bool = True) -> Any:
+        """
+        Execute call from arguments already packed.
+
+        :param bound: whether arguments are already bound to method signature
+        """
+        if self.__thread_safe:
+            return self.__execute_locked(method, args, kwargs, bound)
+
+        index = self.__calls.get(method)
+        if index is None:
+            index = self.__index(method)
+        elif index.shared:
+            index = self.__own(method, index)
+
+        latest_id = self.__latest_called
+        latest_method_id = self.__latest_called_per_method.get(method)
+        call = self.__retrieve_call(
+            index, method, args, kwargs, latest_id, latest_method_id, bound
+        )
+
+        try:
+            res = (
+                call._execute(latest_id, latest_method_id)
+                if call._delay is None
+                else self.__execute_delayed(call, latest_id, latest_method_id)
+            )
+        except UnexpectedCall:
+            raise
+        except Exception:
+            # Counted call raising its mocked exception.
+            self.__record(method, call, args, kwargs)
+            raise
+
+        self.__latest_called = call._id
+        self.__latest_called_per_method[method] = call._id
+        self.__publish(method, call, args, kwargs)
+
+        return res
+
+    def __execute_locked(
+        self, method: str, args: Tuple, kwargs: dict, bound: bool
+    ) -> Any:
+        index = self.__calls.get(method)
+        if index is None or index.shared:
+            # Loading or copying calls replaces the index: done once.
+            with self.__ordering_lock:
+                index = self.__index(method)
+
+        # Delays are spent and mocked exceptions raised once locks are
+        # released, as in `_dispatch_async`.
+        if index.ordered:
+            with self.__ordering_lock, index.lock:
+                latest_id = self.__latest_called
+                latest_method_id = self.__latest_called_per_method.get(method)
+                call = self.__retrieve_call(
+                    index, method, args, kwargs, latest_id, latest_method_id, bound
+                )
 
-        if call._on_same_method:
-            latest_id = cls.__latest_called_per_method.get(method)
+                res, error = call._attempt(latest_id, latest_method_id)
+                if error is None:
+                    self.__latest_called = call._id
+                    self.__latest_called_per_method[method] = call._id
         else:
-            latest_id = cls.__latest_called[-1] if cls.__latest_called else None
+            with index.lock:
+                latest_method_id = self.__latest_called_per_method.get(method)
+                call = self.__retrieve_call(
+                    index, method, args, kwargs, None, latest_method_id, bound
+                )
+
+                res, error = call._attempt(None, latest_method_id)
+                if error is None:
+                    self.__latest_called_per_method[method] = call._id
 
-        res = call._execute(latest_id)
+            # Calls of unordered methods do not check it: a plain store is enough.
+            if error is None:
+                self.__latest_called = call._id
 
-        cls.__latest_called.append(call._id)
-        cls.__latest_called_per_method[method] = call._id
+        if call._delay is not None:
+            self.__spend_delay(call)
+        if error is not None:
+            self.__record(method, call, args, kwargs)
+            raise error
+
+        self.__publish(method, call, args, kwargs)
 
         return res
 
-    @classmethod
-    def assert_full_filled(cls) -> None:
+    async def execute_async(self, method: str, *args, **kwargs) -> Any:
+        """
+        Asynchronous version of `execute` to use in coroutines.
+
+        Calls links set using `before` are checked against the latest call
+        made in current task (or thread) so calls made concurrently by other
+        tasks do not break them. Tasks which made no call on this mock yet
+        check them against its latest call. If mocked return value is
+        awaitable, it is awaited.
+
+        :param method: method name
+        :param args: arguments to match
+        :param kwargs: named arguments to match
+        :return: mocked value to return if provided
+        :raises Exception: mocked Exception to return if provided
+        """
+        return await self._dispatch_async(method, args, kwargs, False)
+
+    async def _dispatch_async(
+        self, method: str, args: Tuple, kwargs: dict, bound: bool = True
+    ) -> Any:
+        """
+        Execute call from arguments already packed in a coroutine.
+
+        :param bound: whether arguments are already bound to method signature
+        """
+        if not self.__thread_safe:
+            index = self.__index(method)
+            call, res, error = self.__attempt_in_task(index, method, args, kwargs, bound)
+        else:
+            # Same locks as `__execute_locked`.
+            index = self.__calls.get(method)
+            if index is None or index.shared:
+                with self.__ordering_lock:
+                    index = self.__index(method)
+            if index.ordered:
+                with self.__ordering_lock, index.lock:
+                    call, res, error = self.__attempt_in_task(
+                        index, method, args, kwargs, bound
+                    )
+            else:
+                with index.lock:
+                    call, res, error = self.__attempt_in_task(
+                        index, method, args, kwargs, bound
+                    )
+
+        if call._delay is not None:
+            await self.__clock_of_delays().sleep_async(call._latency())
+        if error is not None:
+            self.__record(method, call, args, kwargs)
+            raise error
+
+        self.__publish(method, call, args, kwargs, True)
+
+        if isinstance(res, Awaitable):
+            return await res
+
+        return res
+
+    def __attempt_in_task(
+        self, index: "_MethodIndex", method: str, args: Tuple, kwargs: dict, bound: bool
+    ) -> Tuple[Call, Any, Optional[Exception]]:
+        """
+        Retrieve and execute call, checking links against latest calls of
+        current task, returning mocked exception instead of raising it.
+        """
+        task_latest = self.__task_latest()
+        if task_latest is None:
+            latest_id = self.__latest_called
+            latest_method_id = self.__latest_called_per_method.get(method)
+        else:
+            latest_id = task_latest.get(None)
+            latest_method_id = task_latest.get(method)
+
+        call = self.__retrieve_call(
+            index, method, args, kwargs, latest_id, latest_method_id, bound
+        )
+        res, error = call._attempt(latest_id, latest_method_id)
+        if error is None:
+            self.__latest_called = call._id
+            self.__latest_called_per_method[method] = call._id
+        return call, res, error
+
+    def _dispatch_deferred(
+        self, method: str, args: Tuple, kwargs: dict, delays: List[Awaitable]
+    ) -> Any:
+        """
+        Execute call made by a remote caller, see `elmock.server`.
+
+        Calls links are checked against the latest call of mock, as for
+        `execute`, since a remote caller may use several connections. Delays
+        are not spent but appended to delays, for caller to await them
+        without holding any lock.
+        """
+        token = _deferred_delays.set(delays)
+        try:
+            return self._dispatch(method, args, kwargs, False)
+        finally:
+            _deferred_delays.reset(token)
+
+    def _track(self, call: Call, method: str) -> None:
+        """
+        Update set of calls not full filled once call expected or actual
+        number of calls changed.
+
+        Calls not full filled are kept by their method index, so they are
+        only copied along with it when forks diverge.
+        """
+        index = self.__calls.get(method)
+        if index is None:
+            return
+        if index.shared:
+            index = self.__own(method, index)
+
+        if call.full_filled():
+            index.unfulfilled.discard(call._id)
+        else:
+            index.unfulfilled.add(call._id)
+
+    def pending(self) -> List[Call.NotFullFilled]:
+        """
+        Report calls not full filled yet, in registration order.
+
+        Calls not full filled are tracked as calls are configured and
+        executed so the cost only depends on the number of such calls.
+
+        :return: calls not full filled
+        """
+        unfulfilled = sorted(
+            (call_id, index)
+            for index in self.__calls.values()
+            for call_id in index.unfulfilled
+        )
+        incomplete: List[Mock.Call.NotFullFilled] = []
+        for call_id, index in unfulfilled:
+            call = index.find(call_id)
+            if call is not None and not call.full_filled():
+                incomplete.append(call._not_full_filled())
+
+        return incomplete
+
+    def assert_full_filled(self) -> None:
         """
         Check if all called where full filled.
         If not raise NotFullFilled error.
 
         :raises NotFullFilled: if some calls where not full filled
         """
-        incomplete: List[Mock.Call.NotFullFilled] = []
-        for calls in cls.__calls.values():
-            incomplete.extend(
-                [call._not_full_filled() for call in calls if not call.full_filled()]
-            )
-
+        incomplete = self.pending()
         if incomplete:
             raise NotFullFilled(incomplete)
+
+
+# Instance attributes set by `Mock.instrument` over class methods.
+_INSTRUMENTED = ("_dispatch", "_dispatch_async", "_Mock__retrieve_call")
+
+# Latest calls of mocks made by current task, see `Mock.execute_async`.
+_task_latest: "ContextVar[Optional[Dict[_TaskKey, Dict[Optional[str], int]]]]" = ContextVar(
+    "elmock.task_latest", default=None
+)
+
+# Delays of calls executed for `Mock._dispatch_deferred`, awaited by its caller.
+_deferred_delays: "ContextVar[Optional[List[Awaitable]]]" = ContextVar(
+    "elmock.deferred_delays", default=None
+)
+
+
+def _accepts(expected: Any, value: Any) -> bool:
+    try:
+        if isinstance(expected, Mock.ParameterMatcher):
+            return bool(expected.validate(value))
+        return bool(value == expected)
+    except Exception:
+        return False
+
+
+def _closest(calls: List[Mock.Call], args: Tuple, kwargs: dict) -> Optional[str]:
+    """
+    Describe expected call with the fewest arguments not matching.
+    """
+    closest = None
+    for call in calls:
+        mismatches = call._mismatches(args, kwargs)
+        if closest is None or len(mismatches) < len(closest[1]):
+            closest = (call, mismatches)
+
+    if closest is None:
+        return None
+
+    return f"Closest expected call {closest[0].name}: {'; '.join(closest[1])}"
+
+
+class _Checkpoint:
+    """
+    _Checkpoint holds mock state taken by `Mock.checkpoint`.
+
+    Expected calls are not copied: `sizes` tells how many calls each method
+    had and `saved` maps ids of calls changed since to their state before.
+    """
+
+    __slots__ = (
+        "sizes",
+        "latest",
+        "latest_per_method",
+        "task_latest",
+        "history",
+        "loaders",
+        "groups",
+        "executed",
+        "satisfied",
+        "group_ranks",
+        "saved",
+    )
+
+    def __init__(self, **state: Any):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.saved: Dict[int, Tuple] = {}
+
+
+class _TaskKey:
+    """
+    Key of a mock in latest calls of contexts, replaced when mock is reset.
+    """
+
+    __slots__ = ("mock",)
+
+    def __init__(self, mock: "Mock"):
+        self.mock: Optional[weakref.ref] = weakref.ref(mock)
+
+    def live(self) -> bool:
+        return self.mock is not None and self.mock() is not None
+
+
+def _record_task_latest(key: _TaskKey, method: str, call_id: int) -> None:
+    """
+    Record latest call made on mock in current context.
+
+    Contexts copied for tasks share latest calls of the context creating
+    them, so they are copied before being changed. Keys of mocks reset or
+    garbage collected are dropped meanwhile.
+    """
+    mocks = _task_latest.get()
+    if mocks is None:
+        mocks = {}
+    else:
+        mocks = {k: latest for k, latest in mocks.items() if k is key or k.live()}
+    latest = mocks.get(key)
+    latest = dict(latest) if latest is not None else {}
+    latest[None] = latest[method] = call_id
+    mocks[key] = latest
+    _task_latest.set(mocks)
+
+
+class _Returned:
+    """
+    Value of `Mock.Call.returns_iter` values returned even if it is an
+    exception.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class _Cycle:
+    """
+    Iterable repeating values endlessly, restarting for each iteration.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Tuple):
+        self.values = values
+
+    def __iter__(self) -> Iterator:
+        return cycle(self.values)
+
+
+class _Ordering:
+    """
+    _Ordering holds `after` and `in_order` constraints of a call.
+
+    Constraints are shared by copies of the call in forks: once forked, a
+    mock copies its orderings before changing them. What was already called
+    is tracked by each mock so checking a call costs a counter comparison:
+
+    - `prerequisites` are orderings of calls to make first: a mock counts,
+      per call, how many of them were made at least once.
+    - `dependents` are ids of calls having this call as prerequisite.
+    - `group` and `rank` place the call in an `in_order` group: a mock
+      tracks rank of the latest call made in each group.
+    """
+
+    __slots__ = ("prerequisites", "dependents", "group", "rank")
+
+    def __init__(self):
+        self.prerequisites: List[_Ordering] = []
+        self.dependents: List[int] = []
+        self.group: Optional[str] = None
+        self.rank = 0
+
+    def copy(self) -> "_Ordering":
+        ordering = _Ordering()
+        ordering.prerequisites = list(self.prerequisites)
+        ordering.dependents = list(self.dependents)
+        ordering.group = self.group
+        ordering.rank = self.rank
+        return ordering
+
+    def depends_on(self, other: "_Ordering") -> bool:
+        """
+        Check if other has to be called before this one, even indirectly.
+        """
+        seen = set()
+        pending = list(self.prerequisites)
+        while pending:
+            ordering = pending.pop()
+            if ordering is other:
+                return True
+            if id(ordering) not in seen:
+                seen.add(id(ordering))
+                pending.extend(ordering.prerequisites)
+        return False
+
+
+_Shape = Tuple[int, FrozenSet[str]]
+_NO_NAMES: FrozenSet = frozenset()
+
+
+def _literal_key(args: Tuple, kwargs: dict) -> Optional[Tuple]:
+    """
+    Build hash key for arguments.
+
+    Named arguments set to None are ignored as `Call._match` skips them
+    when they are not expected.
+
+    :return: key or None if some argument is a matcher or is unhashable
+    """
+    matcher = Mock.ParameterMatcher
+    for value in args:
+        if isinstance(value, matcher):
+            return None
+
+    named = _NO_NAMES
+    if kwargs:
+        for value in kwargs.values():
+            if isinstance(value, matcher):
+                return None
+
+    try:
+        if kwargs:
+            named = frozenset((k, v) for k, v in kwargs.items() if v is not None)
+        key = (args, named)
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+class _MethodIndex:
+    """
+    _MethodIndex stores expected calls for a single method.
+
+    Expected calls built from hashable literal values are indexed by their
+    arguments, grouped by shape (number of positional arguments and names of
+    not None named arguments). Calls using a `Mock.ParameterMatcher` or an
+    unhashable value are kept in a fallback list and matched one by one.
+
+    Candidates are always yielded in registration order so first allowed
+    call still wins.
+
+    `lock` and `ordered` are used by `Mock` thread safe mode. `shared` is
+    set when the index is shared between a mock and its forks: `owner` is the
+    mock calls were registered on. `unfulfilled` holds ids of calls not full
+    filled yet, see `Mock.pending`.
+    """
+
+    __slots__ = (
+        "calls",
+        "binder",
+        "lock",
+        "ordered",
+        "owner",
+        "shared",
+        "unfulfilled",
+        "_shapes",
+        "_fallback",
+    )
+
+    def __init__(self, owner: "Mock", binder: Optional[Binder] = None):
+        self.calls: List[Mock.Call] = []
+        self.binder = binder
+        self.lock = threading.Lock()
+        self.ordered = False
+        self.owner = owner
+        self.shared = False
+        self.unfulfilled: Set[int] = set()
+        self._shapes: Dict[_Shape, Tuple[Dict[Tuple, List[Mock.Call]], List[Mock.Call]]] = {}
+        self._fallback: List[Mock.Call] = []
+
+    def add(self, call: "Mock.Call", args: Tuple, kwargs: dict) -> None:
+        self.calls.append(call)
+
+        key = _literal_key(args, kwargs)
+        if key is None:
+            self._fallback.append(call)
+            return
+
+        named = key[1]
+        shape = (len(args), frozenset(k for k, _ in named) if named else _NO_NAMES)
+        group = self._shapes.get(shape)
+        if group is None:
+            group = self._shapes[shape] = ({}, [])
+
+        buckets, entries = group
+        hits = buckets.get(key)
+        if hits is None:
+            buckets[key] = [call]
+        else:
+            hits.append(call)
+        entries.append(call)
+
+    def truncate(self, size: int) -> List["Mock.Call"]:
+        """
+        Drop calls registered after the `size` first ones.
+
+        :return: dropped calls
+        """
+        removed = self.calls[size:]
+        del self.calls[size:]
+        for call in reversed(removed):
+            self.unfulfilled.discard(call._id)
+            # Calls are appended in registration order: latest ones are last
+            # in every list.
+            if self._fallback and self._fallback[-1] is call:
+                self._fallback.pop()
+                continue
+
+            args, kwargs = call._expected()
+            key: Tuple = _literal_key(args, kwargs)  # type: ignore
+            shape = (len(args), frozenset(k for k, _ in key[1]))
+            buckets, entries = self._shapes[shape]
+            entries.pop()
+            hits = buckets[key]
+            hits.pop()
+            if not hits:
+                del buckets[key]
+            if not entries:
+                del self._shapes[shape]
+
+        return removed
+
+    def find(self, call_id: int) -> Optional["Mock.Call"]:
+        """
+        Find call by id, calls being sorted by id.
+        """
+        calls = self.calls
+        low, high = 0, len(calls)
+        while low < high:
+            middle = (low + high) // 2
+            if calls[middle]._id < call_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(calls) and calls[low]._id == call_id:
+            return calls[low]
+        return None
+
+    def copy(self, owner: "Mock") -> "_MethodIndex":
+        """
+        Copy index and its calls for owner.
+        """
+        copies = {call._id: call._copy(owner) for call in self.calls}
+
+        index = _MethodIndex(owner, self.binder)
+        index.calls = list(copies.values())
+        index.ordered = self.ordered
+        index.unfulfilled = set(self.unfulfilled)
+        index._fallback = [copies[call._id] for call in self._fallback]
+        for shape, (buckets, entries) in self._shapes.items():
+            index._shapes[shape] = (
+                {
+                    key: [copies[call._id] for call in hits]
+                    for key, hits in buckets.items()
+                },
+                [copies[call._id] for call in entries],
+            )
+
+        return index
+
+    def swap(self, other: "_MethodIndex") -> None:
+        """
+        Exchange content with other index.
+        """
+        for name in self.__slots__:
+            mine = getattr(self, name)
+            setattr(self, name, getattr(other, name))
+            setattr(other, name, mine)
+
+    def candidates(self, args: Tuple, kwargs: dict) -> Iterator[Tuple["Mock.Call", bool]]:
+        """
+        Yield calls that may match arguments in registration order.
+
+        Each call comes with a flag indicating if it is already known to match
+        (hash hit) or if it still has to be checked using `Call._match`.
+        """
+        try:
+            if kwargs:
+                named = {k: v for k, v in kwargs.items() if v is not None}
+                key = (args, frozenset(named.items()))
+            else:
+                named = {}
+                key = (args, _NO_NAMES)
+            hash(key)
+        except TypeError:
+            return ((call, False) for call in self.calls)
+
+        names = frozenset(named) if named else _NO_NAMES
+        nones = kwargs.keys() - named.keys() if len(named) != len(kwargs) else ()
+
+        nb_args = len(args)
+
+        sources: List[Tuple[List[Mock.Call], bool]] = []
+        for (shape_args, shape_names), (buckets, entries) in self._shapes.items():
+            if nb_args > shape_args or not names <= shape_names:
+                continue
+            if nones and not shape_names.isdisjoint(nones):
+                continue
+
+            if nb_args == shape_args and names == shape_names:
+                hits = buckets.get(key)
+                if hits:
+                    sources.append((hits, True))
+            else:
+                # Expected call defines more arguments than provided:
+                # missing ones are not checked so they cannot be hashed.
+                sources.append((entries, False))
+
+        if self._fallback:
+            sources.append((self._fallback, False))
+
+        if len(sources) == 1:
+            entries, matched = sources[0]
+            return ((call, matched) for call in entries)
+
+        return (
+            (call, matched)
+            for _, call, matched in merge(
+                *(_tagged(entries, matched) for entries, matched in sources),
+                key=itemgetter(0),
+            )
+        )
+
+
+def _tagged(
+    entries: List["Mock.Call"], matched: bool
+) -> Iterator[Tuple[int, "Mock.Call", bool]]:
+    # A generator expression would read `matched` from the enclosing loop
+    # only when iterated, getting the last source flag.
+    return ((call._id, call, matched) for call in entries)
@@ -0,0 +1,443 @@
+"""
+Serve a mock on a local socket, for code talking to its dependencies over
+the network.
+
+Each request executes a mocked method, so expected calls, matchers,
+`times`, orders and `assert_full_filled` work as they do in process.
+"""
+import asyncio
+import json
+import threading
+from collections.abc import Awaitable
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .exception import UnexpectedArguments, UnexpectedCall, UnexpectedMethod
+from .mocker import Mock
+
+PROTOCOLS = ("http", "lines")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    409: "Conflict",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder(default=str).encode
+
+# Largest request head (http) or line (lines) buffered before answering an error.
+_LIMIT = 1 << 20
+
+
+class Response:
+    """
+    HTTP response to return from a mocked call to control status and
+    headers. Body is sent as is if it is bytes, as JSON otherwise.
+    """
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(
+        self, status: int = 200, body: Any = None, headers: Optional[Dict[str, str]] = None
+    ):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+class StubServer:
+    """
+    StubServer routes requests received on a local socket to a mock.
+
+    Protocols are:
+
+    - `http`: HTTP/1.1 with keep-alive connections. `POST /<method>` with an
+      optional JSON body `{"args": [...], "kwargs": {...}}` executes method.
+      Result is answered as JSON with status 200, or as set by a returned
+      `Response`.
+    - `lines`: one JSON object per line, `{"id": ..., "method": ...,
+      "args": [...], "kwargs": {...}}`, answered by a `{"id": ...,
+      "result": ...}` line.
+
+    Failures are answered as `{"error": <exception class>, "message": ...}`
+    with status 404 for `UnexpectedMethod`, 400 for `UnexpectedArguments`,
+    409 for `UnexpectedCall` and 500 for mocked exceptions (or under an
+    `"error"` key using `lines`).
+
+    Requests of a connection, pipelined or not, are executed and answered
+    in order. Calls links are checked against the latest call of mock,
+    whatever the connection, and delays of calls are awaited without holding
+    other connections back. Awaitable results are awaited, results which
+    are not JSON serializable are sent as strings.
+
+    :param mock: mock to execute calls on
+    :param protocol: `http` or `lines`
+    :param host: interface to listen on
+    :param port: port to listen on, any free one by default
+    """
+
+    def __init__(
+        self, mock: Mock, protocol: str = "http", host: str = "127.0.0.1", port: int = 0
+    ):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown protocol {protocol}, expected one of {PROTOCOLS}")
+
+        self.mock = mock
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connections: Set["_Connection"] = set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        Host and port server listens on, once started.
+        """
+        return self.host, self.port
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of server, once started.
+        """
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubServer":
+        """
+        Start listening in running event loop.
+
+        :return: server
+        """
+        connection = _HttpConnection if self.protocol == "http" else _LinesConnection
+        self.__server = await asyncio.get_running_loop().create_server(
+            lambda: connection(self), self.host, self.port
+        )
+        self.host, self.port = self.__server.sockets[0].getsockname()[:2]
+        return self
+
+    async def close(self) -> None:
+        """
+        Stop listening and close open connections once requests being
+        executed are answered.
+        """
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+        connections = list(self._connections)
+        await asyncio.gather(
+            *(connection.pending for connection in connections if connection.pending),
+            return_exceptions=True,
+        )
+        for connection in connections:
+            connection.close()
+
+    async def __aenter__(self) -> "StubServer":
+        return await self.start()
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def start_thread(self) -> "StubServer":
+        """
+        Start listening in an event loop of its own, in a background thread,
+        for tests not running an event loop.
+
+        Mock is executed in that thread: do not configure it while requests
+        are being served unless it is thread safe.
+
+        :return: server
+        """
+        started = threading.Event()
+        failure = []
+
+        def run():
+            loop = self.__loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as error:
+                failure.append(error)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.close())
+                loop.close()
+
+        self.__thread = threading.Thread(target=run, name="elmock-server", daemon=True)
+        self.__thread.start()
+        started.wait()
+        if failure:
+            self.__thread.join()
+            self.__thread = None
+            raise failure[0]
+        return self
+
+    def stop_thread(self) -> None:
+        """
+        Stop server started using `start_thread`.
+        """
+        if self.__thread is None:
+            return
+        self.__loop.call_soon_threadsafe(self.__loop.stop)  # type: ignore
+        self.__thread.join()
+        self.__thread = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start_thread()
+
+    def __exit__(self, *_) -> None:
+        self.stop_thread()
+
+
+class _Connection(asyncio.Protocol):
+    """
+    Connection to a client, executing its requests one after the other.
+
+    Calls are executed as soon as requests are read. Only calls having a
+    delay or an awaitable result are finished in a task, holding following
+    requests of the connection back.
+    """
+
+    def __init__(self, server: StubServer):
+        self.server = server
+        self.mock = server.mock
+        self.buffer = bytearray()
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending: Optional["asyncio.Future[None]"] = None
+        self.closing = False
+        # Answers of requests read at once, sent together.
+        self.output: Optional[List[bytes]] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore
+        self.server._connections.add(self)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.closing = True
+        self.server._connections.discard(self)
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+        if self.pending is None:
+            self.process()
+        elif len(self.buffer) > _LIMIT:
+            self.transport.pause_reading()  # type: ignore
+
+    def close(self) -> None:
+        self.flush()
+        self.closing = True
+        self.transport.close()  # type: ignore
+
+    def write(self, data: bytes) -> None:
+        if self.output is not None:
+            self.output.append(data)
+        elif not self.transport.is_closing():  # type: ignore
+            self.transport.write(data)  # type: ignore
+
+    def flush(self) -> None:
+        output, self.output = self.output, None
+        if output:
+            self.write(b"".join(output))
+
+    def process(self) -> None:
+        """
+        Execute requests read until one is incomplete or waits for a task.
+        """
+        self.output = []
+        try:
+            while self.pending is None and not self.closing and self.buffer:
+                if not self.next_request():
+                    return
+        finally:
+            self.flush()
+
+    def next_request(self) -> bool:
+        """
+        Execute first request of buffer.
+
+        :return: whether a complete request was consumed
+        """
+        raise NotImplementedError()  # pragma: no-cover
+
+    def execute(
+        self, method: str, args: Any, kwargs: Any, answer: Callable[[int, Any], None]
+    ) -> None:
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            answer(400, _error(ValueError("args must be a list and kwargs an object")))
+            return
+
+        delays: List[Awaitable] = []
+        try:
+            status, result = 200, self.mock._dispatch_deferred(
+                method, tuple(args), kwargs, delays
+            )
+        except UnexpectedMethod as error:
+            status, result = 404, _error(error)
+        except UnexpectedArguments as error:
+            status, result = 400, _error(error)
+        except UnexpectedCall as error:
+            status, result = 409, _error(error)
+        except Exception as error:
+            status, result = 500, _error(error)
+
+        if delays or isinstance(result, Awaitable):
+            self.pending = asyncio.ensure_future(
+                self.finish(status, result, delays, answer)
+            )
+        else:
+            answer(status, result)
+
+    async def finish(
+        self,
+        status: int,
+        result: Any,
+        delays: List[Awaitable],
+        answer: Callable[[int, Any], None],
+    ) -> None:
+        for delay in delays:
+            await delay
+        if isinstance(result, Awaitable):
+            try:
+                result = await result
+            except Exception as error:
+                status, result = 500, _error(error)
+
+        self.pending = None
+        answer(status, result)
+        if not self.closing:
+            self.transport.resume_reading()  # type: ignore
+            self.process()
+
+
+class _LinesConnection(_Connection):
+    def next_request(self) -> bool:
+        buffer = self.buffer
+        end = buffer.find(b"\n")
+        if end < 0:
+            if len(buffer) > _LIMIT:
+                self.write(_line({"id": None, "error": _error(ValueError("Line too long"))}))
+                self.close()
+            return False
+
+        line = bytes(buffer[:end])
+        del buffer[: end + 1]
+        if not line.strip():
+            return True
+
+        try:
+            request = _decode(line.decode())
+            method = request["method"]
+        except (ValueError, KeyError, TypeError) as error:
+            self.write(_line({"id": None, "error": _error(error)}))
+            return True
+
+        request_id = request.get("id")
+
+        def answer(status: int, result: Any) -> None:
+            self.write(
+                _line({"id": request_id, "result" if status == 200 else "error": result})
+            )
+
+        self.execute(method, request.get("args", []), request.get("kwargs", {}), answer)
+        return True
+
+
+class _HttpConnection(_Connection):
+    def next_request(self) -> bool:
+        buffer = self.buffer
+        end = buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(buffer) > _LIMIT:
+                self.fail(ValueError("Headers too large"))
+            return False
+
+        request_line, *lines = buffer[:end].decode("latin-1").split("\r\n")
+        parts = request_line.split(" ")
+        if len(parts) != 3:
+            self.fail(ValueError("Bad request line"))
+            return False
+        _, target, version = parts
+
+        headers = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", ""):
+            self.fail(ValueError("Chunked bodies unsupported"), 501)
+            return False
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError as error:
+            self.fail(error)
+            return False
+        start = end + 4
+        if len(buffer) < start + length:
+            return False
+        body = bytes(buffer[start:start + length])
+        del buffer[: start + length]
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = (
+            connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        )
+
+        def answer(status: int, result: Any) -> None:
+            self.write(_http(status, result, keep_alive))
+            if not keep_alive:
+                self.close()
+
+        try:
+            payload = _decode(body.decode()) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("Body must be a JSON object")
+        except ValueError as error:
+            answer(400, _error(error))
+            return True
+
+        method = target.partition("?")[0].strip("/")
+        self.execute(method, payload.get("args", []), payload.get("kwargs", {}), answer)
+        return True
+
+    def fail(self, error: Exception, status: int = 400) -> None:
+        """
+        Answer a request which can not be read and close connection.
+        """
+        self.write(_http(status, _error(error), False))
+        self.close()
+
+
+def _error(error: Exception) -> Dict[str, str]:
+    return {"error": type(error).__name__, "message": str(error)}
+
+
+def _line(value: Any) -> bytes:
+    return _encode(value).encode() + b"\n"
+
+
+def _http(status: int, result: Any, keep_alive: bool) -> bytes:
+    headers = "Content-Type: application/json\r\n"
+    if isinstance(result, Response):
+        status = result.status
+        if any(name.lower() == "content-type" for name in result.headers):
+            headers = ""
+        headers += "".join(f"{name}: {value}\r\n" for name, value in result.headers.items())
+        result = result.body
+
+    if not keep_alive:
+        headers += "Connection: close\r\n"
+    body = result if isinstance(result, bytes) else _encode(result).encode()
+    head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n{headers}"
+    return f"{head}Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
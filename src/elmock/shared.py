@@ -0,0 +1,256 @@
+"""
+Count calls executed on a mock by other processes.
+
+Calls executed by a process pool worker (or any child process) are counted
+by the worker copy of the mock, so they never reach the mock of the process
+asserting it is full filled. A `Share` sends counts of worker copies back,
+in batches, through a queue.
+
+Nothing is named after the mock or the test: shares of different processes,
+such as pytest-xdist workers, never collide.
+"""
+import multiprocessing
+import os
+import pickle  # nosec
+import threading
+import uuid
+from multiprocessing import util
+from multiprocessing.context import BaseContext
+from itertools import count
+from operator import itemgetter
+from queue import SimpleQueue
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mocker import Mock
+
+# Mocks shared with this process, by share key.
+_mocks: Dict[str, Mock] = {}
+# Counts waiting to be sent by this process, by share key.
+_outboxes: Dict[str, "_Outbox"] = {}
+
+
+def _shared_mock(key: str) -> Mock:
+    """
+    Resolve a pickled shared mock to its copy in current process.
+    """
+    mock = _mocks.get(key)
+    if mock is None:
+        raise pickle.UnpicklingError(
+            f"Mock shared as {key} is not attached to this process"
+        )
+    return mock
+
+
+class Share:
+    """
+    Share counts calls executed by other processes on a mock.
+
+    Each process has to be attached before executing calls, typically by
+    a process pool initializer. Counts are merged once collected, usually
+    after the pool is shut down:
+
+        with mocked.share() as share:
+            with ProcessPoolExecutor(initializer=share.attach) as pool:
+                list(pool.map(work, items))
+        mocked.assert_full_filled()
+
+    Expected calls are pushed once per process: forked processes inherit the
+    mock while other ones get a pickled copy taken the first time a process
+    is started. While shared, the mock itself pickles as a reference to that
+    copy so it can be given to each task at no cost.
+
+    Attached processes count calls they execute locally and send counts of
+    calls known when attached every `batch` executed calls, on `flush` and
+    when they exit. Merged counts update ordering state as if calls of a
+    batch were made in registration order. Values of
+    `Mock.Call.returns_iter` are pulled by each process on its own.
+    """
+
+    def __init__(
+        self,
+        mock: Mock,
+        batch: int = 1000,
+        context: Optional[BaseContext] = None,
+        queue: Any = None,
+    ):
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+
+        self.mock = mock
+        self.batch = batch
+        self.__own_queue = queue is None
+        if queue is None:
+            queue = (context or multiprocessing.get_context()).SimpleQueue()
+        self.__queue = queue
+        self.__key = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self.__pid = os.getpid()
+        self.__state: Optional[bytes] = None
+        self.__markers = count()
+
+        # Batches are read as soon as they are sent so processes never wait
+        # for the queue to be emptied, then merged by `collect`.
+        self.__received: "SimpleQueue[Any]" = SimpleQueue()
+        self.__reader: Optional[threading.Thread] = threading.Thread(
+            target=self.__read, name="elmock-share", daemon=True
+        )
+        self.__reader.start()
+
+        _mocks[self.__key] = mock
+        mock._shared(self.__key)
+
+    def __read(self) -> None:
+        while True:
+            batch = self.__queue.get()
+            self.__received.put(batch)
+            if batch is None:
+                return
+
+    def __getstate__(self) -> Dict[str, Any]:
+        if self.__state is None:
+            # Pickle the mock itself rather than a reference to it.
+            self.mock._shared(None)
+            try:
+                self.__state = pickle.dumps(self.mock, pickle.HIGHEST_PROTOCOL)
+            finally:
+                self.mock._shared(self.__key)
+
+        return {
+            "batch": self.batch,
+            "queue": self.__queue,
+            "key": self.__key,
+            "pid": self.__pid,
+            "state": self.__state,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.mock = _mocks.get(state["key"])  # type: ignore
+        self.batch = state["batch"]
+        self.__own_queue = False
+        self.__queue = state["queue"]
+        self.__reader = None
+        self.__key = state["key"]
+        self.__pid = state["pid"]
+        self.__state = state["state"]
+
+    def attach(self) -> Mock:
+        """
+        Count calls executed by current process, once.
+
+        Does nothing in the process mock was shared from.
+
+        :return: mock copy of current process
+        """
+        mock = _mocks.get(self.__key)
+        if os.getpid() == self.__pid or self.__key in _outboxes:
+            return mock  # type: ignore
+
+        if mock is None:
+            mock = pickle.loads(self.__state)  # type: ignore # nosec
+            _mocks[self.__key] = mock
+            mock._shared(self.__key)
+        self.mock = mock
+
+        outbox = _outboxes[self.__key] = _Outbox(
+            self.__queue, self.batch, mock._last_id()
+        )
+        mock._report_to(outbox.add)
+        util.Finalize(None, outbox.flush, exitpriority=10)
+        return mock
+
+    def flush(self) -> None:
+        """
+        Send counts of calls executed by current process right away.
+        """
+        outbox = _outboxes.get(self.__key)
+        if outbox is not None:
+            outbox.flush()
+
+    def collect(self) -> int:
+        """
+        Merge counts sent so far into mock.
+
+        :return: number of calls merged
+        """
+        if os.getpid() != self.__pid or self.__reader is None:
+            return 0
+
+        # Batches sent before this marker are read before it.
+        marker = f"{self.__key}-{next(self.__markers)}"
+        self.__queue.put(marker)
+
+        merged = 0
+        while True:
+            batch = self.__received.get()
+            if batch == marker:
+                return merged
+            for method, call_id, nb_calls in sorted(batch, key=itemgetter(1)):
+                self.mock._merge(method, call_id, nb_calls)
+                merged += nb_calls
+
+    def close(self) -> None:
+        """
+        Collect counts and stop sharing mock.
+        """
+        if self.__reader is None:
+            return
+
+        self.collect()
+        self.mock._shared(None)
+        _mocks.pop(self.__key, None)
+        self.__queue.put(None)
+        self.__reader.join()
+        self.__reader = None
+        if self.__own_queue and hasattr(self.__queue, "close"):
+            self.__queue.close()
+
+    def __enter__(self) -> "Share":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class _Outbox:
+    """
+    Counts of calls executed by current process, waiting to be sent.
+
+    Calls created after the process was attached are unknown to the mock
+    shared from: they are not counted.
+    """
+
+    __slots__ = ("queue", "batch", "last_id", "counts", "size", "lock")
+
+    def __init__(self, queue: Any, batch: int, last_id: int):
+        self.queue = queue
+        self.batch = batch
+        self.last_id = last_id
+        self.counts: Dict[Tuple[str, int], int] = {}
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def add(self, method: str, call_id: int) -> None:
+        if call_id > self.last_id:
+            return
+
+        with self.lock:
+            key = (method, call_id)
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.size += 1
+            if self.size >= self.batch:
+                self.__send()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.__send()
+
+    def __send(self) -> None:
+        if not self.counts:
+            return
+
+        batch: List[Tuple[str, int, int]] = [
+            (method, call_id, nb_calls)
+            for (method, call_id), nb_calls in self.counts.items()
+        ]
+        self.counts = {}
+        self.size = 0
+        self.queue.put(batch)
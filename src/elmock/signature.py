@@ -0,0 +1,122 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no-cover
+    import inspect
+
+
+class _Missing:
+    """
+    Marker for a parameter without default value which was not provided.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+class Binder:
+    """
+    Binder maps arguments of a call to a method parameters.
+
+    Positional and named arguments are bound to a canonical tuple holding one
+    value per parameter, in signature order, with defaults applied. Extra
+    positional arguments (*args) are appended to the tuple and extra named
+    arguments (**kwargs) are returned apart.
+
+    Binding is done without `inspect.Signature.bind` which is too slow to be
+    run on every mocked call.
+    """
+
+    __slots__ = ("_defaults", "_positions", "_nb_positional", "_var_args", "_var_kwargs")
+
+    def __init__(self, signature: "inspect.Signature"):
+        defaults: List[Any] = []
+        positions = {}
+        nb_positional = 0
+        self._var_args = False
+        self._var_kwargs = False
+
+        for parameter in signature.parameters.values():
+            if parameter.kind == parameter.VAR_POSITIONAL:
+                self._var_args = True
+                continue
+            if parameter.kind == parameter.VAR_KEYWORD:
+                self._var_kwargs = True
+                continue
+
+            if parameter.kind != parameter.POSITIONAL_ONLY:
+                positions[parameter.name] = len(defaults)
+            if parameter.kind != parameter.KEYWORD_ONLY:
+                nb_positional += 1
+
+            defaults.append(
+                MISSING if parameter.default is parameter.empty else parameter.default
+            )
+
+        self._defaults: Tuple = tuple(defaults)
+        self._positions: Dict[str, int] = positions
+        self._nb_positional = nb_positional
+
+    @classmethod
+    def of(cls, function: Callable, bound: bool) -> Optional["Binder"]:
+        """
+        Build binder for function.
+
+        :param function: mocked method
+        :param bound: whether first parameter (self) is already bound
+        :return: binder or None if signature can not be read
+        """
+        import inspect
+
+        try:
+            signature = inspect.signature(function)
+        except (TypeError, ValueError):
+            return None
+
+        if not bound:
+            parameters = list(signature.parameters.values())[1:]
+            signature = signature.replace(parameters=parameters)
+
+        return cls(signature)
+
+    def bind(self, args: Tuple, kwargs: Dict[str, Any]) -> Optional[Tuple[Tuple, Dict]]:
+        """
+        Bind arguments to parameters.
+
+        :return: canonical arguments and extra named arguments or None if
+            arguments do not fit signature
+        """
+        nb_args = len(args)
+        if nb_args > self._nb_positional:
+            if not self._var_args:
+                return None
+            extra = args[self._nb_positional:]
+            args = args[: self._nb_positional]
+            nb_args = self._nb_positional
+        else:
+            extra = ()
+
+        if not kwargs:
+            if nb_args == len(self._defaults):
+                return args + extra, {}
+            return args + self._defaults[nb_args:] + extra, {}
+
+        values = list(args)
+        values.extend(self._defaults[nb_args:])
+        extra_kwargs = {}
+        for name, value in kwargs.items():
+            position = self._positions.get(name)
+            if position is None:
+                if not self._var_kwargs:
+                    return None
+                extra_kwargs[name] = value
+            elif position < nb_args:
+                return None
+            else:
+                values[position] = value
+
+        return tuple(values) + extra, extra_kwargs
@@ -0,0 +1,102 @@
+import inspect
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+def spec_methods(spec: type) -> Iterator[Tuple[str, Callable, bool]]:
+    """
+    List public methods of a class.
+
+    :param spec: class to read methods from
+    :return: name, function and whether first parameter is bound (self or cls)
+        for each method
+    """
+    for name in dir(spec):
+        if name.startswith("_"):
+            continue
+
+        attribute = inspect.getattr_static(spec, name)
+        if isinstance(attribute, staticmethod):
+            yield name, attribute.__func__, False
+        elif isinstance(attribute, classmethod):
+            yield name, attribute.__func__, True
+        elif inspect.isfunction(attribute):
+            yield name, attribute, True
+
+
+def build_method(name: str, function: Callable, bound: bool) -> Callable:
+    """
+    Generate a mocked method with the same signature as function.
+
+    Generated method packs its arguments in the order used by
+    `elmock.signature.Binder` and hands them to `Mock._dispatch` (or
+    `Mock._dispatch_async` for coroutine functions) so they are not bound
+    again on each call.
+
+    :param name: mocked method name
+    :param function: function to copy signature from
+    :param bound: whether function first parameter is self or cls
+    :return: function to set on a Mock subclass
+    """
+    parameters = list(inspect.signature(function).parameters.values())
+    if bound:
+        parameters = parameters[1:]
+
+    namespace: Dict[str, Any] = {}
+    declaration: List[str] = ["_elmock_self"]
+    fixed: List[str] = []
+    var_args = var_kwargs = None
+    keyword_only = False
+
+    for i, parameter in enumerate(parameters):
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            var_args = parameter.name
+            declaration.append(f"*{parameter.name}")
+            continue
+        if parameter.kind == parameter.VAR_KEYWORD:
+            var_kwargs = parameter.name
+            declaration.append(f"**{parameter.name}")
+            continue
+
+        if parameter.kind == parameter.KEYWORD_ONLY and not keyword_only:
+            keyword_only = True
+            if var_args is None:
+                declaration.append("*")
+
+        text = parameter.name
+        if parameter.default is not parameter.empty:
+            namespace[f"_elmock_default_{i}"] = parameter.default
+            text += f"=_elmock_default_{i}"
+        declaration.append(text)
+        fixed.append(parameter.name)
+
+        if parameter.kind == parameter.POSITIONAL_ONLY and (
+            i + 1 == len(parameters)
+            or parameters[i + 1].kind != parameter.POSITIONAL_ONLY
+        ):
+            declaration.append("/")
+
+    packed_args = f"({', '.join(fixed)}{',' if len(fixed) == 1 else ''})"
+    if var_args is not None:
+        packed_args += f" + {var_args}"
+    packed_kwargs = var_kwargs if var_kwargs is not None else "{}"
+
+    if inspect.iscoroutinefunction(function):
+        source = (
+            f"async def {name}({', '.join(declaration)}):\n"
+            f"    return await _elmock_self._dispatch_async("
+            f"{name!r}, {packed_args}, {packed_kwargs})\n"
+        )
+    else:
+        source = (
+            f"def {name}({', '.join(declaration)}):\n"
+            f"    return _elmock_self._dispatch({name!r}, {packed_args}, {packed_kwargs})\n"
+        )
+
+    exec(source, namespace)  # nosec
+    method = namespace[name]
+    method.__doc__ = function.__doc__
+    method.__module__ = function.__module__
+    method.__qualname__ = function.__qualname__
+    method.__annotations__ = dict(getattr(function, "__annotations__", {}))
+
+    return method
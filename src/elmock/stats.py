@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+
+REJECTIONS = ("arguments", "times", "order", "exhausted")
+
+
+class MethodStats:
+    """
+    MethodStats counts what executing a mocked method costs.
+
+    - `calls`: executions, failed ones included,
+    - `errors`: executions which raised,
+    - `candidates`: expected calls considered,
+    - `hash_hits`: candidates known to match from arguments hash,
+    - `match_checks`: candidates checked using `Mock.Call._match`, of which
+      `matcher_checks` expect some `Mock.ParameterMatcher`,
+    - `rejections`: candidates rejected by reason: `arguments` not matching,
+      `times` exhausted, `order` broken or returned values `exhausted`,
+    - `latency`: if enabled, number of executions per latency bucket. Bucket
+      `n` counts executions lasting less than 2^n nanoseconds.
+    """
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "candidates",
+        "hash_hits",
+        "match_checks",
+        "matcher_checks",
+        "rejections",
+        "latency",
+    )
+
+    def __init__(self, latency: bool = False):
+        self.calls = 0
+        self.errors = 0
+        self.candidates = 0
+        self.hash_hits = 0
+        self.match_checks = 0
+        self.matcher_checks = 0
+        self.rejections: Dict[str, int] = dict.fromkeys(REJECTIONS, 0)
+        self.latency: Optional[List[int]] = [] if latency else None
+
+    def record_latency(self, nanoseconds: int) -> None:
+        latency = self.latency
+        if latency is None:
+            return
+        bucket = nanoseconds.bit_length()
+        if bucket >= len(latency):
+            latency.extend([0] * (bucket + 1 - len(latency)))
+        latency[bucket] += 1
+
+    def dict(self) -> Dict[str, Any]:
+        """
+        Report as a dictionary.
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "candidates": self.candidates,
+            "hash_hits": self.hash_hits,
+            "match_checks": self.match_checks,
+            "matcher_checks": self.matcher_checks,
+            "rejections": dict(self.rejections),
+            "latency": {
+                2 ** bucket: count for bucket, count in enumerate(self.latency) if count
+            }
+            if self.latency is not None
+            else None,
+        }
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from src.elmock import Mock, UnexpectedMethod
+from src.elmock.cassette import Cassette, Recorder
+from src.elmock.exception import UnexpectedArguments, UnexpectedCall
+
+
+class Store:
+    def __init__(self):
+        self.values = {}
+
+    def put(self, key: str, value: int = 0) -> None:
+        self.values[key] = value
+
+    def get(self, key: str) -> int:
+        return self.values[key]
+
+    async def fetch(self, key: str) -> int:
+        return self.values[key]
+
+    def error(self, key: str) -> Exception:
+        return KeyError(key)
+
+    def close(self) -> str:
+        return "closed"
+
+
+class StoreMock(Mock):
+    def put(self, key: str, value: int = 0) -> None:
+        return self.execute("put", key, value)
+
+    def get(self, key: str) -> int:
+        return self.execute("get", key)
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = str(tmp_path / "store.cassette")
+    with Recorder(Store(), path) as store:
+        store.put("a", value=1)
+        store.put("b", 2)
+        assert store.get("a") == 1
+        assert store.get("b") == 2
+        with pytest.raises(KeyError):
+            store.get("c")
+        assert asyncio.run(store.fetch("a")) == 1
+
+    with Cassette(path) as cassette:
+        yield cassette
+
+
+class TestCassette:
+    def test_should_index_calls_per_method(self, cassette):
+        assert sorted(cassette.methods()) == ["fetch", "get", "put"]
+        assert list(cassette.calls("put")) == [(("a",), {"value": 1}), (("b", 2), {})]
+
+    def test_should_replay_calls(self, cassette):
+        mocked = cassette.replay(StoreMock())
+
+        assert mocked.get("b") == 2
+        assert mocked.get("a") == 1
+        with pytest.raises(KeyError):
+            mocked.get("c")
+        with pytest.raises(UnexpectedArguments):
+            mocked.get("d")
+        assert asyncio.run(mocked.execute_async("fetch", "a")) == 1
+
+        mocked.put("a", 1)
+        mocked.put("b", value=2)
+        with pytest.raises(UnexpectedCall):
+            mocked.put("b", 2)
+
+    def test_should_only_read_used_methods(self, cassette):
+        mocked = cassette.replay(StoreMock())
+        mocked.on("get", "z").returns(26)
+
+        assert mocked.get("z") == 26
+        assert mocked.get("a") == 1
+        with pytest.raises(UnexpectedMethod):
+            mocked.execute("delete", "a")
+
+    def test_should_record_all_methods_of_real_object(self, tmp_path):
+        path = str(tmp_path / "store.cassette")
+        recorder = Recorder(Store(), path)
+        assert recorder.proxy.close() == "closed"
+        assert isinstance(recorder.proxy.error("a"), KeyError)
+        recorder.close()
+
+        with Cassette(path) as cassette:
+            assert sorted(cassette.methods()) == ["close", "error"]
+            mocked = cassette.replay(Mock())
+            assert mocked.execute("close") == "closed"
+            assert isinstance(mocked.execute("error", "a"), KeyError)
+
+    def test_should_not_change_calls_which_can_not_be_recorded(self, tmp_path):
+        path = str(tmp_path / "store.cassette")
+        recorder = Recorder(Store(), path)
+        recorder.proxy.put("a", 1)
+        assert recorder.proxy.put("b", lambda: 2) is None
+        assert recorder.proxy.get("a") == 1
+
+        with pytest.raises(ValueError, match="cassette misses 1 of them: put"):
+            recorder.close()
+
+        with Cassette(path) as cassette:
+            assert list(cassette.calls("put")) == [(("a", 1), {})]
+            assert cassette.replay(StoreMock()).get("a") == 1
+
+    def test_should_refuse_incomplete_cassette(self, tmp_path):
+        path = tmp_path / "broken.cassette"
+        path.write_bytes(b"not a cassette")
+
+        with pytest.raises(ValueError):
+            Cassette(str(path))
@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from src.elmock import Mock, UnexpectedCall
+from src.elmock.clock import Clock, VirtualClock, VirtualEventLoop
+
+
+class Backend(Mock):
+    def fetch(self, key: str):
+        return self.execute("fetch", key)
+
+    async def fetch_async(self, key: str):
+        return await self.execute_async("fetch_async", key)
+
+
+class TestVirtualClock:
+    def test_should_advance_on_sleep(self):
+        clock = VirtualClock(10)
+        clock.sleep(0.5)
+        clock.advance(1)
+
+        assert clock.time() == 11.5
+        with pytest.raises(ValueError):
+            clock.advance(-1)
+
+    def test_should_fire_loop_timers_without_waiting(self):
+        clock = VirtualClock()
+
+        async def main():
+            await asyncio.gather(asyncio.sleep(3600), asyncio.sleep(60))
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.sleep(10), timeout=1)
+            return asyncio.get_running_loop()
+
+        start = time.monotonic()
+        loop = clock.run(main())
+
+        assert isinstance(loop, VirtualEventLoop)
+        assert clock.time() == pytest.approx(3601)
+        assert time.monotonic() - start < 1
+
+
+class TestDelay:
+    def test_should_spend_delay_on_mock_clock(self):
+        clock = VirtualClock()
+        backend = Backend()
+        backend.use_clock(clock)
+        backend.on("fetch", "a").returns(1).delay(0.2)
+        backend.on("fetch", "b").raises(KeyError("b")).delay(0.3)
+
+        assert backend.fetch("a") == 1
+        with pytest.raises(KeyError):
+            backend.fetch("b")
+        assert clock.time() == pytest.approx(0.5)
+
+    def test_should_draw_delays_from_distribution(self):
+        clock = VirtualClock()
+        backend = Backend()
+        backend.use_clock(clock)
+        latencies = itertools.count(1)
+        backend.on("fetch", Mock.ANY).delay(lambda: next(latencies))
+
+        for key in "abc":
+            backend.fetch(key)
+        assert clock.time() == 6
+
+    def test_should_not_delay_unexpected_calls(self):
+        clock = VirtualClock()
+        backend = Backend()
+        backend.use_clock(clock)
+        backend.on("fetch", "a").once().delay(1)
+
+        backend.fetch("a")
+        with pytest.raises(UnexpectedCall):
+            backend.fetch("a")
+        assert clock.time() == 1
+
+    def test_should_delay_concurrent_tasks_at_the_same_time(self):
+        clock = VirtualClock()
+        backend = Backend()
+        backend.use_clock(clock)
+        backend.on("fetch_async", "slow").returns("late").delay(5)
+        backend.on("fetch_async", Mock.ANY).returns("ok").delay(0.2)
+
+        async def main():
+            results = await asyncio.gather(
+                *(backend.fetch_async(str(i)) for i in range(1000))
+            )
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(backend.fetch_async("slow"), timeout=1)
+            return results
+
+        assert clock.run(main()) == ["ok"] * 1000
+        assert clock.time() == pytest.approx(1.2)
+
+    def test_should_not_hold_locks_while_delayed(self):
+        class BlockingClock(Clock):
+            def __init__(self):
+                self.sleeping = threading.Event()
+                self.wake = threading.Event()
+
+            def sleep(self, seconds: float) -> None:
+                self.sleeping.set()
+                assert self.wake.wait(5)
+
+        clock = BlockingClock()
+        backend = Backend()
+        backend.thread_safe()
+        backend.use_clock(clock)
+        backend.on("fetch", "slow").returns("late").delay(1)
+        backend.on("fetch", "fast").returns("ok")
+
+        results = []
+        slow = threading.Thread(target=lambda: results.append(backend.fetch("slow")))
+        fast = threading.Thread(target=lambda: results.append(backend.fetch("fast")))
+        slow.start()
+        assert clock.sleeping.wait(5)
+        fast.start()
+        fast.join(2)
+        clock.wake.set()
+        slow.join()
+        fast.join()
+
+        assert results == ["ok", "late"]
+
+    def test_should_wait_for_real_without_clock(self, monkeypatch):
+        slept = []
+        monkeypatch.setattr(Clock, "sleep", lambda self, seconds: slept.append(seconds))
+        backend = Backend()
+        backend.on("fetch", "a").delay(0.2)
+
+        backend.fetch("a")
+        assert slept == [0.2]
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.elmock import Mock
+from src.elmock.exception import NotFullFilled, UnexpectedArguments, UnexpectedCall
+
+
+class StoreMock(Mock):
+    def get(self, key: str, default: int = 0) -> int:
+        return self.execute("get", key, default)
+
+
+def write_jsonl(path, rows):
+    with open(path, "w") as file:
+        for row in rows:
+            file.write(json.dumps(row) + "\n")
+    return str(path)
+
+
+class TestLoadExpectations:
+    def test_should_register_rows_of_json_lines(self, tmp_path):
+        path = write_jsonl(
+            tmp_path / "store.jsonl",
+            [
+                {"method": "get", "args": ["a"], "returns": {"value": 1}, "times": 2},
+                {"method": "get", "kwargs": {"key": "b"}, "returns": [2]},
+                {"method": "put", "args": ["a", 1]},
+            ],
+        )
+        mocked = Mock()
+
+        assert mocked.load_expectations(path) == 3
+        assert mocked.execute("get", "a") == {"value": 1}
+        assert mocked.execute("get", key="b") == [2]
+        assert mocked.execute("get", "a") == {"value": 1}
+        assert mocked.execute("put", "a", 1) is None
+        with pytest.raises(UnexpectedCall):
+            mocked.execute("get", "a")
+        mocked.assert_full_filled()
+
+    def test_should_register_rows_of_csv(self, tmp_path):
+        path = tmp_path / "store.csv"
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["method", "args", "kwargs", "returns", "times"])
+            writer.writerow(["get", '["a"]', "", '{"text": "multi,\\nline"}', "1"])
+            writer.writerow(["get", "", '{"key": "b"}', "2", ""])
+            writer.writerow([])
+            writer.writerow(["get", '["c"]', "", "", "0"])
+        mocked = Mock()
+
+        assert mocked.load_expectations(path) == 3
+        assert mocked.execute("get", "a") == {"text": "multi,\nline"}
+        assert mocked.execute("get", key="b") == 2
+        with pytest.raises(UnexpectedCall):
+            mocked.execute("get", "c")
+        mocked.assert_full_filled()
+
+    def test_should_bind_rows_to_mocked_methods(self, tmp_path):
+        path = write_jsonl(
+            tmp_path / "store.jsonl",
+            [
+                {"method": "get", "kwargs": {"key": "a"}, "returns": 1, "times": 1},
+                {"method": "get", "args": ["b", 5], "returns": 2},
+            ],
+        )
+        mocked = StoreMock()
+        mocked.load_expectations(path)
+
+        assert mocked.get("a") == 1
+        assert mocked.get("b", default=5) == 2
+        with pytest.raises(UnexpectedArguments):
+            mocked.get("b")
+
+    def test_should_read_returned_values_on_first_call(self, tmp_path):
+        path = write_jsonl(
+            tmp_path / "store.jsonl",
+            [{"method": "get", "args": [key], "returns": "old"} for key in "ab"],
+        )
+        lazy, eager = Mock(), Mock()
+        lazy.load_expectations(path)
+        eager.load_expectations(path, lazy=False)
+        assert lazy.execute("get", "a") == "old"
+
+        with open(path, "r+") as file:
+            content = file.read().replace("old", "new")
+            file.seek(0)
+            file.write(content)
+
+        assert lazy.execute("get", "a") == "old"
+        assert lazy.execute("get", "b") == "new"
+        assert eager.execute("get", "b") == "old"
+
+    def test_should_register_mappings_and_lines(self):
+        mocked = Mock()
+        mocked.load_expectations(
+            [
+                {"method": "get", "args": (Mock.AnyTyped(int),), "returns": 1},
+                {"method": "put", "args": ["a"], "times": 1},
+            ]
+        )
+        lines = io.StringIO('{"method": "delete", "args": ["a"], "returns": true}\n')
+        mocked.load_expectations(lines, format="jsonl")
+
+        assert mocked.execute("get", 42) == 1
+        assert mocked.execute("delete", "a") is True
+        with pytest.raises(NotFullFilled):
+            mocked.assert_full_filled()
+        mocked.execute("put", "a")
+        mocked.assert_full_filled()
+
+    def test_should_report_malformed_rows(self, tmp_path):
+        path = tmp_path / "store.jsonl"
+        path.write_text('{"method": "get", "args": ["a"]}\n{"method": "get", "args": "a"}\n')
+        mocked = Mock()
+
+        with pytest.raises(ValueError, match="store.jsonl:2: args must be a list"):
+            mocked.load_expectations(path)
+        assert mocked.execute("get", "a") is None
+
+        with pytest.raises(ValueError, match="unknown fields"):
+            mocked.load_expectations([{"method": "get", "return": 1}])
+        with pytest.raises(ValueError, match="header"):
+            mocked.load_expectations(io.StringIO("name,args\n"), format="csv")
+        with pytest.raises(ValueError, match="Can not guess format"):
+            mocked.load_expectations(tmp_path / "store.yaml")
+        with pytest.raises(ValueError, match="Unknown format"):
+            mocked.load_expectations([], format="yaml")
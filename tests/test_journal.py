@@ -0,0 +1,100 @@
+import gc
+
+import pytest
+
+from src.elmock import Mock
+from src.elmock.journal import COLLECTED, Capture, Journal
+
+
+class Sink(Mock):
+    def write(self, record, flush: bool = False):
+        return self.execute("write", record, flush=flush)
+
+
+class Record:
+    pass
+
+
+class TestJournal:
+    def test_should_only_count_calls(self):
+        sink = Sink()
+        journal = sink.journal(Capture.COUNTS)
+        sink.on("write", Mock.ANY, Mock.ANY)
+
+        for i in range(3):
+            sink.write(i)
+
+        assert journal.methods() == ["write"]
+        assert journal.count("write") == 3
+        assert journal.count("read") == 0
+        with pytest.raises(ValueError):
+            journal.calls("write")
+
+    def test_should_keep_digests(self):
+        sink = Sink()
+        journal = sink.journal()
+        call = sink.on("write", Mock.ANY, Mock.ANY)
+
+        sink.write(1)
+        since = journal.position()
+        sink.write([2], flush=True)
+        list(sink.execute_many("write", [(3,)]))
+
+        entries = journal.calls("write", since=since)
+        assert [entry.position for entry in entries] == [1, 2]
+        assert entries[0].call_id == call._id
+        assert entries[0].digest == Journal.digest([2], flush=True)
+        assert entries[0].args is None
+        assert journal.count("write", since=since) == 2
+
+        payload = list(range(100_000))
+        assert Journal.digest(payload) == Journal.digest(list(range(100_000)))
+        assert Journal.digest(payload) != Journal.digest([1])
+
+    def test_should_record_calls_raising_exceptions(self):
+        sink = Sink()
+        sink.keep_history()
+        journal = sink.journal()
+        failing = sink.on("write", "bad", Mock.ANY).raises(ValueError("bad"))
+        sink.on("write", Mock.ANY, Mock.ANY)
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                sink.write("bad")
+        sink.write("good")
+
+        assert journal.count("write") == 3
+        assert [entry.call_id for entry in journal.calls("write")][:2] == [failing._id] * 2
+        assert sink.history()[:2] == [failing, failing]
+
+    def test_should_not_keep_arguments_alive(self):
+        sink = Sink()
+        journal = sink.journal(Capture.ARGUMENTS)
+        sink.on("write", Mock.ANY, Mock.ANY)
+
+        record = Record()
+        sink.write(record, flush=True)
+        assert journal.calls("write")[0].args == (record,)
+        assert journal.calls("write")[0].kwargs == {"flush": True}
+
+        del record
+        gc.collect()
+        assert journal.calls("write")[0].args == (COLLECTED,)
+
+    def test_should_follow_reset_and_forks(self):
+        sink = Sink()
+        journal = sink.journal(Capture.COUNTS)
+        sink.on("write", Mock.ANY, Mock.ANY)
+        sink.write(1)
+
+        fork = sink.fork()
+        fork.write(2)
+        assert journal.count("write") == 1
+
+        sink.reset()
+        assert journal.count("write") == 0
+        sink.on("write", Mock.ANY, Mock.ANY)
+        sink.write(3)
+        assert journal.count("write") == 1
+        assert journal.position() == 1
+        assert sink.journal(None) is None
@@ -0,0 +1,64 @@
+import re
+
+from src.elmock import Mock
+from src.elmock.matchers import (ANY, And, AnyStrMatching, AnyTyped, In, Not,
+                                 Or, Range)
+
+
+class TestMatchers:
+    def test_should_be_exposed_on_mock(self):
+        assert Mock.ANY is ANY
+        assert Mock.AnyTyped is AnyTyped
+        assert Mock.Range is Range
+
+    def test_should_intern_matchers(self):
+        assert AnyTyped((str, dict)) is AnyTyped((str, dict))
+        assert AnyStrMatching(r"[0-9]+") is AnyStrMatching(r"[0-9]+")
+        assert AnyStrMatching(r"[0-9]+") is not AnyStrMatching(r"[0-9]*")
+        assert Range(1, high=2) is Range(1, high=2)
+        assert In([1], [2]) is not In([1], [2])
+        assert not hasattr(AnyTyped(int), "__dict__")
+
+    def test_should_match_compiled_regex(self):
+        matcher = AnyStrMatching(re.compile(r"[1-4]49"))
+
+        assert matcher.validate("349")
+        assert matcher.validate(149)
+        assert not matcher.validate("549")
+
+    def test_should_combine_matchers(self):
+        number = And(AnyTyped(int), Not(True), Range(0, 10))
+
+        assert number.validate(5)
+        assert not number.validate(11)
+        assert not number.validate("5")
+        assert not number.validate(True)
+
+        either = Or("a", AnyStrMatching("b+"))
+        assert either.validate("a")
+        assert either.validate("bbb")
+        assert not either.validate("c")
+
+    def test_should_short_circuit(self):
+        class Boom(Mock.ParameterMatcher):
+            @staticmethod
+            def validate(parameter):
+                raise AssertionError("should not be called")
+
+        assert not And(False, Boom()).validate(True)
+        assert Or(True, Boom()).validate(True)
+
+    def test_should_match_values(self):
+        assert In("a", "b").validate("b")
+        assert not In("a", "b").validate("c")
+        assert not In("a", "b").validate(["a"])
+        assert In([1], {"a": 1}).validate({"a": 1})
+
+    def test_should_match_range(self):
+        assert Range(1, 3).validate(1)
+        assert Range(1, 3).validate(3)
+        assert not Range(1, 3).validate(4)
+        assert Range(low="b").validate("c")
+        assert Range(high=0).validate(-10)
+        assert not Range(1, 3).validate("2")
+        assert ANY.validate(object())
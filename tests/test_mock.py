@@ -1,3 +1,11 @@
+import asyncio
+import contextvars
+import pickle  # nosec
+import subprocess  # nosec
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import pytest
@@ -20,6 +28,9 @@ class Mocker(Mock):
     def test_no_return(self, p1: str, kp1: Any = None):
         self.execute("test_no_return", p1, kp1=kp1)
 
+    async def test_async(self, p1: Any):
+        return await self.execute_async("test_async", p1)
+
 
 mocked = Mocker()
 
@@ -447,18 +458,19 @@ class TestMock:
             assert mocked_call.full_filled()
             mocked.reset()
 
+            # Expected arguments are bound to method signature
             mocked_call = mocked.on("test_smtg", "test", "test")
 
-            with pytest.raises(UnexpectedArguments):
-                mocked.test_smtg("test", "test")
+            mocked.test_smtg("test", "test")
 
+            assert mocked_call.full_filled()
             mocked.reset()
 
             mocked_call = mocked.on("test_smtg", p1="test", kp1="test")
 
-            with pytest.raises(UnexpectedArguments):
-                mocked.test_smtg("test", "test")
+            mocked.test_smtg("test", "test")
 
+            assert mocked_call.full_filled()
             mocked.reset()
 
         def test_should_match_args_passed_as_kwargs(self):
@@ -468,3 +480,836 @@ class TestMock:
 
             assert mocked_call.called()
             assert mocked_call.full_filled()
+
+    class TestIndexedDispatch:
+        def test_should_dispatch_among_many_expectations(self):
+            for i in range(1000):
+                mocked.on("test_smtg", f"sku-{i}", kp1=i).returns(i * 2).once()
+
+            assert mocked.test_smtg("sku-999", 999) == 1998
+            assert mocked.test_smtg("sku-0", 0) == 0
+
+            mocked.reset()
+
+        def test_should_keep_registration_order_with_matchers(self):
+            mocked.on("test_smtg", Mock.ANY, kp1="b").returns("any").once()
+            mocked.on("test_smtg", "a", kp1="b").returns("literal").once()
+
+            assert mocked.test_smtg("a", "b") == "any"
+            assert mocked.test_smtg("a", "b") == "literal"
+
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("a", "b")
+
+        def test_should_match_unhashable_arguments(self):
+            mocked.on("test_smtg", {"blah": ["test"]}, kp1=[1, 2]).returns("ok")
+            mocked.on("test_smtg", "a", kp1=[1, 2]).returns("ko")
+
+            assert mocked.test_smtg({"blah": ["test"]}, [1, 2]) == "ok"
+            assert mocked.test_smtg("a", [1, 2]) == "ko"
+
+            with pytest.raises(UnexpectedArguments):
+                mocked.test_smtg({"blah": []}, [1, 2])
+
+        def test_should_match_unhashable_named_arguments_without_signature(self):
+            # Method is not defined on mocked class: no signature binding
+            mocked.on("test_undefined", x=[1]).returns("list")
+            mocked.on("test_undefined", x={"a": 1}).returns("dict")
+
+            assert mocked.execute("test_undefined", x=[1]) == "list"
+            assert mocked.execute("test_undefined", x={"a": 1}) == "dict"
+
+            with pytest.raises(UnexpectedArguments):
+                mocked.execute("test_undefined", x=[2])
+
+        def test_should_ignore_arguments_not_provided(self):
+            # Method is not defined on mocked class: no signature binding
+            call = mocked.on("test_undefined", "a", kp1="b").returns("ok")
+
+            assert mocked.execute("test_undefined", "a") == "ok"
+            assert mocked.execute("test_undefined") == "ok"
+            assert call.full_filled()
+
+            with pytest.raises(UnexpectedArguments):
+                mocked.execute("test_undefined", "a", kp1="c")
+
+    class TestHistory:
+        def test_should_not_keep_history_by_default(self):
+            mocked.on("test_no_args")
+            mocked.test_no_args()
+
+            assert mocked.history() == []
+
+        def test_should_keep_latest_calls_only(self):
+            mocked.keep_history(2)
+            first = mocked.on("test_smtg", "a")
+            second = mocked.on("test_smtg", "b")
+
+            mocked.test_smtg("a")
+            mocked.test_smtg("b")
+            assert mocked.history() == [first, second]
+
+            mocked.test_smtg("a")
+            assert mocked.history() == [second, first]
+
+            mocked.reset()
+            assert mocked.history() == []
+
+            mocked.keep_history(0)
+
+    class TestCallIdentity:
+        def test_calls_should_have_increasing_ids(self):
+            first = mocked.on("test_no_args")
+            second = mocked.on("test_no_args")
+
+            assert isinstance(first._id, int)
+            assert second._id > first._id
+            assert first.name == f"test_no_args#{first._id}"
+            assert not hasattr(first, "__dict__")
+
+            mocked.reset()
+
+    class TestImport:
+        def test_should_not_import_pydantic(self):
+            subprocess.run(  # nosec
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys, src.elmock; assert 'pydantic' not in sys.modules",
+                ],
+                cwd=Path(__file__).parent.parent,
+                check=True,
+            )
+
+        def test_not_full_filled_report(self):
+            call = mocked.on("test_smtg", "a", kp1="b").once()
+
+            assert call._not_full_filled().dict() == {
+                "method": "test_smtg",
+                "args": ("a", "b"),
+                "kwargs": {},
+                "expected": 1,
+                "called": 0,
+            }
+
+            mocked.reset()
+
+    class TestThreadSafe:
+        @pytest.fixture(autouse=True)
+        def __thread_safe(self):
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            mocked.thread_safe()
+
+            yield
+
+            mocked.thread_safe(False)
+            sys.setswitchinterval(switch_interval)
+
+        def test_should_respect_times_across_threads(self):
+            call = mocked.on("test_smtg", "a").times(1000)
+
+            def run(_):
+                done = 0
+                for _ in range(100):
+                    try:
+                        mocked.test_smtg("a")
+                        done += 1
+                    except UnexpectedCall:
+                        pass
+                return done
+
+            with ThreadPoolExecutor(32) as pool:
+                assert sum(pool.map(run, range(32))) == 1000
+
+            assert call.full_filled()
+            mocked.reset()
+
+        def test_should_check_links_across_threads(self):
+            mocked.on("test_no_args", Mock.ANY)
+            (
+                mocked.on("test_smtg", "a")
+                .returns("first")
+                .before("test_smtg", "b", on_same_method=True)
+                .returns("second")
+            )
+
+            def noise(_):
+                for _ in range(200):
+                    mocked.execute("test_no_args", 0)
+
+            with ThreadPoolExecutor(32) as pool:
+                futures = [pool.submit(noise, i) for i in range(31)]
+                assert mocked.test_smtg("a") == "first"
+                assert mocked.test_smtg("b") == "second"
+                for future in futures:
+                    future.result()
+
+            mocked.reset()
+
+    class TestAsync:
+        def test_should_return_and_raise(self):
+            async def fetch():
+                return "fetched"
+
+            mocked.on("test_async", "value").returns("ok")
+            mocked.on("test_async", "awaitable").returns(fetch())
+            mocked.on("test_async", "error").raises(ValueError("test"))
+
+            async def run():
+                assert await mocked.test_async("value") == "ok"
+                assert await mocked.test_async("awaitable") == "fetched"
+                with pytest.raises(ValueError):
+                    await mocked.test_async("error")
+
+            asyncio.run(run())
+
+        def test_should_check_links_per_task(self):
+            mocked.on("test_async", "first").returns(1).before(
+                "test_async", "second"
+            ).returns(2)
+
+            async def chain(i):
+                assert await mocked.test_async("first") == 1
+                await asyncio.sleep(0)
+                assert await mocked.test_async("second") == 2
+                return i
+
+            async def run():
+                return await asyncio.gather(*(chain(i) for i in range(100)))
+
+            assert asyncio.run(run()) == list(range(100))
+
+        def test_should_detect_broken_links_in_task(self):
+            mocked.on("test_async", "first").once().before("test_async", "second")
+            mocked.on("test_no_args")
+
+            async def run():
+                await mocked.test_async("first")
+                mocked.test_no_args()
+                with pytest.raises(UnexpectedCall):
+                    await mocked.test_async("second")
+
+            asyncio.run(run())
+            mocked.reset()
+
+        def test_should_not_grow_context(self):
+            mocked.on("test_no_args").before("test_async", "value")
+            mocked.test_no_args()
+            size = len(contextvars.copy_context())
+
+            async def run():
+                await mocked.test_async("value")
+                for _ in range(3):
+                    other = Mocker()
+                    other.on("test_async", 1)
+                    other.on("test_no_args")
+                    await other.test_async(1)
+                    other.test_no_args()
+                    other.reset()
+                return len(contextvars.copy_context())
+
+            assert asyncio.run(run()) <= size + 1
+            assert len(contextvars.copy_context()) == size
+
+        def test_should_hold_ordering_lock_in_thread_safe_mode(self):
+            other = Mocker()
+            other.thread_safe()
+            concurrent = threading.Thread(target=other.test_smtg, args=("a",))
+            blocked = []
+
+            class Probe(Mock.ParameterMatcher):
+                @staticmethod
+                def validate(parameter):
+                    if not blocked:
+                        concurrent.start()
+                        concurrent.join(0.1)
+                        blocked.append(concurrent.is_alive())
+                    return True
+
+            linked = other.on("test_async", Probe()).returns(1)
+            other.on("test_smtg", "a")
+            other.on("test_smtg", "b").after(linked)
+
+            assert asyncio.run(other.test_async("value")) == 1
+            concurrent.join(2)
+            assert blocked == [True]
+            other.test_smtg("b")
+
+    class TestInstances:
+        def test_instances_should_not_share_expectations(self):
+            other = Mocker()
+            mocked.on("test_no_args").returns("mocked")
+            other.on("test_no_args").returns("other")
+
+            assert mocked.test_no_args() == "mocked"
+            assert other.test_no_args() == "other"
+
+            other.reset()
+            assert mocked.test_no_args() == "mocked"
+            with pytest.raises(UnexpectedMethod):
+                other.test_no_args()
+
+        def test_forks_should_record_calls_independently(self):
+            template = Mocker()
+            call = template.on("test_smtg", "a").returns("a").once()
+            template.on("test_no_args").returns("no args")
+
+            first, second = template.fork(), template.fork()
+
+            assert first.test_smtg("a") == "a"
+            with pytest.raises(UnexpectedCall):
+                first.test_smtg("a")
+
+            assert second.test_smtg("a") == "a"
+            assert call.called() is False
+
+            first.assert_full_filled()
+            with pytest.raises(NotFullFilled):
+                template.assert_full_filled()
+
+        def test_template_changes_should_not_leak_in_forks(self):
+            template = Mocker()
+            call = template.on("test_smtg", "a").returns("a").once()
+
+            fork = template.fork()
+            assert template.test_smtg("a") == "a"
+            template.on("test_smtg", "b").returns("b")
+
+            assert call.full_filled()
+            assert fork.test_smtg("a") == "a"
+            with pytest.raises(UnexpectedArguments):
+                fork.test_smtg("b")
+
+        def test_template_calls_configured_after_fork_should_not_leak_in_forks(self):
+            template = Mocker()
+            call = template.on("test_smtg", "a").returns("a")
+
+            fork = template.fork()
+            call.returns("changed").once()
+
+            assert fork.test_smtg("a") == "a"
+            assert fork.test_smtg("a") == "a"
+            fork.assert_full_filled()
+            assert template.test_smtg("a") == "changed"
+            with pytest.raises(UnexpectedCall):
+                template.test_smtg("a")
+
+        def test_forks_should_keep_links(self):
+            template = Mocker()
+            template.on("test_no_args").once().before("test_smtg", "a").once()
+
+            fork = template.fork()
+            fork.test_no_args()
+            fork.test_smtg("a")
+            fork.assert_full_filled()
+
+            fork = template.fork()
+            with pytest.raises(UnexpectedCall):
+                fork.test_smtg("a")
+
+    class TestCompiledMatch:
+        def test_should_check_literals_and_matchers(self):
+            call = Mock.Call("test_smtg", mocked, "a", Mock.ANY, kp1=Mock.ANY, kp2=2)
+
+            assert call._match(("a", object()), {"kp1": 1, "kp2": 2})
+            assert call._match(("a",), {"kp3": None})
+            assert not call._match(("b", 1), {})
+            assert not call._match(("a", 1, 2), {})
+            assert not call._match(("a", 1), {"kp2": 3})
+            assert not call._match(("a", 1), {"kp3": 3})
+
+    class TestSignatureBinding:
+        class Signed(Mock):
+            def method(self, p1, p2=2, *args, k1=None, **kwargs):
+                return self.execute("method", p1, p2, *args, k1=k1, **kwargs)
+
+            def defaults(self, p1, flag=True):
+                return self.execute("defaults", p1, flag=flag)
+
+        def test_should_match_however_arguments_are_passed(self):
+            signed = self.Signed()
+            call = signed.on("method", p2=3, p1=1).returns("ok")
+
+            assert signed.method(1, 3) == "ok"
+            assert signed.method(p1=1, p2=3) == "ok"
+            assert call.full_filled()
+
+        def test_should_match_unspecified_arguments_to_defaults(self):
+            signed = self.Signed()
+            signed.on("defaults", "a").returns("default")
+            signed.on("defaults", "a", False).returns("not default")
+
+            assert signed.defaults("a") == "default"
+            assert signed.defaults("a", flag=False) == "not default"
+
+        def test_should_match_variable_arguments_exactly(self):
+            signed = self.Signed()
+            signed.on("method", 1, 2, 3, k1=Mock.ANY, extra="x").returns("ok")
+
+            assert signed.method(1, 2, 3, k1="any", extra="x") == "ok"
+            with pytest.raises(UnexpectedArguments):
+                signed.method(1, 2, k1="any", extra="x")
+            with pytest.raises(UnexpectedArguments):
+                signed.method(1, 2, 3, 4, k1="any", extra="x")
+
+    class TestFromSpec:
+        class Gateway:
+            def get(self, key: str, default: Any = None) -> Any:
+                """Get a value."""
+
+            def put(self, key: str, /, *values, ttl: int = 0, **options) -> None:
+                pass
+
+            @staticmethod
+            def ping() -> bool:
+                pass
+
+            async def fetch(self, key: str) -> Any:
+                pass
+
+            def _private(self):
+                pass
+
+        def test_should_generate_methods_with_spec_signatures(self):
+            mocked_class = Mock.from_spec(self.Gateway)
+            assert Mock.from_spec(self.Gateway) is mocked_class
+
+            gateway = mocked_class()
+            assert gateway.get.__doc__ == "Get a value."
+            assert not hasattr(gateway, "_private")
+
+            gateway.on("get", "a").returns(1)
+            gateway.on("get", key="b", default=2).returns(2)
+            gateway.on("put", "a", 1, 2, ttl=3, mode="w")
+            gateway.on("ping").returns(True)
+
+            assert gateway.get("a") == 1
+            assert gateway.get("b", 2) == 2
+            assert gateway.put("a", 1, 2, ttl=3, mode="w") is None
+            assert gateway.ping() is True
+
+            with pytest.raises(UnexpectedArguments):
+                gateway.get("a", 2)
+            with pytest.raises(TypeError):
+                gateway.get()
+
+            gateway.assert_full_filled()
+
+        def test_should_generate_coroutines(self):
+            gateway = Mock.from_spec(self.Gateway)()
+            gateway.on("fetch", "a").returns("fetched")
+
+            assert asyncio.run(gateway.fetch("a")) == "fetched"
+
+        def test_should_refuse_spec_conflicting_with_mock(self):
+            class Conflict:
+                def reset(self):
+                    pass
+
+            with pytest.raises(TypeError):
+                Mock.from_spec(Conflict)
+
+    class TestExecuteMany:
+        def test_should_behave_as_successive_executes(self):
+            mocked.on("test_smtg", "a").returns("first").once()
+            mocked.on("test_smtg", "a").returns("next")
+            mocked.on("test_smtg", Mock.AnyStrMatching("b")).returns("b")
+            mocked.keep_history()
+
+            results = mocked.execute_many("test_smtg", [("a",), ("b",), ("a",), ["a"]])
+
+            assert list(results) == ["first", "b", "next", "next"]
+            assert len(mocked.history()) == 4
+            mocked.keep_history(0)
+
+        def test_should_check_links(self):
+            mocked.on("test_no_args").once().before("test_smtg", "a")
+
+            with pytest.raises(UnexpectedCall):
+                list(mocked.execute_many("test_smtg", [("a",)]))
+
+            mocked.test_no_args()
+            assert list(mocked.execute_many("test_smtg", [("a",)])) == [None]
+
+        def test_should_stream_errors(self):
+            error = ValueError("error")
+            mocked.on("test_smtg", "a").raises(error)
+            mocked.on("test_smtg", "b").returns("b")
+
+            results = mocked.execute_many(
+                "test_smtg", [("a",), ("b",), ("c",)], return_exceptions=True
+            )
+            first, second, third = results
+            assert first is error
+            assert second == "b"
+            assert isinstance(third, UnexpectedArguments)
+
+            with pytest.raises(ValueError):
+                list(mocked.execute_many("test_smtg", [("b",), ("a",)]))
+
+        def test_should_see_calls_registered_while_iterating(self):
+            mocked.on("test_smtg", "a").returns("a").once()
+
+            results = mocked.execute_many("test_smtg", [("a",), ("a",)])
+            assert next(results) == "a"
+            mocked.on("test_smtg", "a").returns("again")
+            assert next(results) == "again"
+
+    class TestReturnsIter:
+        def test_should_pull_values_lazily(self):
+            pulled = []
+
+            def rows():
+                for i in range(3):
+                    pulled.append(i)
+                    yield i
+
+            call = mocked.on("test_no_args").returns_iter(rows())
+            mocked.on("test_no_args").returns("fallback")
+
+            assert mocked.test_no_args() == 0
+            assert pulled == [0]
+            assert mocked.test_no_args() == 1
+            assert mocked.test_no_args() == 2
+
+            assert mocked.test_no_args() == "fallback"
+            assert pulled == [0, 1, 2]
+            assert call.full_filled()
+
+        def test_should_raise_once_values_are_exhausted(self):
+            mocked.on("test_smtg", "a").returns_iter(iter([1]))
+
+            assert mocked.test_smtg("a") == 1
+            with pytest.raises(UnexpectedCall) as exc:
+                mocked.test_smtg("a")
+            assert exc.value.reason == "exhausted"
+
+        def test_should_raise_exceptions_in_values(self):
+            error = ValueError("error")
+            mocked.on("test_smtg", "a").returns_cycle(1, error)
+
+            assert mocked.test_smtg("a") == 1
+            with pytest.raises(ValueError):
+                mocked.test_smtg("a")
+            assert mocked.test_smtg("a") == 1
+
+        def test_should_respect_times(self):
+            mocked.on("test_smtg", "a").returns_iter(range(10)).twice()
+
+            assert mocked.test_smtg("a") == 0
+            assert mocked.test_smtg("a") == 1
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("a")
+
+        def test_should_be_overwritten_by_returns(self):
+            mocked.on("test_smtg", "a").returns_cycle(1).returns(2)
+
+            assert mocked.test_smtg("a") == 2
+
+        def test_forks_should_iterate_independently(self):
+            template = Mocker()
+            template.on("test_no_args").returns_cycle("a", "b")
+
+            first, second = template.fork(), template.fork()
+            assert first.test_no_args() == "a"
+            assert second.test_no_args() == "a"
+            assert first.test_no_args() == "b"
+
+        def test_forks_should_iterate_started_iterators_independently(self):
+            template = Mocker()
+            template.on("test_smtg", "a").returns_iter(iter(range(3)))
+            template.on("test_smtg", "b").returns_iter(str(i) for i in range(3))
+            assert template.test_smtg("a") == 0
+
+            first, second = template.fork(), template.fork()
+            assert [first.test_smtg("a"), first.test_smtg("a")] == [1, 2]
+            assert second.test_smtg("a") == 1
+            assert first.test_smtg("b") == "0"
+            assert [second.test_smtg("b"), second.test_smtg("b")] == ["0", "1"]
+            assert [template.test_smtg("a"), template.test_smtg("b")] == [1, "0"]
+
+    class TestMessages:
+        class Payload:
+            formatted = 0
+
+            def __repr__(self):
+                TestMock.TestMessages.Payload.formatted += 1
+                return "payload" * 1000
+
+        def test_should_format_message_only_when_read(self):
+            mocked.on("test_smtg", "a")
+            payload = self.Payload()
+
+            with pytest.raises(UnexpectedArguments) as exc:
+                mocked.test_smtg(payload)
+            assert self.Payload.formatted == 0
+
+            assert "test_smtg" in str(exc.value)
+            assert len(exc.value.message) < 500
+            assert self.Payload.formatted == 1
+
+            mocked.test_smtg("a")
+
+        def test_should_describe_closest_expected_call(self):
+            mocked.explain()
+            mocked.on("test_smtg", "a", kp1="b")
+            call = mocked.on("test_smtg", "c", kp1=Mock.AnyTyped(int))
+
+            with pytest.raises(UnexpectedArguments) as exc:
+                mocked.test_smtg("c", kp1="d")
+
+            assert f"Closest expected call {call.name}: argument #1" in exc.value.message
+            assert "got 'd'" in exc.value.message
+            copy = pickle.loads(pickle.dumps(exc.value))
+            assert copy.message == exc.value.message
+            assert (copy.call_args, copy.call_kwargs) == (exc.value.call_args, {})
+
+            mocked.explain(False)
+            with pytest.raises(UnexpectedArguments) as exc:
+                mocked.test_smtg("c", kp1="d")
+            assert "Closest" not in exc.value.message
+
+            mocked.test_smtg("a", kp1="b")
+            mocked.test_smtg("c", kp1=1)
+
+    class TestOrdering:
+        def test_after_should_wait_for_all_calls_in_any_order(self):
+            first = mocked.on("test_smtg", "a")
+            second = mocked.on("test_no_args")
+            last = mocked.on("test_smtg", "c").after(first, second)
+
+            mocked.test_no_args()
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("c")
+
+            mocked.test_smtg("a")
+            mocked.test_smtg("c")
+            mocked.test_smtg("c")
+            assert last.called()
+
+        def test_after_should_refuse_cycles(self):
+            first = mocked.on("test_smtg", "a")
+            second = mocked.on("test_smtg", "b").after(first)
+            third = mocked.on("test_smtg", "c").after(second)
+
+            with pytest.raises(ValueError):
+                first.after(third)
+            with pytest.raises(ValueError):
+                first.after(Mocker().on("test_no_args"))
+
+            mocked.test_smtg("a")
+            mocked.test_smtg("b")
+            mocked.test_smtg("c")
+
+        def test_groups_should_keep_order_with_calls_in_between(self):
+            login = mocked.on("test_smtg", "login")
+            fetch = mocked.on("test_smtg", "fetch").times(2)
+            logout = mocked.on("test_smtg", "logout")
+            mocked.on("test_no_args")
+            mocked.in_order("session", login, fetch)
+            mocked.in_order("session", logout)
+
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("fetch")
+
+            mocked.test_smtg("login")
+            mocked.test_no_args()
+            mocked.test_smtg("fetch")
+            mocked.test_smtg("fetch")
+            mocked.test_smtg("logout")
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("login")
+
+            with pytest.raises(ValueError):
+                mocked.in_order("other", login)
+
+        def test_should_count_calls_made_before_being_linked(self):
+            first = mocked.on("test_smtg", "a")
+            second = mocked.on("test_smtg", "b")
+            mocked.test_smtg("a")
+
+            mocked.on("test_smtg", "c").after(first)
+            mocked.in_order("session", first, second)
+            mocked.test_smtg("b")
+            mocked.test_smtg("c")
+
+        def test_should_tell_why_call_was_rejected(self):
+            first = mocked.on("test_smtg", "a").once()
+            mocked.on("test_smtg", "b").after(first)
+
+            with pytest.raises(UnexpectedCall) as exc:
+                mocked.test_smtg("b")
+            assert exc.value.reason == "order"
+            assert "#None" not in exc.value.message
+            assert "were not all made" in exc.value.message
+
+            mocked.test_smtg("a")
+            with pytest.raises(UnexpectedCall) as exc:
+                mocked.test_smtg("a")
+            assert "already reached" in exc.value.message
+            mocked.test_smtg("b")
+
+        def test_forks_should_track_order_independently(self):
+            template = Mocker()
+            first = template.on("test_smtg", "a")
+            template.on("test_smtg", "b").after(first)
+
+            fork = template.fork()
+            fork.test_smtg("a")
+            fork.test_smtg("b")
+
+            with pytest.raises(UnexpectedCall):
+                template.fork().test_smtg("b")
+
+        def test_orders_set_after_fork_should_not_leak(self):
+            template = Mock()
+            first = template.on("x")
+            second = template.on("a")
+            third = template.on("b").after(first)
+
+            fork = template.fork()
+            third.after(second)
+            template.in_order("session", second, first)
+            fork.execute("x")
+            fork.execute("b")
+
+            other = template.fork()
+            other.in_order("session", other.on("c"), other.on("d"))
+            template.execute("a")
+            template.execute("x")
+            template.execute("b")
+            for method in "axbcd":
+                other.execute(method)
+
+    class TestPending:
+        def test_should_track_calls_not_full_filled(self):
+            first = mocked.on("test_smtg", "a").once()
+            second = mocked.on("test_smtg", "b").twice()
+            mocked.on("test_no_args")
+
+            assert [report.args for report in mocked.pending()] == [
+                ("a", None),
+                ("b", None),
+            ]
+
+            mocked.test_smtg("b")
+            mocked.test_smtg("a")
+            assert [report.called for report in mocked.pending()] == [1]
+
+            mocked.test_smtg("b")
+            assert mocked.pending() == []
+
+            first.times(2)
+            assert mocked.pending() == [first._not_full_filled()]
+            first.once()
+            assert second.full_filled()
+
+        def test_forks_should_track_their_own_calls(self):
+            template = Mocker()
+            template.on("test_smtg", "a").once()
+
+            fork = template.fork()
+            fork.test_smtg("a")
+
+            assert fork.pending() == []
+            assert [report.called for report in template.pending()] == [0]
+            with pytest.raises(NotFullFilled):
+                template.assert_full_filled()
+
+        def test_forks_should_keep_calls_not_full_filled_when_forked(self):
+            template = Mocker()
+            template.on("test_smtg", "a").once()
+            template.on("test_no_args").twice()
+
+            fork = template.fork()
+            template.test_no_args()
+            template.test_no_args()
+            fork.test_smtg("a")
+
+            assert [report.method for report in fork.pending()] == ["test_no_args"]
+            assert [report.method for report in template.pending()] == ["test_smtg"]
+
+    class TestScope:
+        def test_should_roll_back_calls_registered_in_scope(self):
+            base = mocked.on("test_smtg", "a").returns(1).once()
+
+            with mocked.scope():
+                mocked.on("test_smtg", "b").returns(2).once()
+                mocked.on("test_no_args").returns(3)
+                assert mocked.test_smtg("b") == 2
+                assert mocked.test_no_args() == 3
+
+            with pytest.raises(UnexpectedArguments):
+                mocked.test_smtg("b")
+            with pytest.raises(UnexpectedMethod):
+                mocked.test_no_args()
+            assert mocked.test_smtg("a") == 1
+            assert base.full_filled()
+
+        def test_should_roll_back_counts_and_settings(self):
+            call = mocked.on("test_smtg", "a").returns(1).once()
+
+            checkpoint = mocked.checkpoint()
+            assert mocked.test_smtg("a") == 1
+            call.returns(2).times(2)
+            assert mocked.test_smtg("a") == 2
+            assert mocked.pending() == []
+            mocked.rollback(checkpoint)
+
+            assert [report.called for report in mocked.pending()] == [0]
+            assert mocked.test_smtg("a") == 1
+            with pytest.raises(UnexpectedCall):
+                mocked.test_smtg("a")
+
+        def test_should_nest_checkpoints(self):
+            call = mocked.on("test_smtg", "a")
+
+            outer = mocked.checkpoint()
+            mocked.test_smtg("a")
+            mocked.checkpoint()
+            mocked.test_smtg("a")
+            mocked.on("test_smtg", "b")
+            mocked.rollback()
+
+            assert call._not_full_filled().called == 1
+            with pytest.raises(UnexpectedArguments):
+                mocked.test_smtg("b")
+
+            mocked.checkpoint()
+            mocked.test_smtg("a")
+            mocked.rollback(outer)
+            assert not call.called()
+            with pytest.raises(ValueError):
+                mocked.rollback(outer)
+
+        def test_should_roll_back_ordering(self):
+            first = mocked.on("test_smtg", "a")
+            second = mocked.on("test_no_args")
+            mocked.in_order("group", first, second)
+
+            with mocked.scope():
+                mocked.on("test_smtg", "b").after(second)
+                mocked.test_smtg("a")
+                mocked.test_no_args()
+                mocked.test_smtg("b")
+
+            with pytest.raises(UnexpectedCall):
+                mocked.test_no_args()
+            assert second._ordering.dependents == []
+            mocked.test_smtg("a")
+            mocked.test_no_args()
+
+        def test_should_not_change_forks(self):
+            mocked.on("test_smtg", "a").once()
+            fork = mocked.fork()
+
+            with mocked.scope():
+                mocked.test_smtg("a")
+                mocked.on("test_smtg", "b")
+
+            fork.test_smtg("a")
+            fork.assert_full_filled()
+            with pytest.raises(UnexpectedArguments):
+                fork.test_smtg("b")
+            mocked.test_smtg("a")
@@ -0,0 +1,133 @@
+import asyncio
+import http.client
+import json
+import socket
+
+import pytest
+
+from src.elmock import Mock
+from src.elmock.clock import VirtualClock
+from src.elmock.exception import NotFullFilled
+from src.elmock.server import Response, StubServer
+
+backend = Mock()
+
+
+def post(connection: http.client.HTTPConnection, method: str, *args, **kwargs):
+    connection.request(
+        "POST", f"/{method}", json.dumps({"args": list(args), "kwargs": kwargs})
+    )
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+class TestStubServer:
+    @pytest.fixture(autouse=True)
+    def __cleanup(self):
+        yield
+        backend.reset()
+        backend.use_clock(None)
+
+    def test_should_answer_http_requests_on_kept_alive_connection(self):
+        backend.on("get", "a").returns({"value": 1}).twice()
+        backend.on("get", key=Mock.AnyTyped(str)).returns([2])
+
+        with StubServer(backend) as server:
+            connection = http.client.HTTPConnection(*server.address)
+            assert post(connection, "get", "a") == (200, {"value": 1})
+            assert post(connection, "get", "a") == (200, {"value": 1})
+            assert post(connection, "get", key="b") == (200, [2])
+            connection.close()
+
+        backend.assert_full_filled()
+
+    def test_should_answer_failures_with_status(self):
+        backend.on("get", "a").returns(1).once()
+        backend.on("get", "error").raises(KeyError("error"))
+        backend.on("put").returns(Response(503, b"busy", {"Retry-After": "1"}))
+
+        with StubServer(backend) as server:
+            connection = http.client.HTTPConnection(*server.address)
+            assert post(connection, "get", "a") == (200, 1)
+            assert post(connection, "get", "a")[0] == 409
+            assert post(connection, "get", "b")[0] == 400
+            assert post(connection, "delete")[0] == 404
+            assert post(connection, "get", "error") == (
+                500,
+                {"error": "KeyError", "message": "'error'"},
+            )
+
+            connection.request("POST", "/put")
+            response = connection.getresponse()
+            assert (response.status, response.read()) == (503, b"busy")
+            assert response.getheader("Retry-After") == "1"
+            connection.close()
+
+    def test_should_check_order_across_connections(self):
+        backend.on("open").before("close").once()
+
+        with StubServer(backend) as server:
+            first = http.client.HTTPConnection(*server.address)
+            second = http.client.HTTPConnection(*server.address)
+            assert post(second, "close")[0] == 409
+            assert post(first, "open")[0] == 200
+            assert post(second, "close")[0] == 200
+            first.close()
+            second.close()
+
+        backend.assert_full_filled()
+
+    def test_should_answer_pipelined_lines(self):
+        backend.on("add", 1, 2).returns(3)
+        backend.on("add", 2, 2).returns(4).once()
+
+        with StubServer(backend, protocol="lines") as server:
+            with socket.create_connection(server.address) as connection:
+                requests = [
+                    {"id": 1, "method": "add", "args": [1, 2]},
+                    {"id": 2, "method": "add", "args": [2, 2]},
+                    {"id": 3, "method": "add", "args": [3, 2]},
+                ]
+                connection.sendall(
+                    b"".join(json.dumps(request).encode() + b"\n" for request in requests)
+                )
+                lines = connection.makefile("rb")
+                answers = [json.loads(lines.readline()) for _ in requests]
+
+        assert answers[:2] == [{"id": 1, "result": 3}, {"id": 2, "result": 4}]
+        assert answers[2]["error"]["error"] == "UnexpectedArguments"
+        backend.assert_full_filled()
+
+    def test_should_not_hold_other_connections_during_delays(self):
+        clock = VirtualClock()
+        backend.use_clock(clock)
+        backend.on("slow").returns("slow").delay(10)
+        backend.on("fast").returns("fast")
+
+        async def call(server: StubServer, method: str):
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(json.dumps({"method": method}).encode() + b"\n")
+            answer = json.loads(await reader.readline())
+            writer.close()
+            return answer["result"], clock.time()
+
+        async def main():
+            async with StubServer(backend, protocol="lines") as server:
+                return await asyncio.gather(call(server, "slow"), call(server, "fast"))
+
+        assert clock.run(main()) == [("slow", 10), ("fast", 0)]
+
+    def test_should_keep_not_full_filled_calls_of_server(self):
+        backend.on("get", "a").returns(1).times(2)
+
+        with StubServer(backend) as server:
+            connection = http.client.HTTPConnection(*server.address)
+            post(connection, "get", "a")
+            connection.close()
+
+        with pytest.raises(NotFullFilled):
+            backend.assert_full_filled()
+
+    def test_should_refuse_unknown_protocol(self):
+        with pytest.raises(ValueError):
+            StubServer(backend, protocol="grpc")
@@ -0,0 +1,150 @@
+import multiprocessing
+import pickle  # nosec
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.elmock import Mock
+from src.elmock.exception import NotFullFilled, UnexpectedCall
+
+forking = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork start method is not available",
+)
+
+
+class Store(Mock):
+    def get(self, key: str):
+        return self.execute("get", key)
+
+    def commit(self):
+        return self.execute("commit")
+
+
+store = Store()
+
+
+def get(key: str):
+    return store.get(key)
+
+
+def get_from(mock: Store, key: str):
+    return mock.get(key)
+
+
+def attach_and_get(share, keys):
+    share.attach()
+    for key in keys:
+        store.get(key)
+
+
+class TestShare:
+    @pytest.fixture(autouse=True)
+    def __cleanup(self):
+        yield
+        store.reset()
+
+    def test_should_pickle_expected_calls_and_counts(self):
+        store.on("get", Mock.In("a", "b")).returns(1).twice()
+        prerequisite = store.on("get", "c").returns(2)
+        store.on("commit").after(prerequisite)
+        store.get("a")
+
+        copy = pickle.loads(pickle.dumps(store))
+
+        assert copy.pending() == store.pending()
+        with pytest.raises(UnexpectedCall):
+            copy.commit()
+        assert copy.get("b") == 1
+        assert copy.get("c") == 2
+        copy.commit()
+
+    @forking
+    def test_should_count_calls_made_by_forked_workers(self):
+        store.on("get", "a").returns(1).times(10)
+        store.on("get", "b").returns(2).once()
+        context = multiprocessing.get_context("fork")
+
+        with store.share(batch=3, context=context) as share:
+            with ProcessPoolExecutor(
+                2, mp_context=context, initializer=share.attach
+            ) as pool:
+                assert list(pool.map(get, ["a"] * 10)) == [1] * 10
+
+        assert [report.called for report in store.pending()] == [0]
+        store.get("b")
+        store.assert_full_filled()
+
+    @forking
+    def test_should_count_calls_raising_exceptions(self):
+        store.on("get", "a").returns(1).once()
+        store.on("get", "b").raises(KeyError("b")).once()
+        context = multiprocessing.get_context("fork")
+
+        with store.share(context=context) as share:
+            with ProcessPoolExecutor(
+                1, mp_context=context, initializer=share.attach
+            ) as pool:
+                assert pool.submit(get, "a").result() == 1
+                with pytest.raises(KeyError):
+                    pool.submit(get, "b").result()
+
+        assert store.pending() == []
+        store.assert_full_filled()
+
+    @forking
+    def test_should_report_calls_made_too_many_times(self):
+        store.on("get", "a").returns(1).times(3)
+        context = multiprocessing.get_context("fork")
+
+        with store.share(context=context) as share:
+            workers = [
+                context.Process(target=attach_and_get, args=(share, ["a", "a"]))
+                for _ in range(2)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        assert [report.called for report in store.pending()] == [4]
+        with pytest.raises(NotFullFilled):
+            store.assert_full_filled()
+
+    @forking
+    def test_should_merge_ordering(self):
+        prerequisite = store.on("get", "a").returns(1)
+        store.on("commit").after(prerequisite)
+        context = multiprocessing.get_context("fork")
+
+        share = store.share(context=context)
+        with ProcessPoolExecutor(1, mp_context=context, initializer=share.attach) as pool:
+            assert pool.submit(get, "a").result() == 1
+
+        with pytest.raises(UnexpectedCall):
+            store.commit()
+        assert share.collect() == 1
+        share.close()
+        store.commit()
+
+    def test_should_push_expected_calls_to_spawned_workers(self):
+        store.on("get", "a").returns(1).times(4)
+        context = multiprocessing.get_context("spawn")
+
+        with store.share(batch=2, context=context) as share:
+            with ProcessPoolExecutor(
+                2, mp_context=context, initializer=share.attach
+            ) as pool:
+                assert list(pool.map(get_from, [store] * 4, ["a"] * 4)) == [1] * 4
+
+        store.assert_full_filled()
+
+    def test_should_not_count_calls_of_sharing_process(self):
+        store.on("get", "a").returns(1).once()
+
+        with store.share() as share:
+            assert share.attach() is store
+            store.get("a")
+            assert share.collect() == 0
+
+        store.assert_full_filled()
@@ -0,0 +1,39 @@
+from src.elmock.signature import MISSING, Binder
+
+
+class Bound:
+    def method(self, p1, p2=2, *args, k1, k2=None, **kwargs):
+        pass  # pragma: no-cover
+
+    def simple(self, p1, p2=2):
+        pass  # pragma: no-cover
+
+
+binder = Binder.of(Bound.method, bound=False)
+simple = Binder.of(Bound.simple, bound=False)
+
+
+class TestBinder:
+    def test_should_bind_positional_and_named_arguments_alike(self):
+        assert simple.bind((1, 3), {}) == ((1, 3), {})
+        assert simple.bind((1,), {"p2": 3}) == ((1, 3), {})
+        assert simple.bind((), {"p1": 1, "p2": 3}) == ((1, 3), {})
+
+    def test_should_apply_defaults(self):
+        assert simple.bind((1,), {}) == ((1, 2), {})
+        assert simple.bind((), {}) == ((MISSING, 2), {})
+
+    def test_should_reject_arguments_not_fitting_signature(self):
+        assert simple.bind((1, 2, 3), {}) is None
+        assert simple.bind((1,), {"p1": 1}) is None
+        assert simple.bind((1,), {"unknown": 1}) is None
+
+    def test_should_keep_variable_arguments(self):
+        assert binder.bind((1, 2, 3, 4), {"k1": 5, "extra": 6}) == (
+            (1, 2, 5, None, 3, 4),
+            {"extra": 6},
+        )
+        assert binder.bind((1,), {"k2": 5}) == ((1, 2, MISSING, 5), {})
+
+    def test_should_not_bind_unreadable_signature(self):
+        assert Binder.of(object(), bound=True) is None
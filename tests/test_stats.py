@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.elmock import Mock
+from src.elmock.exception import UnexpectedArguments, UnexpectedCall
+
+
+class Sink(Mock):
+    def write(self, record, flush: bool = False):
+        return self.execute("write", record, flush=flush)
+
+    async def send(self, record):
+        return await self.execute_async("send", record)
+
+
+class TestStats:
+    def test_should_not_collect_by_default(self):
+        sink = Sink()
+        sink.on("write", "a")
+        sink.write("a")
+
+        assert sink.stats() == {}
+        assert "_dispatch" not in vars(sink)
+
+    def test_should_count_candidates_and_rejections(self):
+        sink = Sink()
+        sink.instrument()
+        sink.on("write", "a").once()
+        sink.on("write", "a")
+        sink.on("write", Mock.AnyStrMatching("b"))
+
+        sink.write("a")
+        sink.write("a")
+        sink.write("b")
+        with pytest.raises(UnexpectedArguments):
+            sink.write("c")
+
+        stats = sink.stats()["write"]
+        assert stats["calls"] == 4
+        assert stats["errors"] == 1
+        assert stats["hash_hits"] == 3
+        assert stats["matcher_checks"] == 2
+        assert stats["rejections"]["times"] == 1
+        assert stats["rejections"]["arguments"] == 1
+        assert stats["latency"] is None
+
+    def test_should_count_broken_order(self):
+        sink = Sink()
+        sink.instrument(latency=True)
+        sink.on("write", "a").before("send", "b")
+
+        with pytest.raises(UnexpectedCall):
+            asyncio.run(sink.send("b"))
+
+        stats = sink.stats()["send"]
+        assert stats["rejections"]["order"] == 1
+        assert sum(stats["latency"].values()) == 1
+
+    def test_should_run_hooks(self):
+        seen = []
+        sink = Sink()
+        sink.instrument(
+            before=lambda *call: seen.append(("before", *call)),
+            after=lambda *call: seen.append(("after", *call)),
+        )
+        sink.on("write", "a").returns(1)
+
+        assert list(sink.execute_many("write", [("a",)])) == [1]
+        assert seen == [
+            ("before", "write", ("a",), {}),
+            ("after", "write", ("a",), {}, 1, None),
+        ]
+
+    def test_should_follow_forks_and_disable(self):
+        sink = Sink()
+        sink.instrument()
+        sink.on("write", "a")
+
+        fork = sink.fork()
+        fork.write("a")
+        assert fork.stats()["write"]["calls"] == 1
+        assert sink.stats() == {}
+
+        sink.instrument(False)
+        sink.write("a")
+        assert sink.stats() == {}
+        assert "_dispatch" not in vars(sink)